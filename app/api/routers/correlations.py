@@ -3,15 +3,24 @@ PUT, POST, GET 에 대한 다양한 API 예시를 작성해놨으니 참고해
 되도록이면 Swagger에서 API를 쉽게 파악하기 위해 API 및 Body, Path, Query에 대한 설명을 작성한다.
 """
 from typing import Annotated, Optional
+from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Body
+import pandas as pd
+from fastapi import APIRouter, Depends, Body, Path
 from fastapi.responses import JSONResponse
 
 from app.dependencies import get_token_header
+from app.exceptions.service import JobNotFoundError, JobNotFinishedError, CatalogTableNotFoundError
 from app.schemas.correlations import SchemaMatchingResponseModel, SchemaMatchingRequestModel, \
-    DatasetMatchingRequestModel
-from app.src.correlations.endpoints import run, match_from_test_dataset
-from app.src.correlations.enums import MatchingModel, Strategy
+    DatasetMatchingRequestModel, JobResponseModel, JobModel, BatchMatchingRequestModel, \
+    CatalogRegisterRequestModel, CatalogMatchingRequestModel, CatalogTableModel, CatalogResponseModel, \
+    MultiMatchingRequestModel
+from app.src.correlations.catalog import TableCatalog
+from app.src.correlations.endpoints import run, match_from_test_dataset, run_one_to_many, run_registered, run_multi
+from app.src.correlations.enums import MatchingModel, Strategy, JobStatus
+from app.src.correlations.executor import MatchingExecutor
+from app.src.correlations.jobs import JobRunner
+from app.src.correlations.matching import register_table
 
 router = APIRouter(
     prefix="/correlations",
@@ -41,8 +50,12 @@ async def schema_matching(
     result_path = request_body.result_path
     truth_json = request_body.truth_json
     threshold = request_body.threshold
-    response = run(l_table, r_table, result_path, truth_json, model, strategy, threshold)
-    return SchemaMatchingResponseModel(result=response, description="스키마 매칭 성공")
+    # CPU 연산이 많아 event loop 밖에서 실행
+    response = await MatchingExecutor.run(run, l_table, r_table, result_path, truth_json, model, strategy, threshold,
+                                          sample_rows=request_body.sample_rows, top_k=request_body.top_k,
+                                          blocking=request_body.blocking)
+    return SchemaMatchingResponseModel(result=response.to_dict(), profiled_rows=profiled_rows(response, l_table, r_table),
+                                       pruned_pairs=response.attrs["pruned_pairs"], description="스키마 매칭 성공")
 
 
 @router.get("/dataset",
@@ -59,7 +72,7 @@ async def dataset_schema_matching(
 ):
     dataset = request_body.dataset
 
-    pred_df = match_from_test_dataset(dataset)
+    pred_df = await MatchingExecutor.run(match_from_test_dataset, dataset)
 
     if l_column and r_column:
         response = pred_df.loc[l_column, r_column]
@@ -72,3 +85,170 @@ async def dataset_schema_matching(
         response = pred_df.to_dict()
 
     return SchemaMatchingResponseModel(result=response, description="스키마 매칭 성공")
+
+
+@router.get("/batch",
+            response_model=SchemaMatchingResponseModel,
+            response_class=JSONResponse)
+async def batch_schema_matching(
+        request_body: Annotated[BatchMatchingRequestModel, Body(
+            title="상관관계 분석 기반 스키마 매칭 - 1:N 테이블",
+            description="left 테이블 하나를 여러 right 테이블과 매칭. left 테이블은 한 번만 분석",
+            media_type="application/json"
+        )]
+):
+    model = MatchingModel.INITIAL
+    strategy = Strategy.MANY_TO_MANY
+
+    pred_dfs = await MatchingExecutor.run(run_one_to_many, request_body.l_table, request_body.r_tables, model,
+                                          strategy, request_body.threshold, request_body.sample_rows,
+                                          request_body.top_k, request_body.blocking)
+
+    response = [{"r_table": r_table, "result": pred_df.to_dict(),
+                 "profiled_rows": profiled_rows(pred_df, request_body.l_table, r_table),
+                 "pruned_pairs": pred_df.attrs["pruned_pairs"]}
+                for r_table, pred_df in zip(request_body.r_tables, pred_dfs)]
+    return SchemaMatchingResponseModel(result=response, description="스키마 매칭 성공")
+
+
+@router.get("/multi",
+            response_model=SchemaMatchingResponseModel,
+            response_class=JSONResponse)
+async def multi_schema_matching(
+        request_body: Annotated[MultiMatchingRequestModel, Body(
+            title="상관관계 분석 기반 스키마 매칭 - N 개 테이블",
+            description="여러 테이블의 모든 테이블 쌍을 매칭. 테이블마다 한 번만 분석",
+            media_type="application/json"
+        )]
+):
+    model = MatchingModel.INITIAL
+    strategy = Strategy.MANY_TO_MANY
+
+    response = await MatchingExecutor.run(run_multi, request_body.tables, model, strategy, request_body.threshold,
+                                          request_body.sample_rows, request_body.top_k, request_body.blocking,
+                                          request_body.output)
+    return SchemaMatchingResponseModel(**response, description="스키마 매칭 성공")
+
+
+@router.post("/multi/jobs",
+             response_model=JobResponseModel,
+             response_class=JSONResponse)
+def submit_multi_matching_job(
+        request_body: Annotated[MultiMatchingRequestModel, Body(
+            title="상관관계 분석 기반 스키마 매칭 - N 개 테이블 job 등록",
+            description="모든 테이블 쌍 매칭을 background 에서 실행. 결과는 /jobs/{job_id}/result 로 조회",
+            media_type="application/json"
+        )]
+):
+    job = JobRunner.submit("multi_matching", request_body.model_dump(mode="json"))
+    return JobResponseModel(result=JobModel(**job), description="스키마 매칭 job 등록 성공")
+
+
+@router.post("/catalog/tables",
+             response_model=CatalogResponseModel,
+             response_class=JSONResponse)
+async def register_catalog_table(
+        request_body: Annotated[CatalogRegisterRequestModel, Body(
+            title="테이블 catalog 등록",
+            description="테이블을 한 번 profiling 하여 저장. 이후 /catalog/match 에서 원본 파일을 읽지 않고 매칭",
+            media_type="application/json"
+        )]
+):
+    table_id = request_body.table_id or uuid4().hex
+    table = await MatchingExecutor.run(register_table, request_body.table, table_id, request_body.sample_rows)
+    return CatalogResponseModel(result=CatalogTableModel(**table), description="테이블 catalog 등록 성공")
+
+
+@router.get("/catalog/tables",
+            response_model=CatalogResponseModel,
+            response_class=JSONResponse)
+def list_catalog_tables():
+    tables = [CatalogTableModel(**table) for table in TableCatalog.store().list()]
+    return CatalogResponseModel(result=tables, description="테이블 catalog 조회 성공")
+
+
+@router.get("/catalog/tables/{table_id}",
+            response_model=CatalogResponseModel,
+            response_class=JSONResponse)
+def get_catalog_table(table_id: Annotated[str, Path(description="등록 시 반환된 table_id")]):
+    table = TableCatalog.store().get(table_id)
+    if table is None:
+        raise CatalogTableNotFoundError([table_id])
+    return CatalogResponseModel(result=CatalogTableModel(**table), description="테이블 catalog 조회 성공")
+
+
+@router.delete("/catalog/tables/{table_id}",
+               response_model=CatalogResponseModel,
+               response_class=JSONResponse)
+def delete_catalog_table(table_id: Annotated[str, Path(description="등록 시 반환된 table_id")]):
+    if not TableCatalog.store().delete(table_id):
+        raise CatalogTableNotFoundError([table_id])
+    return CatalogResponseModel(result={"table_id": table_id}, description="테이블 catalog 삭제 성공")
+
+
+@router.get("/catalog/match",
+            response_model=SchemaMatchingResponseModel,
+            response_class=JSONResponse)
+async def catalog_schema_matching(
+        request_body: Annotated[CatalogMatchingRequestModel, Body(
+            title="상관관계 분석 기반 스키마 매칭 - 등록된 테이블",
+            description="left 테이블을 catalog 에 등록된 테이블들과 매칭. 등록된 테이블의 원본 파일은 읽지 않음",
+            media_type="application/json"
+        )]
+):
+    model = MatchingModel.INITIAL
+    strategy = Strategy.MANY_TO_MANY
+
+    table_ids, pred_dfs = await MatchingExecutor.run(run_registered, request_body.l_table, request_body.table_ids,
+                                                     model, strategy, request_body.threshold, request_body.sample_rows,
+                                                     request_body.top_k, request_body.blocking)
+
+    response = [{"table_id": table_id, "result": pred_df.to_dict(),
+                 "profiled_rows": profiled_rows(pred_df, request_body.l_table, table_id),
+                 "pruned_pairs": pred_df.attrs["pruned_pairs"]}
+                for table_id, pred_df in zip(table_ids, pred_dfs)]
+    return SchemaMatchingResponseModel(result=response, description="스키마 매칭 성공")
+
+
+@router.post("/jobs",
+             response_model=JobResponseModel,
+             response_class=JSONResponse)
+def submit_schema_matching_job(
+        request_body: Annotated[SchemaMatchingRequestModel, Body(
+            title="상관관계 분석 기반 스키마 매칭 job 등록",
+            description="gunicorn timeout 을 넘는 스키마 매칭을 background 에서 실행. 반환된 job_id 로 상태와 결과 조회",
+            media_type="application/json"
+        )]
+):
+    job = JobRunner.submit("schema_matching", request_body.model_dump())
+    return JobResponseModel(result=JobModel(**job), description="스키마 매칭 job 등록 성공")
+
+
+@router.get("/jobs/{job_id}",
+            response_model=JobResponseModel,
+            response_class=JSONResponse)
+def get_schema_matching_job(job_id: Annotated[str, Path(description="job 등록 시 반환된 job_id")]):
+    job = JobRunner.store().get(job_id)
+    if job is None:
+        raise JobNotFoundError(job_id)
+    return JobResponseModel(result=JobModel(**job), description="스키마 매칭 job 상태 조회 성공")
+
+
+@router.get("/jobs/{job_id}/result",
+            response_model=SchemaMatchingResponseModel,
+            response_class=JSONResponse)
+def get_schema_matching_job_result(job_id: Annotated[str, Path(description="job 등록 시 반환된 job_id")]):
+    job = JobRunner.store().get(job_id)
+    if job is None:
+        raise JobNotFoundError(job_id)
+    if job["status"] != JobStatus.SUCCEEDED:
+        raise JobNotFinishedError(job)
+    job_result = JobRunner.store().get_result(job_id)
+    return SchemaMatchingResponseModel(result=job_result["result"], profiled_rows=job_result["profiled_rows"],
+                                       pruned_pairs=job_result.get("pruned_pairs"), description="스키마 매칭 성공")
+
+
+def profiled_rows(pred_df: pd.DataFrame, l_table: str, r_table: str) -> dict[str, int]:
+    """match_profiles 가 기록한 테이블 별 profiling row 수"""
+    l_rows, r_rows = pred_df.attrs["profiled_rows"]
+    return {l_table: l_rows, r_table: r_rows}
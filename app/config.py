@@ -91,6 +91,95 @@ class Settings(BaseSettings):
     # Service Config
     X_TOKEN: str = "wisenut"
 
+    # Schema Matching
+    PREDICT_THREAD_BUDGET: int = 0  # ensemble predict 에 사용할 전체 CPU thread 수, 0 이면 os.cpu_count()
+    PREDICT_POOL_SIZE: int = 0  # 동시에 predict 하는 booster 수, 0 이면 PREDICT_THREAD_BUDGET 과 동일
+    MATCHING_EXECUTOR: Literal["thread", "process"] = "thread"  # event loop 밖에서 스키마 매칭을 실행할 executor
+    MATCHING_POOL_SIZE: int = 1  # 동시에 실행하는 스키마 매칭 수
+    MATCHING_QUEUE_LIMIT: int = 8  # pool 이 모두 사용 중일 때 대기 가능한 요청 수, 초과 시 거절
+
+    # Table Profiling
+    PROFILE_SAMPLE_ROWS: int = 0  # self feature 계산에 사용할 최대 row 수 (reservoir sample), 0 이면 전체 row 사용
+    PROFILE_SAMPLE_SEED: int = 200  # 같은 table 은 항상 같은 sample 을 사용하도록 고정
+    PROFILE_CHUNK_ROWS: int = 100000  # sampling, streaming profiling 시 한 번에 읽는 row 수
+    PROFILE_STREAMING_MIN_BYTES: int = 0  # 이 크기 이상의 csv, json, jsonl 은 chunk 단위로 읽으며 profiling, 0 이면 사용 안 함
+    PROFILE_DISTINCT_SKETCH_SIZE: int = 16384  # streaming profiling 에서 column 별 unique 값 개수 계산에 유지하는 hash 수
+
+    # Candidate Retrieval
+    CANDIDATE_TOP_K: int = 0  # l_column 마다 predict 할 r_column 후보 수 (embedding 유사도 top-k), 0 이면 전체 쌍 predict
+
+    # Multi Table Matching
+    MULTI_MATCHING_POOL_SIZE: int = 4  # N-way 매칭에서 동시에 매칭하는 테이블 쌍 수
+
+    # Pair Blocking
+    PAIR_BLOCKING: bool = False  # url 과 숫자, date 처럼 type 이 호환되지 않는 column 쌍은 predict 하지 않고 0 으로 채움
+    PAIR_BLOCKING_LENGTH_RATIO: float = 10.0  # 값 길이 범위가 겹치지 않고 평균 길이가 이 배수 이상 차이나면 제외, 0 이면 사용 안 함
+
+    # Sentence Transformer
+    # sentence_transformers: fp32, sentence_transformers_int8: Linear layer int8 dynamic quantization,
+    # onnx: export_onnx 로 저장한 directory 를 onnxruntime 으로 실행
+    EMBEDDING_BACKEND: Literal["sentence_transformers", "sentence_transformers_int8", "onnx"] = "sentence_transformers"
+    EMBEDDING_MODEL: str = "paraphrase-multilingual-mpnet-base-v2"  # huggingface model 이름 또는 local path
+    EMBEDDING_BATCH_SIZE: int = 64  # column 값 encoding 시 batch size
+
+    # Model Preload
+    PRELOAD_MODELS: bool = False  # gunicorn master 에서 model 을 로드, warm up 한 뒤 fork 하여 worker 간 메모리 공유
+
+    # Self Feature Cache
+    FEATURE_CACHE_ENABLED: bool = True  # column 값이 같으면 self feature 재계산 생략
+    FEATURE_CACHE_PATH: str = "./cache/self_features"
+    FEATURE_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024  # 초과 시 오래 사용하지 않은 항목부터 삭제
+
+    # Column Name Embedding Cache
+    COLUMN_NAME_CACHE_SIZE: int = 100000  # 메모리에 유지하는 column 이름 embedding 수 (LRU)
+    COLUMN_NAME_CACHE_PERSIST: bool = False  # FEATURE_CACHE_PATH 에도 저장하여 재시작 후 재사용
+
+    # Schema Matching Jobs
+    JOB_STORE_PATH: str = "./jobs/jobs.sqlite3"  # 로컬 job 저장소, gunicorn worker 간 공유
+    JOB_POOL_SIZE: int = 1  # worker process 당 동시에 실행하는 job 수
+    JOB_POLL_INTERVAL: float = 1.0  # pending job 확인 및 heartbeat 주기 (seconds)
+    JOB_STALE_SECONDS: int = 60  # heartbeat 가 끊긴 running job 을 다시 pending 으로 되돌리는 기준 (seconds)
+    JOB_MAX_ATTEMPTS: int = 3  # worker 재시작 등으로 중단된 job 의 최대 실행 횟수
+
+    # Table Catalog
+    CATALOG_PATH: str = "./catalog"  # 등록된 테이블의 profile 저장소 (sqlite + .npy), gunicorn worker 간 공유
+
+    @field_validator('PROFILE_SAMPLE_ROWS')
+    def validate_profile_sample_rows(cls, v):
+        if v < 0:
+            raise ValueError(f"`PROFILE_SAMPLE_ROWS` 는 0 이상이어야 함. PROFILE_SAMPLE_ROWS={v}")
+        return v
+
+    @field_validator('PROFILE_DISTINCT_SKETCH_SIZE')
+    def validate_profile_distinct_sketch_size(cls, v):
+        if v < 2:
+            raise ValueError(f"`PROFILE_DISTINCT_SKETCH_SIZE` 는 2 이상이어야 함. PROFILE_DISTINCT_SKETCH_SIZE={v}")
+        return v
+
+    @field_validator('CANDIDATE_TOP_K')
+    def validate_candidate_top_k(cls, v):
+        if v < 0:
+            raise ValueError(f"`CANDIDATE_TOP_K` 는 0 이상이어야 함. CANDIDATE_TOP_K={v}")
+        return v
+
+    @field_validator('PAIR_BLOCKING_LENGTH_RATIO')
+    def validate_pair_blocking_length_ratio(cls, v):
+        if v != 0 and v < 1:
+            raise ValueError(f"`PAIR_BLOCKING_LENGTH_RATIO` 는 0 또는 1 이상이어야 함. PAIR_BLOCKING_LENGTH_RATIO={v}")
+        return v
+
+    @field_validator('MULTI_MATCHING_POOL_SIZE')
+    def validate_multi_matching_pool_size(cls, v):
+        if v < 1:
+            raise ValueError(f"`MULTI_MATCHING_POOL_SIZE` 는 1 이상이어야 함. MULTI_MATCHING_POOL_SIZE={v}")
+        return v
+
+    @field_validator('MATCHING_POOL_SIZE')
+    def validate_matching_pool_size(cls, v):
+        if v < 1:
+            raise ValueError(f"`MATCHING_POOL_SIZE` 는 1 이상이어야 함. MATCHING_POOL_SIZE={v}")
+        return v
+
 
 settings = Settings()  # type: ignore
 print(settings.json())
@@ -15,3 +15,49 @@ class TokenValidationError(ApplicationError):
         self.code = int(f"{settings.SERVICE_CODE}{status.HTTP_401_UNAUTHORIZED}")
         self.message = "Invalid x-token header"
         self.result = {"current_x_token": x_token}
+
+
+class MatchingQueueFullError(ApplicationError):
+    """스키마 매칭 대기 요청 수 초과"""
+
+    def __init__(self, pending):
+        self.code = int(f"{settings.SERVICE_CODE}{status.HTTP_503_SERVICE_UNAVAILABLE}")
+        self.message = "Too many schema matching requests. Try again later"
+        self.result = {"pending": pending, "pool_size": settings.MATCHING_POOL_SIZE,
+                       "queue_limit": settings.MATCHING_QUEUE_LIMIT}
+
+
+class JobNotFoundError(ApplicationError):
+    """존재하지 않는 스키마 매칭 job"""
+
+    def __init__(self, job_id):
+        self.code = int(f"{settings.SERVICE_CODE}{status.HTTP_404_NOT_FOUND}")
+        self.message = "Job not found"
+        self.result = {"job_id": job_id}
+
+
+class JobNotFinishedError(ApplicationError):
+    """완료되지 않은 job 의 결과 요청"""
+
+    def __init__(self, job):
+        self.code = int(f"{settings.SERVICE_CODE}{status.HTTP_409_CONFLICT}")
+        self.message = f"Job is {job['status']}, result is not available"
+        self.result = job
+
+
+class CatalogTableNotFoundError(ApplicationError):
+    """catalog 에 등록되지 않은 테이블"""
+
+    def __init__(self, table_ids):
+        self.code = int(f"{settings.SERVICE_CODE}{status.HTTP_404_NOT_FOUND}")
+        self.message = "Table is not registered in catalog"
+        self.result = {"table_ids": table_ids}
+
+
+class CatalogTableOutdatedError(ApplicationError):
+    """현재와 다른 feature 계산 로직, embedding model 로 등록된 테이블"""
+
+    def __init__(self, table_ids, version):
+        self.code = int(f"{settings.SERVICE_CODE}{status.HTTP_409_CONFLICT}")
+        self.message = "Table profile is outdated, register the table again"
+        self.result = {"table_ids": table_ids, "version": version}
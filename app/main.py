@@ -26,6 +26,9 @@ from app.constants import DESCRIPTION, SUMMARY, LICENSE_INFO
 from app.dependencies import get_token_header
 from app.exceptions.base import ApplicationError
 from app.log import setup_logging
+from app.src.correlations.executor import MatchingExecutor
+from app.src.correlations.jobs import JobRunner
+from app.src.correlations.preload import load_models, log_worker_startup
 from app.version import GIT_REVISION, GIT_BRANCH, BUILD_DATE, GIT_SHORT_REVISION, VERSION, get_current_datetime
 
 # 앱 구동 성공 여부와 상관없이 앱 정보 출력
@@ -41,8 +44,15 @@ async def lifespan(lifespan_app: FastAPI):
     logging.info(f"uptime: {get_current_datetime()}")
     logging.debug(f"Working Directory: {repr(os.getcwd())}")
     logging.info(f"Start {settings.SERVICE_NAME} {VERSION}")
+    # PRELOAD_MODELS 이면 gunicorn master 에서 로드한 model 을 그대로 사용
+    load_models()
+    # 이전 worker 가 남긴 pending, 중단된 job 도 이어서 실행
+    JobRunner.start()
+    log_worker_startup()
     yield
     # shutdown event
+    JobRunner.stop()
+    MatchingExecutor.shutdown()
     logging.info(f"Shut down {settings.SERVICE_NAME} Service")
 
 
@@ -12,29 +12,141 @@ from typing import Optional
 from pydantic import BaseModel, Field
 
 from app.schemas.response import APIResponseModel
+from app.src.correlations.enums import MultiMatchingOutput
 from app.version import VERSION
 
 
 class SchemaMatchingRequestModel(BaseModel):
-    l_table: str = Field(description="ltable path"),
-    r_table: str = Field(description="rtable path"),
-    result_path: str = Field(description="result path"),
-    truth_json: Optional[str] = Field(description="truth json"),
-    model: str = Field(description="model path", default="initial"),
-    strategy: str = Field(description="strategy", default="many_to_many"),
+    l_table: str = Field(description="ltable path (csv, json, jsonl, parquet, arrow, feather)")
+    r_table: str = Field(description="rtable path (csv, json, jsonl, parquet, arrow, feather)")
+    result_path: Optional[str] = Field(description="result path", default=None)
+    truth_json: Optional[str] = Field(description="truth json", default=None)
+    model: str = Field(description="model path", default="initial")
+    strategy: str = Field(description="strategy", default="many_to_many")
     threshold: Optional[float] = Field(description="threshold", default=None)
+    sample_rows: Optional[int] = Field(description="테이블 별 profiling 에 사용할 최대 row 수 (reservoir sample), "
+                                                   "0 이면 전체 row, 지정하지 않으면 PROFILE_SAMPLE_ROWS",
+                                       default=None, ge=0)
+    top_k: Optional[int] = Field(description="ltable column 마다 predict 할 rtable column 후보 수 (embedding 유사도 top-k), "
+                                             "0 이면 전체 column 쌍, 지정하지 않으면 CANDIDATE_TOP_K",
+                                 default=None, ge=0)
+    blocking: Optional[bool] = Field(description="type 이 호환되지 않는 column 쌍 (url 과 숫자, date 등) 은 predict 하지 않고 0 으로 채움, "
+                                                 "지정하지 않으면 PAIR_BLOCKING",
+                                     default=None)
 
 
 class DatasetMatchingRequestModel(BaseModel):
     dataset: str = Field(description="dataset path")
-    model: str = Field(description="model path", default="initial"),
-    strategy: str = Field(description="strategy", default="many_to_many"),
+    model: str = Field(description="model path", default="initial")
+    strategy: str = Field(description="strategy", default="many_to_many")
     threshold: Optional[float] = Field(description="threshold", default=None)
 
 
+class BatchMatchingRequestModel(BaseModel):
+    l_table: str = Field(description="ltable path (csv, json, jsonl, parquet, arrow, feather)")
+    r_tables: list[str] = Field(description="rtable paths (csv, json, jsonl, parquet, arrow, feather)",
+                                min_length=1)
+    model: str = Field(description="model path", default="initial")
+    strategy: str = Field(description="strategy", default="many_to_many")
+    threshold: Optional[float] = Field(description="threshold", default=None)
+    sample_rows: Optional[int] = Field(description="테이블 별 profiling 에 사용할 최대 row 수 (reservoir sample), "
+                                                   "0 이면 전체 row, 지정하지 않으면 PROFILE_SAMPLE_ROWS",
+                                       default=None, ge=0)
+    top_k: Optional[int] = Field(description="ltable column 마다 predict 할 rtable column 후보 수 (embedding 유사도 top-k), "
+                                             "0 이면 전체 column 쌍, 지정하지 않으면 CANDIDATE_TOP_K",
+                                 default=None, ge=0)
+    blocking: Optional[bool] = Field(description="type 이 호환되지 않는 column 쌍 (url 과 숫자, date 등) 은 predict 하지 않고 0 으로 채움, "
+                                                 "지정하지 않으면 PAIR_BLOCKING",
+                                     default=None)
+
+
+class MultiMatchingRequestModel(BaseModel):
+    tables: list[str] = Field(description="매칭할 table paths (csv, json, jsonl, parquet, arrow, feather), "
+                                          "모든 테이블 쌍을 매칭", min_length=2)
+    model: str = Field(description="model path", default="initial")
+    strategy: str = Field(description="strategy", default="many_to_many")
+    threshold: Optional[float] = Field(description="threshold", default=None)
+    sample_rows: Optional[int] = Field(description="테이블 별 profiling 에 사용할 최대 row 수 (reservoir sample), "
+                                                   "0 이면 전체 row, 지정하지 않으면 PROFILE_SAMPLE_ROWS",
+                                       default=None, ge=0)
+    top_k: Optional[int] = Field(description="ltable column 마다 predict 할 rtable column 후보 수 (embedding 유사도 top-k), "
+                                             "0 이면 전체 column 쌍, 지정하지 않으면 CANDIDATE_TOP_K",
+                                 default=None, ge=0)
+    blocking: Optional[bool] = Field(description="type 이 호환되지 않는 column 쌍 (url 과 숫자, date 등) 은 predict 하지 않고 0 으로 채움, "
+                                                 "지정하지 않으면 PAIR_BLOCKING",
+                                     default=None)
+    output: MultiMatchingOutput = Field(description="matrices: 테이블 쌍 별 similarity matrix, "
+                                                    "correspondences: 매칭된 column 쌍을 합친 목록",
+                                        default=MultiMatchingOutput.MATRICES)
+
+
+class CatalogRegisterRequestModel(BaseModel):
+    table: str = Field(description="등록할 table path (csv, json, jsonl, parquet, arrow, feather)")
+    table_id: Optional[str] = Field(description="테이블 id, 지정하지 않으면 생성. 이미 등록된 id 이면 profile 을 교체",
+                                    default=None, pattern=r"^[A-Za-z0-9_.\-]+$", max_length=128)
+    sample_rows: Optional[int] = Field(description="profiling 에 사용할 최대 row 수 (reservoir sample), "
+                                                   "0 이면 전체 row, 지정하지 않으면 PROFILE_SAMPLE_ROWS",
+                                       default=None, ge=0)
+
+
+class CatalogMatchingRequestModel(BaseModel):
+    l_table: str = Field(description="ltable path (csv, json, jsonl, parquet, arrow, feather)")
+    table_ids: Optional[list[str]] = Field(description="매칭할 등록된 테이블 id, 지정하지 않으면 등록된 모든 테이블",
+                                           default=None, min_length=1)
+    model: str = Field(description="model path", default="initial")
+    strategy: str = Field(description="strategy", default="many_to_many")
+    threshold: Optional[float] = Field(description="threshold", default=None)
+    sample_rows: Optional[int] = Field(description="ltable profiling 에 사용할 최대 row 수 (reservoir sample), "
+                                                   "0 이면 전체 row, 지정하지 않으면 PROFILE_SAMPLE_ROWS",
+                                       default=None, ge=0)
+    top_k: Optional[int] = Field(description="ltable column 마다 predict 할 rtable column 후보 수 (embedding 유사도 top-k), "
+                                             "0 이면 전체 column 쌍, 지정하지 않으면 CANDIDATE_TOP_K",
+                                 default=None, ge=0)
+    blocking: Optional[bool] = Field(description="type 이 호환되지 않는 column 쌍 (url 과 숫자, date 등) 은 predict 하지 않고 0 으로 채움, "
+                                                 "지정하지 않으면 PAIR_BLOCKING",
+                                     default=None)
+
+
 class DummyCorrelation(BaseModel):
     response: bool | str | dict[str, str] | dict[str, float]
 
 
 class SchemaMatchingResponseModel(APIResponseModel):
     message: str = Field(default=f"스키마 매칭 응답 성공 ({VERSION})")
+    profiled_rows: Optional[dict[str, int]] = Field(
+        description="테이블 별 profiling 에 사용한 row 수 (sampling 한 경우 sample 크기)", default=None)
+    pruned_pairs: Optional[int] = Field(
+        description="blocking 으로 predict 하지 않은 column 쌍의 수", default=None)
+
+
+class JobModel(BaseModel):
+    job_id: str = Field(description="job id")
+    kind: str = Field(description="job kind")
+    status: str = Field(description="pending, running, succeeded, failed")
+    stage: Optional[str] = Field(description="현재 실행 중인 stage", default=None)
+    completed_stages: list[str] = Field(description="완료된 stage 목록", default=[])
+    progress: float = Field(description="완료된 stage 비율 (0 ~ 1)", default=0.0)
+    attempts: int = Field(description="실행 횟수", default=0)
+    error: Optional[str] = Field(description="실패 사유", default=None)
+    created_at: float = Field(description="생성 시각 (unix time)")
+    started_at: Optional[float] = Field(description="마지막 실행 시작 시각 (unix time)", default=None)
+    finished_at: Optional[float] = Field(description="종료 시각 (unix time)", default=None)
+
+
+class JobResponseModel(APIResponseModel):
+    message: str = Field(default=f"스키마 매칭 job 응답 성공 ({VERSION})")
+
+
+class CatalogTableModel(BaseModel):
+    table_id: str = Field(description="테이블 id")
+    path: str = Field(description="등록 시 table path")
+    columns: list[str] = Field(description="profiling 된 column 목록")
+    data_types: list[str] = Field(description="column 별 data type (url, numeric, date, string)")
+    row_count: int = Field(description="profiling 에 사용한 row 수")
+    sample_rows: Optional[int] = Field(description="등록 시 sample_rows", default=None)
+    version: str = Field(description="feature 계산 로직, embedding model 버전")
+    registered_at: float = Field(description="등록 시각 (unix time)")
+
+
+class CatalogResponseModel(APIResponseModel):
+    message: str = Field(default=f"테이블 catalog 응답 성공 ({VERSION})")
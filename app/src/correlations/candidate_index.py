@@ -0,0 +1,73 @@
+"""
+column embedding 기반 매칭 후보 검색 (candidate retrieval)
+
+모든 (l_column, r_column) 쌍을 booster 로 predict 하지 않고, l_column 마다 embedding 이 가까운 r_column top-k 만 남김.
+- column name embedding (TableProfile.col_name_embeddings) 과 값 embedding (self features 의 deep embedding 768 차원) 사용
+- 두 cosine similarity 중 큰 값을 후보 점수로 사용, 값 embedding 이 없는 (DEEP_FEATURE_INVALID_VALUE) column 은 이름만 사용
+- column 수가 많지 않으므로 근사 index 대신 정규화된 embedding 의 행렬 곱으로 exact search
+"""
+from typing import Optional
+
+import numpy as np
+from numpy.linalg import norm
+
+from app.src.correlations.relation_features import TableProfile
+from app.src.correlations.self_features import Constants
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.maximum(norm(vectors, axis=1, keepdims=True), 1e-12)
+
+
+class ColumnVectorIndex:
+    """TableProfile 하나의 column name, 값 embedding exact cosine similarity index
+
+    Notes:
+        한 번 만든 index 는 여러 l_table 검색에 재사용할 수 있다.
+    """
+
+    def __init__(self, profile: TableProfile):
+        value_embeddings = np.asarray(profile.features[:, -Constants.DEEP_EMBEDDING_FEATURES_DIMENSION:])
+        self.name_vectors = normalize_rows(np.asarray(profile.col_name_embeddings, dtype=np.float64))
+        self.value_vectors = normalize_rows(value_embeddings)
+        self.has_values = ~(value_embeddings == Constants.DEEP_FEATURE_INVALID_VALUE).all(axis=1)
+
+    def __len__(self):
+        return len(self.name_vectors)
+
+    def scores(self, profile: TableProfile) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (len(profile), len(self)) 후보 점수, column name, 값 cosine similarity 중 큰 값
+        """
+        query = ColumnVectorIndex(profile)
+        scores = query.name_vectors @ self.name_vectors.T
+        value_scores = query.value_vectors @ self.value_vectors.T
+        both = query.has_values[:, np.newaxis] & self.has_values[np.newaxis, :]
+        return np.where(both, np.maximum(scores, value_scores), scores)
+
+    def top_k(self, profile: TableProfile, k: int) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (len(profile), len(self)) bool, profile 의 column 마다 점수가 높은 k 개의 column 만 True
+        """
+        scores = self.scores(profile)
+        candidates = np.zeros(scores.shape, dtype=bool)
+        if k >= len(self):
+            candidates[:] = True
+            return candidates
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        np.put_along_axis(candidates, top, True, axis=1)
+        return candidates
+
+
+def candidate_pairs(l_profile: TableProfile, r_profile: TableProfile, top_k: int) -> Optional[np.ndarray]:
+    """l_column 마다 top_k 개의 r_column 후보
+
+    Returns:
+        Optional[np.ndarray]: (len(l_profile), len(r_profile)) bool, top_k 가 0 이거나 r_column 수 이상이면 None (전체 쌍)
+    """
+    if top_k <= 0 or top_k >= len(r_profile):
+        return None
+    return ColumnVectorIndex(r_profile).top_k(l_profile, top_k)
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Optional
+from uuid import uuid4
+
+import numpy as np
+
+from app.config import settings
+from app.src.correlations.relation_features import TableProfile
+from app.src.correlations.self_features import feature_cache_version
+
+"""
+self features 의 data type one hot (앞 4 개 feature) 순서, self_features.DataTypes 의 value 와 같음
+STRICT_NUMERIC, MAINLY_NUMERIC 은 같은 feature 를 사용
+"""
+DATA_TYPE_NAMES = ("url", "numeric", "date", "string")
+
+
+def profile_data_types(features: np.ndarray) -> list[str]:
+    """self features 의 data type one hot 으로 column 별 data type 이름 반환"""
+    return [DATA_TYPE_NAMES[i] for i in np.argmax(features[:, :len(DATA_TYPE_NAMES)], axis=1)]
+
+
+class ProfileCatalog:
+    """등록된 테이블의 TableProfile 로컬 저장소
+
+    Notes:
+        테이블 정보 (column, data type, row 수 등) 는 sqlite 에, self features 와 column name embedding 은
+        테이블 별 .npy 파일로 저장하여 np.load(mmap_mode="r") 로 읽는다. 매칭 시 원본 파일은 다시 읽지 않는다.
+        같은 host 의 gunicorn worker 들이 하나의 저장소를 공유하며, 재등록 시 새 디렉토리에 저장한 뒤 교체한다.
+    """
+    COLUMNS = ("table_id", "path", "columns", "data_types", "row_count", "sample_rows", "version", "registered_at")
+    FEATURES_FILE = "features.npy"
+    COL_NAME_EMBEDDINGS_FILE = "col_name_embeddings.npy"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.profiles_path = os.path.join(path, "profiles")
+        os.makedirs(self.profiles_path, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS tables (
+                    table_id TEXT PRIMARY KEY,
+                    path TEXT NOT NULL,
+                    columns TEXT NOT NULL,
+                    col_names TEXT NOT NULL,
+                    data_types TEXT NOT NULL,
+                    row_count INTEGER NOT NULL,
+                    sample_rows INTEGER,
+                    version TEXT NOT NULL,
+                    profile_dir TEXT NOT NULL,
+                    registered_at REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(os.path.join(self.path, "catalog.sqlite3"), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _to_dict(self, row: sqlite3.Row) -> dict:
+        table = {c: row[c] for c in self.COLUMNS}
+        table["columns"] = json.loads(table["columns"])
+        table["data_types"] = json.loads(table["data_types"])
+        return table
+
+    def register(self, table_id: str, table_path: str, profile: TableProfile,
+                 sample_rows: Optional[int] = None) -> dict:
+        """profile 을 저장, 같은 table_id 가 있으면 교체"""
+        profile_dir = f"{table_id}.{uuid4().hex}"
+        path = os.path.join(self.profiles_path, profile_dir)
+        os.makedirs(path)
+        np.save(os.path.join(path, self.FEATURES_FILE), np.asarray(profile.features, dtype=np.float64))
+        np.save(os.path.join(path, self.COL_NAME_EMBEDDINGS_FILE), np.asarray(profile.col_name_embeddings))
+
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            old = conn.execute("SELECT profile_dir FROM tables WHERE table_id = ?", (table_id,)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO tables (table_id, path, columns, col_names, data_types, row_count, "
+                         "sample_rows, version, profile_dir, registered_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                         (table_id, table_path, json.dumps(profile.columns), json.dumps(profile.col_names),
+                          json.dumps(profile_data_types(profile.features)), profile.row_count, sample_rows,
+                          feature_cache_version(), profile_dir, time.time()))
+            conn.execute("COMMIT")
+
+        if old is not None:
+            # 이미 mmap 으로 열린 파일은 삭제 후에도 닫힐 때까지 읽을 수 있음
+            shutil.rmtree(os.path.join(self.profiles_path, old["profile_dir"]), ignore_errors=True)
+        logging.info(f"schema_matching|catalog registered {table_id} ({len(profile)} columns) from {table_path}")
+        return self.get(table_id)
+
+    def get(self, table_id: str) -> Optional[dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM tables WHERE table_id = ?", (table_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def list(self) -> list[dict]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute("SELECT * FROM tables ORDER BY registered_at").fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def delete(self, table_id: str) -> bool:
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT profile_dir FROM tables WHERE table_id = ?", (table_id,)).fetchone()
+            conn.execute("DELETE FROM tables WHERE table_id = ?", (table_id,))
+            conn.execute("COMMIT")
+
+        if row is None:
+            return False
+        shutil.rmtree(os.path.join(self.profiles_path, row["profile_dir"]), ignore_errors=True)
+        return True
+
+    def load(self, table_id: str) -> Optional[tuple[dict, TableProfile]]:
+        """저장된 TableProfile, features 와 embedding 은 memory map 된 read-only 배열
+
+        Returns:
+            (table, profile), 등록되지 않았거나 저장된 .npy 파일이 없는 table_id 이면 None
+        """
+        last_profile_dir = None
+        while True:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT * FROM tables WHERE table_id = ?", (table_id,)).fetchone()
+            if row is None:
+                return None
+            if row["profile_dir"] == last_profile_dir:
+                # 재등록되지 않았는데 파일이 없으면 저장소가 손상된 것이므로 다시 조회하지 않음
+                logging.warning(f"schema_matching|catalog profile of {table_id} is missing: {last_profile_dir}")
+                return None
+            last_profile_dir = row["profile_dir"]
+
+            path = os.path.join(self.profiles_path, row["profile_dir"])
+            try:
+                features = np.load(os.path.join(path, self.FEATURES_FILE), mmap_mode="r")
+                col_name_embeddings = np.load(os.path.join(path, self.COL_NAME_EMBEDDINGS_FILE), mmap_mode="r")
+            except FileNotFoundError:
+                # 다른 worker 가 재등록, 삭제한 경우 profile_dir 이 바뀌었는지 다시 조회
+                continue
+
+            profile = TableProfile(json.loads(row["columns"]), json.loads(row["col_names"]), features,
+                                   col_name_embeddings, row["row_count"])
+            return self._to_dict(row), profile
+
+
+class TableCatalog:
+    """worker process 마다 하나의 ProfileCatalog 를 공유"""
+    _store: Optional[ProfileCatalog] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def store(cls) -> ProfileCatalog:
+        if cls._store is None:
+            with cls._lock:
+                if cls._store is None:
+                    cls._store = ProfileCatalog(settings.CATALOG_PATH)
+        return cls._store
@@ -0,0 +1,177 @@
+"""
+parquet, arrow (ipc), feather 테이블 읽기
+
+read_table 이 csv 로 변환한 테이블을 읽은 경우와 같은 column, dtype 의 DataFrame 을 만들어야 함.
+- 파일은 memory map 하여 arrow, feather 는 record batch 를 복사하지 않고 참조하고, parquet 는 필요한 row group 만 읽음
+- drop_na_columns 에서 제거될 것이 확실한 column ("Unnamed:", 유효한 값이 하나 이하) 은 읽지 않음 (column projection)
+- 필요한 row (sampling 된 row, max_rows 이전의 row) 만 pandas 로 변환
+"""
+import json
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+COLUMNAR_FORMATS = (".parquet", ".arrow", ".feather")
+
+
+class ColumnarTable:
+    """row group (parquet) 또는 record batch (arrow, feather) 단위로 읽는 columnar 테이블
+
+    Notes:
+        feather 는 v2 (arrow ipc file) 형식만 지원한다. arrow 는 ipc file, stream 형식 모두 지원한다.
+    """
+
+    def __init__(self, path: str):
+        if pa is None:
+            raise Exception(f"[Path: {path}] pyarrow is required to read .parquet, .arrow, .feather tables")
+
+        self.source = pa.memory_map(path, "r")
+        self.parquet: Optional[pq.ParquetFile] = None
+        self.batches: list[pa.RecordBatch] = []
+        if path.endswith(".parquet"):
+            self.parquet = pq.ParquetFile(self.source)
+            schema = self.parquet.schema_arrow
+            self.group_rows = [self.parquet.metadata.row_group(i).num_rows
+                               for i in range(self.parquet.num_row_groups)]
+        else:
+            try:
+                reader = pa.ipc.open_file(self.source)
+                self.batches = [reader.get_batch(i) for i in range(reader.num_record_batches)]
+            except pa.ArrowInvalid:
+                self.source.seek(0)
+                reader = pa.ipc.open_stream(self.source)
+                self.batches = list(reader)
+            schema = reader.schema
+            self.group_rows = [batch.num_rows for batch in self.batches]
+
+        # to_pandas 가 pandas metadata 로 index, categorical 을 복원하지 않도록 제거
+        self.schema = schema.remove_metadata()
+        index_columns = [c for c in (schema.pandas_metadata or {}).get("index_columns", []) if isinstance(c, str)]
+        self.columns = [name for name in self.schema.names if name not in index_columns]
+        self.group_offsets = np.cumsum([0] + self.group_rows)
+        self.row_count = int(self.group_offsets[-1])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        self.batches = []
+        self.source.close()
+
+    def _groups(self, row_count: int) -> range:
+        """앞에서부터 row_count 개의 row 를 포함하는 group"""
+        return range(int(np.searchsorted(self.group_offsets, row_count, side="left")))
+
+    def _read_group(self, i: int, columns: list[str]) -> "pa.Table":
+        if self.parquet is not None:
+            return self.parquet.read_row_group(i, columns=columns)
+        return pa.Table.from_batches([self.batches[i]]).select(columns)
+
+    def null_counts(self, row_count: int) -> dict[str, Optional[int]]:
+        """앞에서부터 row_count 개의 row 를 포함하는 group 들의 column 별 null 수, 알 수 없으면 None
+
+        Notes:
+            parquet 는 데이터를 읽지 않고 row group statistics 를 사용한다.
+            nested column 또는 statistics 가 없는 column 은 None 을 반환.
+        """
+        if self.parquet is None:
+            return {name: sum(self.batches[i].column(name).null_count for i in self._groups(row_count))
+                    for name in self.columns}
+
+        metadata = self.parquet.metadata
+        counts: dict[str, Optional[int]] = {name: 0 for name in self.columns}
+        for i in self._groups(row_count):
+            row_group = metadata.row_group(i)
+            leaves = {row_group.column(j).path_in_schema: row_group.column(j) for j in range(row_group.num_columns)}
+            for name in self.columns:
+                leaf = leaves.get(name)
+                statistics = leaf.statistics if leaf is not None else None
+                if counts[name] is None or statistics is None or not statistics.has_null_count:
+                    counts[name] = None
+                else:
+                    counts[name] += statistics.null_count
+        return counts
+
+    def candidate_columns(self, row_count: int) -> list[str]:
+        """drop_na_columns 이후 남을 수 있는 column
+
+        Notes:
+            NaN, "--" 도 유효하지 않은 값이지만 읽기 전에는 알 수 없으므로, null type 이거나 null 이 아닌 값이 하나 이하인
+            column 만 제외한다.
+            sampling 된 row 의 유효한 값의 수는 전체 row 보다 클 수 없으므로 sampling 하는 경우에도 제외해도 됨.
+        """
+        null_counts = self.null_counts(row_count)
+        rows = sum(self.group_rows[i] for i in self._groups(row_count))
+        # "Unnamed:" 는 pandas 가 이름 없는 header (to_csv 로 저장된 index 등) 에 붙이는 이름, drop_na_columns 와 같이 제외
+        return [name for name in self.columns if "Unnamed:" not in name
+                and not pa.types.is_null(self.schema.field(name).type)
+                and (null_counts[name] is None or rows - null_counts[name] > 1)]
+
+    def read(self, columns: list[str], row_ids: Optional[np.ndarray] = None,
+             row_count: Optional[int] = None) -> pd.DataFrame:
+        """
+        Args:
+            columns: 읽을 column
+            row_ids: 주어지면 해당 row 번호 (오름차순) 의 row 만 읽음
+            row_count: 주어지면 앞에서부터 row_count 개의 row 만 읽음
+        """
+        if row_count is None:
+            row_count = self.row_count
+
+        tables = []
+        for i in self._groups(row_count):
+            start = int(self.group_offsets[i])
+            if row_ids is None:
+                group = self._read_group(i, columns)
+                tables.append(group.slice(0, min(self.group_rows[i], row_count - start)))
+                continue
+
+            lo, hi = np.searchsorted(row_ids, [start, start + self.group_rows[i]])
+            if lo < hi:
+                tables.append(self._read_group(i, columns).take(row_ids[lo:hi] - start))
+
+        schema = pa.schema([self.schema.field(name) for name in columns])
+        table = pa.concat_tables([t.replace_schema_metadata(None) for t in tables]) if tables \
+            else schema.empty_table()
+        return to_pandas(table)
+
+
+def to_pandas(table: "pa.Table") -> pd.DataFrame:
+    """csv 로 변환하여 읽은 경우와 같은 dtype 이 되도록 arrow type 변환
+
+    Notes:
+        null 이 있는 int column 은 float64, 문자열은 object 가 된다 (null 은 NaN). date 는 datetime64 로 변환한다.
+        decimal 은 float64, time 은 문자열, list, struct 등 nested 값은 json 문자열로 변환한다.
+    """
+    columns = []
+    for column in table.columns:
+        column_type = column.type
+        if pa.types.is_dictionary(column_type):
+            column = column.cast(column_type.value_type)
+            column_type = column_type.value_type
+
+        if pa.types.is_decimal(column_type):
+            column = column.cast(pa.float64())
+        elif pa.types.is_time(column_type):
+            column = column.cast(pa.string())
+        elif pa.types.is_nested(column_type):
+            column = pa.array([None if v is None else json.dumps(v, ensure_ascii=False, default=str)
+                               for v in column.to_pylist()], type=pa.string())
+        columns.append(column)
+
+    df = pa.table(columns, names=table.column_names).to_pandas(date_as_object=False)
+    for column in df.columns[df.dtypes == object]:
+        # csv 와 같이 null 을 None 대신 NaN 으로
+        df[column] = df[column].mask(df[column].isna(), np.nan)
+    return df
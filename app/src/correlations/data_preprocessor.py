@@ -1,87 +1,183 @@
-import json
+import io
 import logging
 import re
-from collections import defaultdict
+from itertools import islice
+from typing import Iterable, Optional
 
+import numpy as np
 import pandas as pd
 
+from app.config import settings
+from app.src.correlations.columnar_table import COLUMNAR_FORMATS, ColumnarTable
+from app.src.correlations.json_flatten import flatten_table, iter_batches, open_items
 
-def read_table(path: str, save_as_csv: bool = False) -> pd.DataFrame:
+
+def read_table(path: str, save_as_csv: bool = False, sample_rows: int = 0,
+               max_rows: Optional[int] = None, skip_na_columns: bool = False) -> pd.DataFrame:
     """
 
     Args:
-        path: MUST be a path to a csv, json, jsonl file
+        path: MUST be a path to a csv, json, jsonl, parquet, arrow, feather file
         save_as_csv: save the table as a csv file
+        sample_rows: 0 보다 크면 최대 sample_rows 개의 row 를 reservoir sampling 하여 반환
+            json, jsonl 은 최상위 record (jsonl 은 line) 단위로 sampling
+        max_rows: 주어지면 앞에서부터 max_rows 개의 row (json, jsonl 은 record) 만 읽음
+        skip_na_columns: parquet, arrow, feather 에서 drop_na_columns 로 제거될 것이 확실한 column 은 읽지 않음
     Return:
         pd.DataFrame
     """
-    if path.endswith(".csv"):
-        df = pd.read_csv(path)
+    if sample_rows > 0 and path.endswith(".csv"):
+        # 전체 파일을 메모리에 올리지 않도록 chunk 단위로 읽으며 sampling
+        # chunk 마다 dtype 을 추론하면 같은 column 에 int, str 이 섞이므로 문자열로 읽고 sample 에서 한 번만 추론
+        with pd.read_csv(path, chunksize=settings.PROFILE_CHUNK_ROWS, nrows=max_rows, dtype=str) as chunks:
+            df = infer_dtypes(reservoir_sample(chunks, sample_rows, settings.PROFILE_SAMPLE_SEED))
+    elif path.endswith(".csv"):
+        df = pd.read_csv(path, nrows=max_rows)
     elif path.endswith(".json"):
-        df = csv_from_json(path)
+        df = csv_from_json(path, sample_rows, max_rows)
     elif path.endswith(".jsonl"):
-        df = csv_from_jsonl(path)
+        df = csv_from_jsonl(path, sample_rows, max_rows)
+    elif path.endswith(COLUMNAR_FORMATS):
+        df = read_columnar(path, sample_rows, max_rows, skip_na_columns)
     else:
-        raise Exception(f"[Path: {path}] must end with .csv or .json or .jsonl")
+        raise Exception(f"[Path: {path}] must end with .csv or .json or .jsonl or .parquet or .arrow or .feather")
 
     if save_as_csv:
-        save_pth = re.sub(r'\.jsonl?', '.csv', path)
+        save_pth = re.sub(r'\.(jsonl?|parquet|arrow|feather)$', '.csv', path)
         df.to_csv(save_pth, index=False, encoding='utf-8')
 
     return df
 
 
-def csv_from_json(json_path: str) -> pd.DataFrame:
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def reservoir_sample(chunks: Iterable[pd.DataFrame], sample_rows: int, seed: int) -> pd.DataFrame:
+    """chunk 단위로 들어오는 row 중 sample_rows 개를 균등 확률로 sampling (reservoir sampling, Algorithm R)
+
+    Notes:
+        메모리에는 sample 과 현재 chunk 만 유지한다. 같은 seed, 같은 chunk 크기로 읽으면 항상 같은 sample 을 반환.
+        sample 은 원본 row 순서대로 정렬하여 반환.
+
+    Args:
+        chunks: 순서대로 읽은 DataFrame chunk
+        sample_rows: sample 크기
+        seed: random seed
 
-    key_values = find_all_keys_values(data, "")
+    Returns:
+        pd.DataFrame: 최대 sample_rows 개의 row
+    """
+    rng = np.random.default_rng(seed)
+
+    # index 는 reservoir slot 번호 (0 ~ sample_rows - 1)
+    reservoir: Optional[pd.DataFrame] = None
+    columns = None
+    # slot 별 원본 row 번호
+    row_ids = np.zeros(sample_rows, dtype=np.int64)
+    seen = 0
+    for chunk in chunks:
+        chunk = chunk.reset_index(drop=True)
+        if columns is None:
+            columns = chunk.columns
+
+        # reservoir 가 다 차기 전의 row 는 그대로 추가
+        fill = min(max(sample_rows - seen, 0), len(chunk))
+        if fill > 0:
+            filled = chunk.iloc[:fill].set_axis(np.arange(seen, seen + fill))
+            reservoir = filled if reservoir is None else pd.concat([reservoir, filled])
+            row_ids[seen:seen + fill] = np.arange(seen, seen + fill)
+
+        # i 번째 row 는 sample_rows / (i + 1) 확률로 임의의 slot 을 교체
+        positions = np.arange(fill, len(chunk))
+        slots = rng.integers(0, seen + positions + 1)
+        replaced = slots < sample_rows
+        if replaced.any():
+            # 같은 slot 이 여러 번 교체되면 마지막 row 만 남김
+            last_slots, last_index = np.unique(slots[replaced][::-1], return_index=True)
+            last_positions = positions[replaced][::-1][last_index]
+
+            incoming = chunk.iloc[last_positions].set_axis(last_slots)
+            reservoir = pd.concat([reservoir.drop(index=last_slots), incoming])
+            row_ids[last_slots] = seen + last_positions
+
+        seen += len(chunk)
+
+    if reservoir is None:
+        return pd.DataFrame(columns=columns)
+
+    logging.info(f"schema_matching|sampled {len(reservoir)} of {seen} rows")
+    order = np.argsort(row_ids[reservoir.index.to_numpy()], kind="stable")
+    return reservoir.iloc[order].reset_index(drop=True)
+
+
+def infer_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """문자열로 읽은 csv row 들의 dtype 을 read_csv 로 다시 추론"""
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False)
+    buffer.seek(0)
+    return pd.read_csv(buffer)
+
+
+def csv_from_json(json_path: str, sample_rows: int = 0, max_rows: Optional[int] = None) -> pd.DataFrame:
+    key_values = flatten_json_table(json_path, sample_rows, max_rows)
 
     df = pd.DataFrame({k: pd.Series(v) for k, v in key_values.items()})
 
     return df
 
 
-def csv_from_jsonl(jsonl_path: str) -> pd.DataFrame:
-    data = [json.loads(line) for line in open(jsonl_path)]
-
-    # need parent key, use TOPLEVEL
-    # TODO: replace TOPLEVEL
-    key_values = find_all_keys_values({"TOPLEVEL": data}, "TOPLEVEL")
+def csv_from_jsonl(jsonl_path: str, sample_rows: int = 0, max_rows: Optional[int] = None) -> pd.DataFrame:
+    # "TOPLEVEL." 이 제거된 column 이름
+    key_values = flatten_json_table(jsonl_path, sample_rows, max_rows)
 
-    # remove "TOPLEVEL.", but remains ".*"
-    key_values = {k.replace("TOPLEVEL.", ""): v for k, v in key_values.items() if len(v) > 1}
+    key_values = {k: v for k, v in key_values.items() if len(v) > 1}
 
     df = pd.DataFrame({k: pd.Series(v) for k, v in key_values.items()})
 
     return df
 
 
-def find_all_keys_values(json_data: any, parent_key: str) -> defaultdict[any, list]:
+def flatten_json_table(path: str, sample_rows: int = 0, max_rows: Optional[int] = None) -> dict[str, list]:
+    """json, jsonl 파일을 record 단위로 읽으며 column 별 값으로 펼침
+
+    Args:
+        path: json 또는 jsonl 파일
+        sample_rows: 0 보다 크면 최대 sample_rows 개의 record 를 reservoir sampling 하여 펼침
+        max_rows: 주어지면 앞에서부터 max_rows 개의 record 만 읽음
     """
-    모든 key, value recursive 하게 순회
+    f, items, parent_key = open_items(path)
+    with f:
+        if sample_rows > 0:
+            return flatten_table(sample_items(islice(items, max_rows), sample_rows), parent_key)
+        return flatten_table(items, parent_key, max_rows)
+
+
+def sample_items(items: Iterable[any], sample_rows: int) -> list[any]:
+    """reservoir_sample 과 같은 방식으로 item 을 sampling, 원래 순서대로 반환"""
+    chunks = (pd.DataFrame({"item": pd.Series(chunk, dtype=object)})
+              for chunk in iter_batches(items, settings.PROFILE_CHUNK_ROWS))
+    sample = reservoir_sample(chunks, sample_rows, settings.PROFILE_SAMPLE_SEED)
+    return sample["item"].tolist() if "item" in sample else []
+
+
+def read_columnar(path: str, sample_rows: int = 0, max_rows: Optional[int] = None,
+                  skip_na_columns: bool = False) -> pd.DataFrame:
+    """parquet, arrow, feather 파일에서 필요한 column, row 만 읽음
 
-    Find all keys that don't have list or dictionary values and their values. 
-    Key should be saved with its parent key like "parent-key.key".
+    Notes:
+        sample_rows 이면 csv 와 같은 방식으로 row 번호만 reservoir sampling 한 뒤 해당 row 만 읽는다.
+        같은 테이블을 csv 로 변환하여 읽은 경우와 같은 row 가 선택됨.
     """
-    key_values = defaultdict(list)
-    for key, value in json_data.items():
-        full_key = f"{parent_key}.{key}"
-        if isinstance(value, dict):
-            value = [value]
-
-        if isinstance(value, list):
-            for item in value:
-                if isinstance(item, dict):
-                    child_key_values = find_all_keys_values(item, key)
-                    for child_key, child_value in child_key_values.items():
-                        key_values[child_key].extend(child_value)
-                else:
-                    key_values[full_key].append(item)
-        else:
-            key_values[full_key].append(value)
-
-    return key_values
+    with ColumnarTable(path) as table:
+        row_count = table.row_count if max_rows is None else min(table.row_count, max_rows)
+        columns = table.candidate_columns(row_count) if skip_na_columns else table.columns
+        row_ids = sample_row_ids(row_count, sample_rows) if sample_rows > 0 else None
+        return table.read(columns, row_ids, row_count)
+
+
+def sample_row_ids(row_count: int, sample_rows: int) -> np.ndarray:
+    """reservoir_sample 로 row_count 개의 row 중 sampling 되는 row 번호 (오름차순)"""
+    chunks = (pd.DataFrame({"row": np.arange(start, min(start + settings.PROFILE_CHUNK_ROWS, row_count))})
+              for start in range(0, row_count, settings.PROFILE_CHUNK_ROWS))
+    sample = reservoir_sample(chunks, sample_rows, settings.PROFILE_SAMPLE_SEED)
+    return sample["row"].to_numpy(dtype=np.int64) if "row" in sample else np.zeros(0, dtype=np.int64)
 
 
 def drop_na_columns(table_df: pd.DataFrame) -> pd.DataFrame:
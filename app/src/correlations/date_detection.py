@@ -0,0 +1,124 @@
+"""
+문자열 값의 날짜 판단 (self_features.is_date)
+
+self_features.is_date 가 모든 값에 dateutil.parser.parse 를 호출하던 것과 같은 결과를 반환해야 함.
+- 자주 사용되는 날짜 format 을 sample 로 추정하고, 해당 format 으로 pandas.to_datetime 을 한 번에 실행
+- dateutil 이 알지 못하는 단어가 포함된 문자열은 parse 하지 않고 날짜가 아닌 것으로 판단
+- 나머지 (format 이 애매한) 값만 dateutil 로 parse 하고, 결과를 값 단위로 memoize
+"""
+import re
+from functools import lru_cache
+from itertools import groupby
+from typing import Optional
+
+import pandas as pd
+from dateutil.parser import parse as parse_date
+from dateutil.parser import parserinfo
+
+# check if the date is near to today
+# TODO: 왜 2000 년 전, 2030 년 이후 데이터 drop?
+MIN_YEAR = 2000
+MAX_YEAR = 2030
+
+"""
+pandas.to_datetime 으로 먼저 parse 할 format 과, 해당 format 으로 parse 할 값의 형태
+pandas 의 %m, %d 는 한 자리 숫자도 허용하므로 ("202013" -> 2020-01-03) 자릿수가 고정된 값만 parse 함
+format 으로 parse 된 값은 dateutil 로 parse 해도 같은 연도가 나오는 format 만 사용해야 함
+"""
+DATE_FORMATS = {
+    "%Y-%m-%d": re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}'),
+    "%Y-%m-%d %H:%M:%S": re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}:[0-9]{2}'),
+    "%Y-%m-%dT%H:%M:%S": re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2}T[0-9]{2}:[0-9]{2}:[0-9]{2}'),
+    "%Y-%m-%d %H:%M": re.compile(r'[0-9]{4}-[0-9]{2}-[0-9]{2} [0-9]{2}:[0-9]{2}'),
+    "%Y/%m/%d": re.compile(r'[0-9]{4}/[0-9]{2}/[0-9]{2}'),
+    "%Y.%m.%d": re.compile(r'[0-9]{4}\.[0-9]{2}\.[0-9]{2}'),
+    "%m/%d/%Y": re.compile(r'[0-9]{2}/[0-9]{2}/[0-9]{4}'),
+    "%d/%m/%Y": re.compile(r'[0-9]{2}/[0-9]{2}/[0-9]{4}'),
+    "%Y%m%d": re.compile(r'[0-9]{8}'),
+}
+
+# format 추정에 사용하는 값의 수
+FORMAT_SAMPLE_SIZE = 100
+
+_info = parserinfo()
+"""
+dateutil parser 가 날짜의 일부로 해석하는 단어 (소문자)
+nan, inf, infinity 는 float() 로 변환되어 숫자로 해석됨
+"""
+DATEUTIL_WORDS = (set(_info._jump) | set(_info._weekdays) | set(_info._months) | set(_info._hms)
+                  | set(_info._ampm) | set(_info._utczone) | set(_info._pertain) | {"nan", "inf", "infinity"})
+DATEUTIL_MONTHS = set(_info._months)
+
+ASCII_WORD_PATTERN = re.compile(r'[A-Za-z]+')
+TZ_NAME_PATTERN = re.compile(r'[A-Z]{1,5}')
+
+
+def split_words(data: str) -> list[str]:
+    """dateutil lexer 와 같이 연속된 문자 (str.isalpha) 를 하나의 단어로 분리"""
+    if data.isascii():
+        return ASCII_WORD_PATTERN.findall(data)
+    return ["".join(chars) for is_word, chars in groupby(data, str.isalpha) if is_word]
+
+
+def could_be_date(data: str) -> bool:
+    """dateutil.parser.parse 가 성공할 가능성이 있는 문자열인지 확인
+
+    Notes:
+        fuzzy=False 인 dateutil parser 는 알지 못하는 단어가 있으면 실패한다.
+        단, "Jan of <단어>" 처럼 month 뒤의 단어를 건너뛰는 경우가 있어 month 가 있으면 parse 해본다.
+        '\\x00' 은 lexer 가 무시하여 앞뒤 단어가 합쳐지므로 parse 해본다.
+    """
+    if "\x00" in data:
+        return True
+
+    words = [word.lower() for word in split_words(data) if not TZ_NAME_PATTERN.fullmatch(word)]
+    if all(word in DATEUTIL_WORDS for word in words):
+        return True
+    return any(word in DATEUTIL_MONTHS for word in words)
+
+
+@lru_cache(maxsize=65536)
+def parse_year(data: str) -> Optional[int]:
+    """
+    Returns:
+        Optional[int]: dateutil 로 parse 한 날짜의 연도, parse 할 수 없으면 None
+    """
+    if not could_be_date(data):
+        return None
+
+    try:
+        return parse_date(data).year
+    except Exception as _:
+        return None
+
+
+def infer_date_formats(data: pd.Series) -> list[str]:
+    """sample 중 하나 이상의 값이 해당 형태인 DATE_FORMATS 를 많은 순서로 반환"""
+    sample = data.iloc[:FORMAT_SAMPLE_SIZE]
+
+    hits = {date_format: int(sample.str.fullmatch(pattern).sum()) for date_format, pattern in DATE_FORMATS.items()}
+    return sorted([f for f in DATE_FORMATS if hits[f] > 0], key=lambda f: -hits[f])
+
+
+def count_dates(strings: list[str]) -> int:
+    """MIN_YEAR ~ MAX_YEAR 사이의 날짜로 parse 되는 값의 수
+
+    Notes:
+        추정한 format 으로 parse 되지 않은 값만 dateutil 로 parse 한다.
+    """
+    remaining = pd.Series(strings, dtype=object)
+
+    cnt = 0
+    for date_format in infer_date_formats(remaining):
+        matched = remaining.str.fullmatch(DATE_FORMATS[date_format])
+        parsed = pd.to_datetime(remaining[matched], format=date_format, errors="coerce")
+        years = parsed[parsed.notna()].dt.year
+        cnt += int(((years >= MIN_YEAR) & (years <= MAX_YEAR)).sum())
+        remaining = remaining.drop(parsed.index[parsed.notna()])
+
+    for data in remaining:
+        year = parse_year(data)
+        if year is not None and MIN_YEAR <= year <= MAX_YEAR:
+            cnt += 1
+
+    return cnt
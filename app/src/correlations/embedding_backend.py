@@ -0,0 +1,187 @@
+"""
+column 값, column 이름 embedding backend
+
+relation features 는 embedding 의 cosine similarity 만 사용하므로 (calculate_embedding_cosine_similarity, util.cos_sim),
+같은 문장 embedding model 이면 작은 model, 양자화 model, onnx graph 로 바꾸어도 booster 입력의 차원은 바뀌지 않음.
+- sentence_transformers: huggingface model 이름 또는 local path 의 SentenceTransformer (fp32)
+- sentence_transformers_int8: 위 model 의 Linear layer 를 int8 로 dynamic quantization (torch, CPU)
+- onnx: export_onnx 로 저장한 onnx graph 를 onnxruntime CPU 로 실행
+- embedding 차원이 DEEP_EMBEDDING_FEATURES_DIMENSION (768) 보다 작은 model 은 0 으로 padding, cosine similarity 는 같음
+"""
+import inspect
+import json
+import logging
+import os
+import sys
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+EMBEDDING_BACKENDS = ("sentence_transformers", "sentence_transformers_int8", "onnx")
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_CONFIG_FILE = "embedding_config.json"
+
+# self_features.Constants.DEEP_EMBEDDING_FEATURES_DIMENSION, self_features 가 model 을 import 하므로 따로 정의
+DEEP_EMBEDDING_FEATURES_DIMENSION = 768
+
+
+def embedding_version(backend: str, model: str) -> str:
+    """feature cache, catalog 에 사용하는 embedding model 버전, 기본 backend 는 model 이름만 사용"""
+    return model if backend == "sentence_transformers" else f"{model}:{backend}"
+
+
+class EmbeddingBackend(ABC):
+    """문장 목록을 (len(sentences), DEEP_EMBEDDING_FEATURES_DIMENSION) embedding 으로 encoding"""
+
+    def __init__(self, backend: str, model: str):
+        self.backend = backend
+        self.model = model
+        self.version = embedding_version(backend, model)
+
+    def encode(self, sentences: list[str], batch_size: int = 32) -> np.ndarray:
+        sentences = [str(sentence) for sentence in sentences]
+        if len(sentences) == 0:
+            return np.empty((0, DEEP_EMBEDDING_FEATURES_DIMENSION), dtype=np.float32)
+        return pad_embeddings(np.asarray(self._encode(sentences, batch_size), dtype=np.float32))
+
+    @abstractmethod
+    def _encode(self, sentences: list[str], batch_size: int) -> np.ndarray:
+        """padding 이전의 embedding, 빈 sentences 로는 호출되지 않음"""
+
+
+def pad_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """DEEP_EMBEDDING_FEATURES_DIMENSION 차원이 되도록 0 으로 padding, 내적과 norm 은 바뀌지 않음"""
+    dimension = embeddings.shape[1]
+    if dimension > DEEP_EMBEDDING_FEATURES_DIMENSION:
+        raise Exception(f"embedding dimension {dimension} exceeds {DEEP_EMBEDDING_FEATURES_DIMENSION}")
+    if dimension == DEEP_EMBEDDING_FEATURES_DIMENSION:
+        return embeddings
+    return np.pad(embeddings, ((0, 0), (0, DEEP_EMBEDDING_FEATURES_DIMENSION - dimension)))
+
+
+class SentenceTransformerBackend(EmbeddingBackend):
+
+    def __init__(self, model: str, quantize: bool = False):
+        super().__init__("sentence_transformers_int8" if quantize else "sentence_transformers", model)
+        from sentence_transformers import SentenceTransformer
+
+        self.transformer = SentenceTransformer(model, device="cpu" if quantize else None)
+        if quantize:
+            import torch
+
+            # 가중치만 int8 로 저장하고 activation 은 실행 시 양자화 (CPU 전용)
+            self.transformer = torch.quantization.quantize_dynamic(self.transformer, {torch.nn.Linear},
+                                                                   dtype=torch.qint8)
+
+    def _encode(self, sentences: list[str], batch_size: int) -> np.ndarray:
+        return self.transformer.encode(sentences, batch_size=batch_size, convert_to_numpy=True)
+
+
+class OnnxBackend(EmbeddingBackend):
+    """export_onnx 로 저장한 directory (model.onnx, tokenizer, embedding_config.json) 를 onnxruntime 으로 실행
+
+    Notes:
+        token embedding 을 SentenceTransformer 의 Pooling 과 같은 방식 (mean 또는 cls) 으로 pooling 한다.
+    """
+
+    def __init__(self, model: str):
+        super().__init__("onnx", model)
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise Exception("onnxruntime is required for EMBEDDING_BACKEND=onnx (poetry install --extras onnx)")
+        from transformers import AutoTokenizer
+
+        with open(os.path.join(model, ONNX_CONFIG_FILE), "r") as f:
+            self.config = json.load(f)
+        self.tokenizer = AutoTokenizer.from_pretrained(model)
+        self.session = ort.InferenceSession(os.path.join(model, ONNX_MODEL_FILE),
+                                            providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode(self, sentences: list[str], batch_size: int) -> np.ndarray:
+        embeddings = []
+        for start in range(0, len(sentences), batch_size):
+            tokens = self.tokenizer(sentences[start:start + batch_size], padding=True, truncation=True,
+                                    max_length=self.config["max_seq_length"], return_tensors="np")
+            inputs = {name: value.astype(np.int64) for name, value in tokens.items() if name in self.input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+            embeddings.append(pool_tokens(token_embeddings, tokens["attention_mask"], self.config))
+        return np.vstack(embeddings)
+
+
+def pool_tokens(token_embeddings: np.ndarray, attention_mask: np.ndarray, config: dict) -> np.ndarray:
+    if config["pooling"] == "cls":
+        pooled = token_embeddings[:, 0]
+    else:
+        mask = attention_mask[:, :, np.newaxis].astype(token_embeddings.dtype)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+    if config.get("normalize"):
+        pooled = pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+    return pooled
+
+
+def create_backend(backend: str, model: str) -> EmbeddingBackend:
+    if backend == "onnx":
+        return OnnxBackend(model)
+    if backend in ("sentence_transformers", "sentence_transformers_int8"):
+        return SentenceTransformerBackend(model, quantize=backend == "sentence_transformers_int8")
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def export_onnx(model: str, output_path: str, opset_version: int = 14):
+    """SentenceTransformer model 의 transformer 를 onnx graph 로, tokenizer 와 pooling 설정을 함께 저장
+
+    Notes:
+        mean, cls pooling 과 Normalize 만 지원한다. Dense layer 가 있는 model 은 지원하지 않는다.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Dense, Normalize, Pooling, Transformer
+
+    transformer = SentenceTransformer(model, device="cpu")
+    modules = list(transformer)
+    if not isinstance(modules[0], Transformer) or any(isinstance(m, Dense) for m in modules):
+        raise Exception(f"[Model: {model}] only Transformer + Pooling (+ Normalize) models can be exported")
+    pooling = next(m for m in modules if isinstance(m, Pooling))
+    # sentence-transformers 3.x 는 get_pooling_mode_str, 이후 버전은 pooling_mode 속성
+    pooling_mode = getattr(pooling, "pooling_mode", None) or pooling.get_pooling_mode_str()
+    if pooling_mode not in ("mean", "cls"):
+        raise Exception(f"[Model: {model}] only mean, cls pooling can be exported, got {pooling_mode}")
+
+    os.makedirs(output_path, exist_ok=True)
+    auto_model = modules[0].auto_model.eval()
+    tokenizer = modules[0].tokenizer
+    tokens = tokenizer(["schema matching"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in tokens]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    # torch 2.5 이후 dynamo exporter 는 onnxscript 가 필요하므로 TorchScript exporter 사용
+    options = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    class TokenEmbeddings(torch.nn.Module):
+        """input 순서를 input_names 로 고정하고 last hidden state 만 반환"""
+
+        def __init__(self):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            return self.auto_model(**dict(zip(input_names, inputs)))[0]
+
+    with torch.no_grad():
+        torch.onnx.export(TokenEmbeddings(), tuple(tokens[name] for name in input_names),
+                          os.path.join(output_path, ONNX_MODEL_FILE), input_names=input_names,
+                          output_names=["token_embeddings"], dynamic_axes=dynamic_axes, opset_version=opset_version,
+                          **options)
+    tokenizer.save_pretrained(output_path)
+    with open(os.path.join(output_path, ONNX_CONFIG_FILE), "w") as f:
+        json.dump({"source_model": model, "max_seq_length": transformer.max_seq_length, "pooling": pooling_mode,
+                   "normalize": any(isinstance(m, Normalize) for m in modules)}, f, indent=2)
+    logging.info(f"schema_matching|exported {model} to {output_path}")
+
+
+if __name__ == "__main__":
+    # python -m app.src.correlations.embedding_backend <model name or path> <output directory>
+    export_onnx(sys.argv[1], sys.argv[2])
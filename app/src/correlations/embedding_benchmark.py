@@ -0,0 +1,131 @@
+"""
+embedding backend 별 latency, F1 benchmark
+
+test_data 의 Table1, Table2, truth.json 이 있는 dataset 마다 profiling (self features, column name embedding),
+매칭을 수행하고 encoding 시간과 F1 을 비교한다. 모든 backend 가 같은 값 sample 을 encoding 하도록 dataset 마다
+random seed 를 고정하고, feature cache 는 사용하지 않는다.
+
+    python -m app.src.correlations.embedding_benchmark \\
+        --backend sentence_transformers=paraphrase-multilingual-mpnet-base-v2 \\
+        --backend sentence_transformers_int8=paraphrase-multilingual-mpnet-base-v2 \\
+        --backend onnx=./model/embedding/mpnet-onnx
+"""
+import argparse
+import glob
+import logging
+import os
+import random
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.src.correlations.embedding_backend import EMBEDDING_BACKENDS, EmbeddingBackend, create_backend
+from app.src.correlations.endpoints import get_scores
+from app.src.correlations.enums import MatchingModel, Strategy
+from app.src.correlations.matching import match_profiles, profile_table
+from app.src.correlations.model import SentenceTransformer
+from app.src.correlations.relation_features import SEED
+
+
+class TimedBackend(EmbeddingBackend):
+    """backend 의 encode 호출 시간, 문장 수를 누적"""
+
+    def __init__(self, backend: EmbeddingBackend):
+        super().__init__(backend.backend, backend.model)
+        self.inner = backend
+        self.seconds = 0.0
+        self.sentences = 0
+
+    def _encode(self, sentences: list[str], batch_size: int) -> np.ndarray:
+        start = time.perf_counter()
+        embeddings = self.inner.encode(sentences, batch_size)
+        self.seconds += time.perf_counter() - start
+        self.sentences += len(sentences)
+        return embeddings
+
+
+def find_datasets(path: str) -> list[str]:
+    """Table1.csv, Table2.csv, truth.json 이 모두 있는 dataset directory"""
+    return sorted(os.path.dirname(truth) for truth in glob.glob(os.path.join(path, "*", "truth.json"))
+                  if all(os.path.exists(os.path.join(os.path.dirname(truth), f)) for f in ("Table1.csv", "Table2.csv")))
+
+
+def benchmark(backend: str, model: str, datasets: list[str], sample_rows: int) -> list[dict]:
+    start = time.perf_counter()
+    timed = TimedBackend(create_backend(backend, model))
+    timed.inner.encode(["warm up"])
+    load_seconds = time.perf_counter() - start
+    SentenceTransformer.use(timed)
+
+    rows = []
+    for dataset in datasets:
+        timed.seconds, timed.sentences = 0.0, 0
+        random.seed(SEED)
+
+        start = time.perf_counter()
+        l_profile = profile_table(os.path.join(dataset, "Table1.csv"), sample_rows)
+        r_profile = profile_table(os.path.join(dataset, "Table2.csv"), sample_rows)
+        profile_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, _, predicted_tuples = match_profiles(l_profile, r_profile, MatchingModel.INITIAL, Strategy.MANY_TO_MANY)
+        match_seconds = time.perf_counter() - start
+
+        precision, recall, f1 = get_scores(predicted_tuples, os.path.join(dataset, "truth.json"))
+        rows.append({"backend": backend, "model": model, "dataset": os.path.basename(dataset),
+                     "load_s": load_seconds, "encode_s": timed.seconds, "sentences": timed.sentences,
+                     "profile_s": profile_seconds, "match_s": match_seconds,
+                     "precision": precision, "recall": recall, "f1": f1})
+    return rows
+
+
+def summarize(rows: list[dict]) -> list[dict]:
+    """backend, model 별 dataset 평균 (sentences 는 합계)"""
+    summary = []
+    for backend, model in dict.fromkeys((row["backend"], row["model"]) for row in rows):
+        selected = [row for row in rows if (row["backend"], row["model"]) == (backend, model)]
+        mean = {c: float(np.mean([row[c] for row in selected]))
+                for c in ("load_s", "encode_s", "profile_s", "match_s", "precision", "recall", "f1")}
+        summary.append({"backend": backend, "model": model, "dataset": "mean",
+                        "sentences": sum(row["sentences"] for row in selected), **mean})
+    return summary
+
+
+def print_rows(rows: list[dict]):
+    columns = ["backend", "model", "dataset", "load_s", "encode_s", "sentences", "profile_s", "match_s",
+               "precision", "recall", "f1"]
+    table = [[f"{row[c]:.4f}" if isinstance(row[c], float) else str(row[c]) for c in columns] for row in rows]
+    widths = [max(len(c), *(len(r[i]) for r in table)) for i, c in enumerate(columns)]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for r in table:
+        print("  ".join(v.ljust(w) for v, w in zip(r, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="embedding backend 별 latency, F1 benchmark")
+    parser.add_argument("--backend", action="append", required=True,
+                        help=f"<backend>=<model name or path>, backend: {', '.join(EMBEDDING_BACKENDS)}")
+    parser.add_argument("--data", default="./test_data",
+                        help="Table1.csv, Table2.csv, truth.json 이 있는 dataset 들의 상위 directory")
+    parser.add_argument("--sample-rows", type=int, default=0, help="테이블 별 profiling 에 사용할 최대 row 수, 0 이면 전체 row")
+    args = parser.parse_args()
+
+    # 매 실행마다 encoding 하도록 feature cache 사용 안 함
+    settings.FEATURE_CACHE_ENABLED = False
+    settings.COLUMN_NAME_CACHE_PERSIST = False
+    logging.getLogger().setLevel(logging.ERROR)
+
+    datasets = find_datasets(args.data)
+    rows = []
+    for spec in args.backend:
+        backend, _, model = spec.partition("=")
+        rows.extend(benchmark(backend, model, datasets, args.sample_rows))
+
+    print_rows(rows)
+    print()
+    print_rows(summarize(rows))
+
+
+if __name__ == "__main__":
+    main()
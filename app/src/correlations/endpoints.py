@@ -1,13 +1,15 @@
 import json
 import logging
 import os
-from typing import Optional
+from typing import Callable, Optional
 
 import pandas as pd
 from sklearn.metrics import f1_score, precision_score, recall_score
 
-from app.src.correlations.enums import Strategy, MatchingModel
-from app.src.correlations.matching import schema_matching
+from app.src.correlations.enums import Strategy, MatchingModel, MatchingStage, MultiMatchingOutput
+from app.src.correlations.catalog import TableCatalog
+from app.src.correlations.matching import schema_matching, schema_matching_one_to_many, schema_matching_registered, \
+    schema_matching_multi
 
 logger = logging.getLogger(__name__)
 
@@ -49,9 +51,14 @@ def run(
         model: Optional[MatchingModel] = MatchingModel.INITIAL,
         strategy: Optional[Strategy] = Strategy.MANY_TO_MANY,
         threshold: Optional[float] = None,
-        calculate_metrics: bool = True
+        calculate_metrics: bool = True,
+        progress: Optional[Callable[[MatchingStage], None]] = None,
+        sample_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None
 ) -> any:
-    df_pred, df_pred_labels, predicted_tuples = schema_matching(l_table, r_table, model, strategy, threshold)
+    df_pred, df_pred_labels, predicted_tuples = schema_matching(l_table, r_table, model, strategy, threshold,
+                                                                progress, sample_rows, top_k, blocking)
 
     if result_path and os.path.exists(result_path):
         export_metric_as_csv(result_path, df_pred, df_pred_labels)
@@ -62,6 +69,104 @@ def run(
     return df_pred
 
 
+def run_one_to_many(
+        l_table: str,
+        r_tables: list[str],
+        model: Optional[MatchingModel] = MatchingModel.INITIAL,
+        strategy: Optional[Strategy] = Strategy.MANY_TO_MANY,
+        threshold: Optional[float] = None,
+        sample_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None
+) -> list[pd.DataFrame]:
+    """l_table 을 한 번만 profiling 하여 r_tables 각각과 매칭
+
+    Returns:
+        r_tables 순서대로 similarity matrix (l_table columns x r_table columns)
+    """
+    results = schema_matching_one_to_many(l_table, r_tables, model, strategy, threshold, sample_rows, top_k,
+                                          blocking)
+
+    for r_table, (_, _, predicted_tuples) in zip(r_tables, results):
+        logging.info(f"Matching with {r_table}")
+        get_metric(predicted_tuples)
+
+    return [df_pred for df_pred, _, _ in results]
+
+
+def run_registered(
+        l_table: str,
+        table_ids: Optional[list[str]],
+        model: Optional[MatchingModel] = MatchingModel.INITIAL,
+        strategy: Optional[Strategy] = Strategy.MANY_TO_MANY,
+        threshold: Optional[float] = None,
+        sample_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None
+) -> tuple[list[str], list[pd.DataFrame]]:
+    """l_table 을 catalog 에 등록된 테이블들과 매칭
+
+    Returns:
+        (table_ids, similarity matrices), table_ids 를 지정하지 않으면 등록된 모든 테이블
+    """
+    if table_ids is None:
+        table_ids = [table["table_id"] for table in TableCatalog.store().list()]
+    results = schema_matching_registered(l_table, table_ids, model, strategy, threshold, sample_rows, top_k,
+                                         blocking)
+
+    for table_id, (_, _, predicted_tuples) in zip(table_ids, results):
+        logging.info(f"Matching with registered table {table_id}")
+        get_metric(predicted_tuples)
+
+    return table_ids, [df_pred for df_pred, _, _ in results]
+
+
+def run_multi(
+        tables: list[str],
+        model: Optional[MatchingModel] = MatchingModel.INITIAL,
+        strategy: Optional[Strategy] = Strategy.MANY_TO_MANY,
+        threshold: Optional[float] = None,
+        sample_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None,
+        output: MultiMatchingOutput = MultiMatchingOutput.MATRICES,
+        progress: Optional[Callable[[MatchingStage], None]] = None
+) -> dict:
+    """tables 의 모든 테이블 쌍 매칭, 테이블마다 한 번만 profiling (중복된 path 는 제거)
+
+    Returns:
+        {"result", "profiled_rows", "pruned_pairs"}
+        result 는 output 이 matrices 이면 테이블 쌍 별 similarity matrix,
+        correspondences 이면 모든 테이블 쌍의 매칭된 column 을 score 내림차순으로 합친 목록
+    """
+    # schema_matching_multi 가 반환하는 i, j 는 중복을 제거한 tables 의 index
+    tables = list(dict.fromkeys(tables))
+    results = schema_matching_multi(tables, model, strategy, threshold, progress, sample_rows, top_k, blocking)
+
+    profiled_rows = {}
+    pruned_pairs = 0
+    matrices = []
+    correspondences = []
+    for i, j, (df_pred, _, predicted_tuples) in results:
+        l_table, r_table = tables[i], tables[j]
+        logging.info(f"Matching {l_table} with {r_table}")
+        get_metric(predicted_tuples)
+
+        l_rows, r_rows = df_pred.attrs["profiled_rows"]
+        profiled_rows.update({l_table: l_rows, r_table: r_rows})
+        pruned_pairs += df_pred.attrs["pruned_pairs"]
+        if output == MultiMatchingOutput.MATRICES:
+            matrices.append({"l_table": l_table, "r_table": r_table, "result": df_pred.to_dict()})
+        else:
+            correspondences.extend({"l_table": l_table, "l_column": l_column, "r_table": r_table,
+                                    "r_column": r_column, "score": float(score)}
+                                   for l_column, r_column, score in predicted_tuples)
+
+    correspondences.sort(key=lambda c: c["score"], reverse=True)
+    return {"result": matrices if output == MultiMatchingOutput.MATRICES else correspondences,
+            "profiled_rows": profiled_rows, "pruned_pairs": pruned_pairs}
+
+
 def export_metric_as_csv(result_path: str, df_pred: pd.DataFrame, df_pred_labels: pd.DataFrame):
     pred_path = os.path.join(result_path, "similarity_matrix_value.csv")
     df_pred.to_csv(pred_path, index=True)
@@ -79,23 +184,36 @@ def get_metric(predicted_tuples: list[tuple[str, str, any]], truth_json: Optiona
     for pt in predicted_tuples:
         logging.info(pt)
 
-    if truth_json and os.path.exists(truth_json):
-        with open(truth_json) as f:
-            json_data = json.load(f)
-        y_true = [(m['source_column'], m['target_column']) for m in json_data['matches']]
-        y_pred = [(pt[0], pt[1]) for pt in predicted_tuples]
+    scores = get_scores(predicted_tuples, truth_json)
+    if scores is not None:
+        precision, recall, f1 = scores
+        logging.info(f"Precision: {precision}")
+        logging.info(f"Recall: {recall}")
+        logging.info(f"F1 Score: {f1}")
 
-        # y_true와 y_pred의 고유한 쌍을 설정
-        unique_labels = set(y_true) | set(y_pred)
 
-        # y_true와 y_pred를 이진 벡터로 변환
-        y_true_binary = [1 if label in y_true else 0 for label in unique_labels]
-        y_pred_binary = [1 if label in y_pred else 0 for label in unique_labels]
+def get_scores(predicted_tuples: list[tuple[str, str, any]],
+               truth_json: Optional[str] = None) -> Optional[tuple[float, float, float]]:
+    """
+    Returns:
+        (precision, recall, f1), truth_json 이 없으면 None
+    """
+    if not truth_json or not os.path.exists(truth_json):
+        return None
 
-        precision = precision_score(y_true_binary, y_pred_binary, average='binary')
-        recall = recall_score(y_true_binary, y_pred_binary, average='binary')
-        f1 = f1_score(y_true_binary, y_pred_binary, average='binary')
+    with open(truth_json) as f:
+        json_data = json.load(f)
+    y_true = [(m['source_column'], m['target_column']) for m in json_data['matches']]
+    y_pred = [(pt[0], pt[1]) for pt in predicted_tuples]
 
-        logging.info(f"Precision: {precision}")
-        logging.info(f"Recall: {recall}")
-        logging.info(f"F1 Score: {f1}")
+    # y_true와 y_pred의 고유한 쌍을 설정
+    unique_labels = set(y_true) | set(y_pred)
+
+    # y_true와 y_pred를 이진 벡터로 변환
+    y_true_binary = [1 if label in y_true else 0 for label in unique_labels]
+    y_pred_binary = [1 if label in y_pred else 0 for label in unique_labels]
+
+    precision = precision_score(y_true_binary, y_pred_binary, average='binary')
+    recall = recall_score(y_true_binary, y_pred_binary, average='binary')
+    f1 = f1_score(y_true_binary, y_pred_binary, average='binary')
+    return precision, recall, f1
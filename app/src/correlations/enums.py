@@ -25,3 +25,22 @@ class CombinationType(str, Enum):
 class TestType(str, Enum):
     EVALUATION = "evaluation",
     INFERENCE = "inference"
+
+
+class MatchingStage(str, Enum):
+    READ_TABLES = "read_tables"
+    FEATURES = "features"
+    PREDICT = "predict"
+    POSTPROCESS = "postprocess"
+
+
+class MultiMatchingOutput(str, Enum):
+    MATRICES = "matrices"
+    CORRESPONDENCES = "correspondences"
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, Optional, TypeVar
+
+from app.config import settings
+from app.exceptions.service import MatchingQueueFullError
+
+T = TypeVar("T")
+
+
+class MatchingExecutor:
+    """CPU 연산이 많은 스키마 매칭을 event loop 밖에서 실행하기 위한 executor
+
+    Notes:
+        MATCHING_POOL_SIZE 만큼 동시에 실행하고, MATCHING_QUEUE_LIMIT 만큼 대기시킨다.
+        대기 요청 수를 초과하면 MatchingQueueFullError 로 즉시 거절한다.
+        pending 은 event loop thread 에서만 변경되므로 별도의 lock 이 필요 없다.
+        process executor 는 spawn 으로 worker process 를 시작한다. 이미 여러 thread (OpenMP) 로 XGBoost, torch 를
+        실행한 worker 에서 fork 하면 자식 process 의 첫 predict 가 멈추기 때문이다 (preload 참고).
+    """
+    _executor: Optional[Executor] = None
+    _pending = 0
+
+    @classmethod
+    def get(cls) -> Executor:
+        if cls._executor is None:
+            if settings.MATCHING_EXECUTOR == "process":
+                cls._executor = ProcessPoolExecutor(max_workers=settings.MATCHING_POOL_SIZE,
+                                                    mp_context=multiprocessing.get_context("spawn"))
+            else:
+                cls._executor = ThreadPoolExecutor(max_workers=settings.MATCHING_POOL_SIZE,
+                                                   thread_name_prefix="matching")
+            logging.info(f"schema_matching|{settings.MATCHING_EXECUTOR} executor created "
+                         f"(pool_size={settings.MATCHING_POOL_SIZE}, queue_limit={settings.MATCHING_QUEUE_LIMIT})")
+        return cls._executor
+
+    @classmethod
+    async def run(cls, func: Callable[..., T], *args, **kwargs) -> T:
+        """func 를 executor 에서 실행하고 결과를 기다림
+
+        process executor 를 사용할 경우, func 와 인자는 pickle 가능해야 한다.
+        """
+        if cls._pending >= settings.MATCHING_POOL_SIZE + settings.MATCHING_QUEUE_LIMIT:
+            raise MatchingQueueFullError(cls._pending)
+
+        cls._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(cls.get(), partial(func, *args, **kwargs))
+        finally:
+            cls._pending -= 1
+
+    @classmethod
+    def shutdown(cls):
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
@@ -0,0 +1,131 @@
+import hashlib
+import logging
+import os
+import threading
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+
+
+class FeatureCache:
+    """column 값의 content hash 를 key 로 하는 self feature 디스크 캐시
+
+    Notes:
+        key = hash(column 값) + self_features.Constants.FEATURE_VERSION + embedding model 이름.
+        feature 계산 로직이나 embedding model 이 바뀌면 key 가 달라져 이전 캐시는 사용되지 않고 eviction 으로 정리됨.
+        값은 .npy (float64) 로 저장하여 캐시 사용 여부와 상관없이 동일한 feature 를 반환한다.
+        FEATURE_CACHE_MAX_BYTES 를 넘으면 가장 오래 사용하지 않은 파일부터 삭제 (LRU, mtime 기준).
+    """
+    _total_bytes: Optional[int] = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def enabled() -> bool:
+        return settings.FEATURE_CACHE_ENABLED
+
+    @staticmethod
+    def make_key(column: pd.Series, version: str) -> str:
+        try:
+            hashed = pd.util.hash_pandas_object(column, index=False).to_numpy()
+            content = hashed.tobytes()
+        except TypeError:
+            # list, dict 등 hash 불가능한 값이 섞인 경우
+            content = repr(column.tolist()).encode("utf-8")
+
+        h = hashlib.blake2b(digest_size=20)
+        h.update(version.encode("utf-8"))
+        h.update(str(column.dtype).encode("utf-8"))
+        h.update(content)
+        return h.hexdigest()
+
+    @staticmethod
+    def make_text_key(text: str, version: str) -> str:
+        h = hashlib.blake2b(digest_size=20)
+        h.update(version.encode("utf-8"))
+        h.update(b"\0")
+        h.update(text.encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def _path(key: str) -> str:
+        # 한 디렉토리에 파일이 너무 많아지지 않도록 key prefix 로 분리
+        return os.path.join(settings.FEATURE_CACHE_PATH, key[:2], f"{key}.npy")
+
+    @classmethod
+    def get(cls, key: str) -> Optional[np.ndarray]:
+        path = cls._path(key)
+        try:
+            feature = np.load(path)
+            os.utime(path)  # LRU 갱신
+            return feature
+        except (OSError, ValueError):
+            return None
+
+    @classmethod
+    def put(cls, key: str, feature: np.ndarray):
+        try:
+            cls._put(key, feature)
+        except OSError as e:
+            logging.warning(f"schema_matching|failed to write feature cache: {e}")
+
+    @classmethod
+    def _put(cls, key: str, feature: np.ndarray):
+        path = cls._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 다른 worker 가 읽는 중에 불완전한 파일이 보이지 않도록 임시 파일에 쓰고 교체
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.save(f, np.asarray(feature, dtype=np.float64))
+        os.replace(tmp_path, path)
+
+        with cls._lock:
+            if cls._total_bytes is None:
+                cls._total_bytes = cls._scan_total_bytes()
+            else:
+                cls._total_bytes += os.path.getsize(path)
+            if cls._total_bytes > settings.FEATURE_CACHE_MAX_BYTES:
+                cls._evict()
+
+    @staticmethod
+    def _list_files() -> list[tuple[str, float, int]]:
+        files = []
+        for root, _, names in os.walk(settings.FEATURE_CACHE_PATH):
+            for name in names:
+                if not name.endswith(".npy"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((path, stat.st_mtime, stat.st_size))
+        return files
+
+    @classmethod
+    def _scan_total_bytes(cls) -> int:
+        return sum(size for _, _, size in cls._list_files())
+
+    @classmethod
+    def _evict(cls):
+        """오래 사용하지 않은 파일부터 삭제하여 FEATURE_CACHE_MAX_BYTES 의 90% 이하로 줄임"""
+        files = sorted(cls._list_files(), key=lambda f: f[1])
+        total = sum(size for _, _, size in files)
+        target = settings.FEATURE_CACHE_MAX_BYTES * 0.9
+
+        removed = 0
+        for path, _, size in files:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+
+        cls._total_bytes = total
+        logging.info(f"schema_matching|feature cache evicted {removed} entries, {total} bytes remain")
@@ -0,0 +1,297 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import Any, Callable, Optional
+from uuid import uuid4
+
+from app.config import settings
+from app.src.correlations.endpoints import run, run_multi
+from app.src.correlations.enums import JobStatus, MatchingModel, MatchingStage, Strategy, MultiMatchingOutput
+
+"""
+job kind 별 실행 함수. (params, progress) 를 받아 JSON 직렬화 가능한 결과를 반환한다.
+"""
+JOB_HANDLERS: dict[str, Callable[[dict, Callable[[MatchingStage], None]], Any]] = {}
+
+
+def job_handler(kind: str):
+    def decorator(func):
+        JOB_HANDLERS[kind] = func
+        return func
+
+    return decorator
+
+
+@job_handler("schema_matching")
+def schema_matching_job(params: dict, progress: Callable[[MatchingStage], None]) -> dict:
+    """l_table, r_table 매칭, /correlations/ 과 같이 model 은 initial, strategy 는 many_to_many 로 고정"""
+    df_pred = run(params["l_table"], params["r_table"], params.get("result_path"), params.get("truth_json"),
+                  MatchingModel.INITIAL, Strategy.MANY_TO_MANY, params.get("threshold"), progress=progress,
+                  sample_rows=params.get("sample_rows"), top_k=params.get("top_k"),
+                  blocking=params.get("blocking"))
+    l_rows, r_rows = df_pred.attrs["profiled_rows"]
+    return {"result": json.loads(df_pred.to_json()),
+            "profiled_rows": {params["l_table"]: l_rows, params["r_table"]: r_rows},
+            "pruned_pairs": df_pred.attrs["pruned_pairs"]}
+
+
+@job_handler("multi_matching")
+def multi_matching_job(params: dict, progress: Callable[[MatchingStage], None]) -> dict:
+    """tables 의 모든 테이블 쌍 매칭, /correlations/multi 와 같이 model 은 initial, strategy 는 many_to_many 로 고정"""
+    return run_multi(params["tables"], MatchingModel.INITIAL, Strategy.MANY_TO_MANY, params.get("threshold"),
+                     params.get("sample_rows"), params.get("top_k"), params.get("blocking"),
+                     MultiMatchingOutput(params.get("output", MultiMatchingOutput.MATRICES)), progress)
+
+
+class JobStore:
+    """sqlite 기반 로컬 job 저장소
+
+    Notes:
+        같은 host 의 gunicorn worker 들이 하나의 파일을 공유하며, worker 가 재시작되어도 job 이 유지된다.
+        connection 은 thread 간 공유하지 않고 호출마다 새로 연다.
+    """
+    COLUMNS = ("job_id", "kind", "status", "stage", "completed_stages", "attempts", "error",
+               "created_at", "started_at", "finished_at")
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    stage TEXT,
+                    completed_stages TEXT NOT NULL DEFAULT '[]',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    owner TEXT,
+                    heartbeat_at REAL,
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    started_at REAL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: autocommit, 필요한 경우 BEGIN IMMEDIATE 로 직접 transaction 관리
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _to_dict(self, row: sqlite3.Row) -> dict:
+        job = {c: row[c] for c in self.COLUMNS}
+        job["completed_stages"] = json.loads(job["completed_stages"])
+        job["progress"] = len(job["completed_stages"]) / len(MatchingStage)
+        return job
+
+    def create(self, kind: str, params: dict) -> dict:
+        job_id = uuid4().hex
+        with closing(self._connect()) as conn:
+            conn.execute("INSERT INTO jobs (job_id, kind, status, params, created_at) VALUES (?, ?, ?, ?, ?)",
+                         (job_id, kind, JobStatus.PENDING.value, json.dumps(params), time.time()))
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def get_result(self, job_id: str) -> Any:
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT result FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row["result"]) if row and row["result"] is not None else None
+
+    def claim(self, owner: str) -> Optional[tuple[str, str, dict]]:
+        """가장 오래된 pending job 하나를 owner 의 running job 으로 변경
+
+        Returns:
+            (job_id, kind, params), pending job 이 없으면 None
+        """
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT job_id, kind, params FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1",
+                               (JobStatus.PENDING.value,)).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+
+            now = time.time()
+            conn.execute("UPDATE jobs SET status = ?, owner = ?, heartbeat_at = ?, started_at = ?, "
+                         "attempts = attempts + 1, stage = NULL, completed_stages = '[]' WHERE job_id = ?",
+                         (JobStatus.RUNNING.value, owner, now, now, row["job_id"]))
+            conn.execute("COMMIT")
+        return row["job_id"], row["kind"], json.loads(row["params"])
+
+    # update_stage, heartbeat, finish, fail 은 job 을 claim 한 owner 인 경우에만 반영
+    # heartbeat 가 끊겨 다른 worker 가 다시 claim 한 job 을 이전 owner 가 덮어쓰지 않도록 함
+
+    def update_stage(self, job_id: str, owner: str, stage: MatchingStage, completed_stages: list[str]) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("UPDATE jobs SET stage = ?, completed_stages = ?, heartbeat_at = ? "
+                                "WHERE job_id = ? AND owner = ? AND status = ?",
+                                (stage.value, json.dumps(completed_stages), time.time(), job_id, owner,
+                                 JobStatus.RUNNING.value)).rowcount > 0
+
+    def heartbeat(self, jobs: dict[str, str]):
+        """
+        Args:
+            jobs: {job_id: owner} 실행 중인 job
+        """
+        if not jobs:
+            return
+        with closing(self._connect()) as conn:
+            conn.executemany("UPDATE jobs SET heartbeat_at = ? WHERE job_id = ? AND owner = ? AND status = ?",
+                             [(time.time(), job_id, owner, JobStatus.RUNNING.value) for job_id, owner in jobs.items()])
+
+    def finish(self, job_id: str, owner: str, result: Any) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("UPDATE jobs SET status = ?, stage = NULL, completed_stages = ?, result = ?, "
+                                "finished_at = ? WHERE job_id = ? AND owner = ? AND status = ?",
+                                (JobStatus.SUCCEEDED.value, json.dumps([s.value for s in MatchingStage]),
+                                 json.dumps(result), time.time(), job_id, owner, JobStatus.RUNNING.value)).rowcount > 0
+
+    def fail(self, job_id: str, owner: str, error: str) -> bool:
+        with closing(self._connect()) as conn:
+            return conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                                "WHERE job_id = ? AND owner = ? AND status = ?",
+                                (JobStatus.FAILED.value, error, time.time(), job_id, owner,
+                                 JobStatus.RUNNING.value)).rowcount > 0
+
+    def recover_stale(self, stale_seconds: float, max_attempts: int) -> int:
+        """heartbeat 가 끊긴 running job (worker 종료, 재시작 등) 을 다시 pending 으로 변경
+
+        max_attempts 만큼 실행된 job 은 failed 로 변경한다.
+        """
+        deadline = time.time() - stale_seconds
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            failed = conn.execute("UPDATE jobs SET status = ?, error = ?, finished_at = ? "
+                                  "WHERE status = ? AND heartbeat_at < ? AND attempts >= ?",
+                                  (JobStatus.FAILED.value, "Job worker stopped responding", time.time(),
+                                   JobStatus.RUNNING.value, deadline, max_attempts)).rowcount
+            requeued = conn.execute("UPDATE jobs SET status = ?, owner = NULL WHERE status = ? AND heartbeat_at < ?",
+                                    (JobStatus.PENDING.value, JobStatus.RUNNING.value, deadline)).rowcount
+            conn.execute("COMMIT")
+
+        if failed or requeued:
+            logging.warning(f"schema_matching|stale jobs: {requeued} requeued, {failed} failed")
+        return requeued
+
+
+class JobRunner:
+    """JobStore 의 pending job 을 background thread pool 에서 실행
+
+    worker process 마다 하나의 dispatcher thread 가 JOB_POLL_INTERVAL 주기로
+    실행 중인 job 의 heartbeat 를 갱신하고, 중단된 job 을 복구하며, 빈 slot 만큼 pending job 을 가져온다.
+    """
+    _store: Optional[JobStore] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _dispatcher: Optional[threading.Thread] = None
+    # 실행 중인 job_id -> claim 한 owner
+    _running: dict[str, str] = {}
+    _lock = threading.Lock()
+    _wakeup = threading.Event()
+    _stop = threading.Event()
+
+    @classmethod
+    def store(cls) -> JobStore:
+        if cls._store is None:
+            with cls._lock:
+                if cls._store is None:
+                    cls._store = JobStore(settings.JOB_STORE_PATH)
+        return cls._store
+
+    @classmethod
+    def start(cls):
+        with cls._lock:
+            if cls._dispatcher is not None and cls._dispatcher.is_alive():
+                return
+            cls._stop.clear()
+            cls._executor = ThreadPoolExecutor(max_workers=settings.JOB_POOL_SIZE, thread_name_prefix="job")
+            cls._dispatcher = threading.Thread(target=cls._dispatch_loop, name="job-dispatcher", daemon=True)
+            cls._dispatcher.start()
+        logging.info(f"schema_matching|job runner started (pool_size={settings.JOB_POOL_SIZE})")
+
+    @classmethod
+    def stop(cls):
+        cls._stop.set()
+        cls._wakeup.set()
+        with cls._lock:
+            if cls._dispatcher is not None:
+                cls._dispatcher.join()
+                cls._dispatcher = None
+            if cls._executor is not None:
+                # 실행 중인 job 은 heartbeat 가 끊긴 뒤 다른 worker 가 이어서 실행
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+                cls._executor = None
+
+    @classmethod
+    def submit(cls, kind: str, params: dict) -> dict:
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job = cls.store().create(kind, params)
+        cls.start()
+        cls._wakeup.set()
+        return job
+
+    @staticmethod
+    def _owner() -> str:
+        """claim 마다 다른 owner, 같은 process 가 다시 claim 한 job 도 이전 실행과 구분"""
+        return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+    @classmethod
+    def _dispatch_loop(cls):
+        store = cls.store()
+        while not cls._stop.is_set():
+            try:
+                store.heartbeat(dict(cls._running))
+                store.recover_stale(settings.JOB_STALE_SECONDS, settings.JOB_MAX_ATTEMPTS)
+                while len(cls._running) < settings.JOB_POOL_SIZE and not cls._stop.is_set():
+                    owner = cls._owner()
+                    claimed = store.claim(owner)
+                    if claimed is None:
+                        break
+                    cls._running[claimed[0]] = owner
+                    cls._executor.submit(cls._execute, *claimed, owner)
+            except Exception as e:
+                logging.exception(f"schema_matching|job dispatcher error: {e}")
+
+            cls._wakeup.wait(settings.JOB_POLL_INTERVAL)
+            cls._wakeup.clear()
+
+    @classmethod
+    def _execute(cls, job_id: str, kind: str, params: dict, owner: str):
+        store = cls.store()
+        completed_stages: list[str] = []
+
+        def progress(stage: MatchingStage):
+            # 새로운 stage 가 시작되면, 직전 stage 는 완료된 것으로 기록
+            stages = [s.value for s in MatchingStage]
+            completed_stages[:] = stages[:stages.index(stage.value)]
+            store.update_stage(job_id, owner, stage, completed_stages)
+
+        logging.info(f"schema_matching|job {job_id} ({kind}) started")
+        try:
+            result = JOB_HANDLERS[kind](params, progress)
+            if store.finish(job_id, owner, result):
+                logging.info(f"schema_matching|job {job_id} ({kind}) succeeded")
+            else:
+                logging.warning(f"schema_matching|job {job_id} ({kind}) was requeued while running, result discarded")
+        except Exception as e:
+            logging.exception(f"schema_matching|job {job_id} ({kind}) failed: {e}")
+            store.fail(job_id, owner, repr(e))
+        finally:
+            cls._running.pop(job_id, None)
+            cls._wakeup.set()
@@ -0,0 +1,233 @@
+"""
+json, jsonl 테이블을 record 단위로 읽어 column 별 값으로 펼침 (flatten)
+
+data_preprocessor.find_all_keys_values 의 recursive 구현과 같은 column 이름, 같은 순서의 값을 만들어야 함.
+- column 이름은 "<parent key>.<key>", parent key 는 바로 위 key 이름 (json 최상위는 "", jsonl 은 "TOPLEVEL")
+- dict 값은 [dict] 로, list 값은 원소 단위로 취급
+- recursion 대신 stack 을 사용하고, record 하나씩 펼쳐 column 별 buffer 에 추가함
+- json 문서는 전체를 json.load 하지 않고, 최상위 list 값의 원소 (record) 를 하나씩 decode 함
+"""
+import json
+from collections import defaultdict
+from itertools import islice
+from typing import IO, Iterable, Iterator, Optional
+
+# jsonl record 의 parent key, column 이름에서는 제거됨
+# TODO: replace TOPLEVEL
+JSONL_PARENT_KEY = "TOPLEVEL"
+JSON_WHITESPACES = " \t\n\r"
+JSON_NUMBER_CHARS = "0123456789.eE+-"
+
+
+class JsonStreamReader:
+    """json 문서를 block 단위로 읽으며 값을 하나씩 decode
+
+    Notes:
+        buffer 에 값 전체가 들어올 때까지 block 을 더 읽는다. 값 하나가 block 보다 큰 경우 block 크기를 두 배씩 늘림.
+    """
+    BLOCK_SIZE = 1 << 16
+
+    def __init__(self, f: IO[str]):
+        self.f = f
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+        block = self.f.read(size)
+        if not block:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + block
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """whitespace 이후의 다음 문자, 문서 끝이면 ''"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in JSON_WHITESPACES:
+                self.pos += 1
+            if self.pos < len(self.buffer) or not self._fill(self.BLOCK_SIZE):
+                return self.buffer[self.pos:self.pos + 1]
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    def value(self) -> any:
+        self.peek()
+        size = self.BLOCK_SIZE
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # 숫자는 buffer 끝 ("12" + "3") 이나 중간 ("-0." + "5") 에서 잘린 경우에도 decode 되므로
+                # 다음 문자가 숫자의 일부가 아닐 때만 완전한 값으로 취급
+                if self.eof or (end < len(self.buffer) and self.buffer[end] not in JSON_NUMBER_CHARS):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            if not self._fill(size):
+                continue
+            size *= 2
+
+
+def iter_json_items(f: IO[str]) -> Iterator[tuple[str, any]]:
+    """json 문서 최상위 dict 의 (key, item), list 값은 원소마다 하나씩 반환
+
+    Notes:
+        json.load 와 달리 같은 key 가 여러 번 나오면 마지막 값만 사용하지 않고 모두 반환한다.
+    """
+    reader = JsonStreamReader(f)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if reader.peek() == "[":
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.expect("]")
+            else:
+                while True:
+                    yield key, reader.value()
+                    if reader.peek() != ",":
+                        break
+                    reader.expect(",")
+                reader.expect("]")
+        else:
+            yield key, reader.value()
+
+        if reader.peek() != ",":
+            break
+        reader.expect(",")
+    reader.expect("}")
+
+    if reader.peek() != "":
+        raise json.JSONDecodeError("Extra data", reader.buffer, reader.pos)
+
+
+def iter_jsonl_items(f: IO[str]) -> Iterator[tuple[str, any]]:
+    """jsonl 한 줄을 {"TOPLEVEL": [record, ...]} 의 원소 하나로 반환"""
+    for line in f:
+        yield JSONL_PARENT_KEY, json.loads(line)
+
+
+def expand_items(json_data: dict) -> Iterator[tuple[str, any]]:
+    """json_data 의 (key, item), dict 값은 [dict] 로, list 값은 원소 단위로 반환"""
+    for key, value in json_data.items():
+        if isinstance(value, list):
+            for item in value:
+                yield key, item
+        else:
+            yield key, value
+
+
+def flatten_items(items: Iterable[tuple[str, any]], parent_key: str) -> Iterator[tuple[str, any]]:
+    """find_all_keys_values 와 같은 순서로 (column 이름, 값) 반환
+
+    Args:
+        items: parent_key 아래의 (key, item), item 이 dict 이면 key 를 parent key 로 하여 다시 펼침
+        parent_key: 최상위 parent key
+    """
+    stack = [(iter(items), parent_key)]
+    while stack:
+        entries, parent = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        key, item = entry
+        if isinstance(item, dict):
+            stack.append((expand_items(item), key))
+        else:
+            yield f"{parent}.{key}", item
+
+
+def column_name(key: str, parent_key: str) -> str:
+    if parent_key == JSONL_PARENT_KEY:
+        # remove "TOPLEVEL.", but remains ".*"
+        return key.replace(f"{JSONL_PARENT_KEY}.", "")
+    return key
+
+
+class ColumnBuffers:
+    """column 별 값 buffer, column 은 처음 나온 순서대로 유지"""
+
+    def __init__(self, parent_key: str):
+        self.parent_key = parent_key
+        self.columns: dict[str, list] = {}
+
+    def extend(self, items: Iterable[tuple[str, any]]):
+        columns = self.columns
+        for key, value in flatten_items(items, self.parent_key):
+            values = columns.get(key)
+            if values is None:
+                columns[key] = [value]
+            else:
+                values.append(value)
+
+    def named_columns(self) -> dict[str, list]:
+        return {column_name(key, self.parent_key): values for key, values in self.columns.items()}
+
+
+def open_items(path: str) -> tuple[IO[str], Iterator[tuple[str, any]], str]:
+    """
+    Returns:
+        (file, items, parent_key): json 또는 jsonl 파일의 최상위 item iterator, 사용 후 file 을 닫아야 함
+    """
+    f = open(path, "r", encoding="utf-8")
+    if path.endswith(".jsonl"):
+        return f, iter_jsonl_items(f), JSONL_PARENT_KEY
+    return f, iter_json_items(f), ""
+
+
+def flatten_table(items: Iterable[tuple[str, any]], parent_key: str, max_rows: Optional[int] = None
+                  ) -> dict[str, list]:
+    """최상위 item 들을 column 별 값으로 펼침
+
+    Args:
+        items: 최상위 (key, item)
+        parent_key: 최상위 parent key
+        max_rows: 주어지면 앞에서부터 max_rows 개의 item (jsonl 은 line) 만 사용
+    """
+    buffers = ColumnBuffers(parent_key)
+    buffers.extend(islice(items, max_rows))
+    return buffers.named_columns()
+
+
+def iter_batches(items: Iterable[any], size: int) -> Iterator[list[any]]:
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+def iter_flattened_chunks(path: str, chunk_rows: int) -> Iterator[dict[str, list]]:
+    """chunk_rows 개의 최상위 item 마다 column 별 값 반환"""
+    f, items, parent_key = open_items(path)
+    with f:
+        for chunk in iter_batches(items, chunk_rows):
+            buffers = ColumnBuffers(parent_key)
+            buffers.extend(chunk)
+            yield buffers.named_columns()
+
+
+def find_all_keys_values(json_data: any, parent_key: str) -> defaultdict[any, list]:
+    """
+    모든 key, value 순회
+
+    Find all keys that don't have list or dictionary values and their values.
+    Key should be saved with its parent key like "parent-key.key".
+    """
+    key_values = defaultdict(list)
+    for key, value in flatten_items(expand_items(json_data), parent_key):
+        key_values[key].append(value)
+    return key_values
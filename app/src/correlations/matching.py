@@ -1,14 +1,24 @@
 import logging
-import os
-from typing import Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from itertools import combinations
+from typing import Callable, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 import xgboost as xgb
 
+from app.config import settings
+from app.exceptions.service import CatalogTableNotFoundError, CatalogTableOutdatedError
+from app.src.correlations.candidate_index import candidate_pairs
+from app.src.correlations.catalog import TableCatalog
 from app.src.correlations.data_preprocessor import read_table, drop_na_columns
-from app.src.correlations.enums import Strategy, MatchingModel
-from app.src.correlations.relation_features import create_feature_matrix_inference
+from app.src.correlations.enums import Strategy, MatchingModel, MatchingStage
+from app.src.correlations.model import MatchingModelRegistry
+from app.src.correlations.pair_blocking import compatible_pairs
+from app.src.correlations.relation_features import TableProfile, make_table_profile, \
+    create_feature_matrix_from_profiles
+from app.src.correlations.self_features import feature_cache_version
+from app.src.correlations.streaming_profile import should_stream, stream_table_profile
 from app.src.correlations.util import time_logger
 
 
@@ -18,7 +28,11 @@ def schema_matching(
         r_table_path: str,
         model: MatchingModel,
         strategy: Strategy,
-        threshold: Optional[float] = None
+        threshold: Optional[float] = None,
+        progress: Optional[Callable[[MatchingStage], None]] = None,
+        sample_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None
 ):
     """
 
@@ -28,37 +42,285 @@ def schema_matching(
         model: Schema Matching XGBoost Model
         strategy: matching strategy. Check app.src.correlations.enums.Strategy.
         threshold: correlation value threshold.
+        progress: called with each MatchingStage when the stage starts.
+        sample_rows: 테이블 별 profiling 에 사용할 최대 row 수, 0 이면 전체 row. None 이면 PROFILE_SAMPLE_ROWS.
+        top_k: l_column 마다 predict 할 r_column 후보 수, 0 이면 전체 쌍. None 이면 CANDIDATE_TOP_K.
+        blocking: type 이 호환되지 않는 column 쌍을 predict 하지 않음. None 이면 PAIR_BLOCKING.
 
     Returns:
         schema matching result
     """
+    if progress is None:
+        progress = _ignore_progress
 
     # read tables.
-    l_df = preprocess_table(l_table_path)
-    r_df = preprocess_table(r_table_path)
+    # streaming profiling 하는 테이블은 FEATURES stage 에서 chunk 단위로 읽음
+    progress(MatchingStage.READ_TABLES)
+    l_df = None if use_streaming_profile(l_table_path, sample_rows) else preprocess_table(l_table_path, sample_rows)
+    r_df = None if use_streaming_profile(r_table_path, sample_rows) else preprocess_table(r_table_path, sample_rows)
 
     # make 2 features.
     # 1. self features for each tables
     # 2. relational features
-    # TODO: separate 2 step?
-    features = create_feature_matrix_inference(l_df, r_df)
+    progress(MatchingStage.FEATURES)
+    l_profile = make_table_profile(l_df) if l_df is not None else stream_table_profile(l_table_path)
+    r_profile = make_table_profile(r_df) if r_df is not None else stream_table_profile(r_table_path)
+
+    return match_profiles(l_profile, r_profile, model, strategy, threshold, progress, top_k, blocking)
+
+
+@time_logger
+def schema_matching_one_to_many(
+        l_table_path: str,
+        r_table_paths: list[str],
+        model: MatchingModel,
+        strategy: Strategy,
+        threshold: Optional[float] = None,
+        sample_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None
+) -> list[tuple[pd.DataFrame, pd.DataFrame, list[tuple[str, str, float | int]]]]:
+    """l_table 하나를 여러 r_table 과 매칭
+
+    Notes:
+        l_table 의 self features, column name embedding 은 한 번만 계산하여 모든 r_table 매칭에 재사용함.
+
+    Args:
+        l_table_path: path to l_table
+        r_table_paths: paths to r_tables
+        model: Schema Matching XGBoost Model
+        strategy: matching strategy. Check app.src.correlations.enums.Strategy.
+        threshold: correlation value threshold.
+        sample_rows: 테이블 별 profiling 에 사용할 최대 row 수, 0 이면 전체 row. None 이면 PROFILE_SAMPLE_ROWS.
+        top_k: l_column 마다 predict 할 r_column 후보 수, 0 이면 전체 쌍. None 이면 CANDIDATE_TOP_K.
+        blocking: type 이 호환되지 않는 column 쌍을 predict 하지 않음. None 이면 PAIR_BLOCKING.
+
+    Returns:
+        schema matching result for each r_table, same order as r_table_paths
+    """
+    l_profile = profile_table(l_table_path, sample_rows)
+
+    results = []
+    for r_table_path in r_table_paths:
+        r_profile = profile_table(r_table_path, sample_rows)
+        results.append(match_profiles(l_profile, r_profile, model, strategy, threshold, top_k=top_k,
+                                      blocking=blocking))
+
+    return results
+
+
+@time_logger
+def schema_matching_registered(
+        l_table_path: str,
+        table_ids: Optional[list[str]],
+        model: MatchingModel,
+        strategy: Strategy,
+        threshold: Optional[float] = None,
+        sample_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None
+) -> list[tuple[pd.DataFrame, pd.DataFrame, list[tuple[str, str, float | int]]]]:
+    """l_table 을 catalog 에 등록된 테이블들과 매칭
+
+    Notes:
+        등록된 테이블은 저장된 TableProfile 을 memory map 하여 사용하고, 원본 파일은 다시 읽지 않음.
+
+    Args:
+        l_table_path: path to l_table
+        table_ids: 매칭할 등록된 테이블 id, None 이면 등록된 모든 테이블
+        model: Schema Matching XGBoost Model
+        strategy: matching strategy. Check app.src.correlations.enums.Strategy.
+        threshold: correlation value threshold.
+        sample_rows: l_table profiling 에 사용할 최대 row 수, 0 이면 전체 row. None 이면 PROFILE_SAMPLE_ROWS.
+        top_k: l_column 마다 predict 할 r_column 후보 수, 0 이면 전체 쌍. None 이면 CANDIDATE_TOP_K.
+        blocking: type 이 호환되지 않는 column 쌍을 predict 하지 않음. None 이면 PAIR_BLOCKING.
+
+    Returns:
+        schema matching result for each registered table, same order as table_ids
+    """
+    catalog = TableCatalog.store()
+    if table_ids is None:
+        table_ids = [table["table_id"] for table in catalog.list()]
+
+    # l_table 을 profiling 하기 전에 등록 여부, profile 버전 확인
+    loaded = {table_id: catalog.load(table_id) for table_id in table_ids}
+    missing = [table_id for table_id, table in loaded.items() if table is None]
+    if missing:
+        raise CatalogTableNotFoundError(missing)
+
+    version = feature_cache_version()
+    outdated = [table_id for table_id, (table, _) in loaded.items() if table["version"] != version]
+    if outdated:
+        raise CatalogTableOutdatedError(outdated, version)
+
+    l_profile = profile_table(l_table_path, sample_rows)
+
+    return [match_profiles(l_profile, loaded[table_id][1], model, strategy, threshold, top_k=top_k,
+                           blocking=blocking)
+            for table_id in table_ids]
+
+
+@time_logger
+def schema_matching_multi(
+        table_paths: list[str],
+        model: MatchingModel,
+        strategy: Strategy,
+        threshold: Optional[float] = None,
+        progress: Optional[Callable[[MatchingStage], None]] = None,
+        sample_rows: Optional[int] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None
+) -> list[tuple[int, int, tuple[pd.DataFrame, pd.DataFrame, list[tuple[str, str, float | int]]]]]:
+    """여러 테이블의 모든 테이블 쌍 (N-way) 매칭
+
+    Notes:
+        중복된 path 는 처음 위치만 남기고 테이블마다 한 번만 profiling 하며, 모든 테이블 쌍의 매칭은
+        MULTI_MATCHING_POOL_SIZE 개의 thread 에서 동시에 수행함.
+        테이블을 읽은 뒤 바로 profiling 하므로 READ_TABLES, FEATURES stage 를 함께 시작한다.
+
+    Args:
+        table_paths: paths to tables
+        model: Schema Matching XGBoost Model
+        strategy: matching strategy. Check app.src.correlations.enums.Strategy.
+        threshold: correlation value threshold.
+        progress: called with each MatchingStage when the stage starts.
+        sample_rows: 테이블 별 profiling 에 사용할 최대 row 수, 0 이면 전체 row. None 이면 PROFILE_SAMPLE_ROWS.
+        top_k: l_column 마다 predict 할 r_column 후보 수, 0 이면 전체 쌍. None 이면 CANDIDATE_TOP_K.
+        blocking: type 이 호환되지 않는 column 쌍을 predict 하지 않음. None 이면 PAIR_BLOCKING.
+
+    Returns:
+        (i, j, schema matching result) for each i < j, 중복을 제거한 table_paths 의 i 번째를 l_table,
+        j 번째를 r_table 로 매칭
+    """
+    if progress is None:
+        progress = _ignore_progress
+    # 같은 테이블끼리, 같은 테이블 쌍을 다시 매칭하지 않도록 순서를 유지하며 중복 제거
+    table_paths = list(dict.fromkeys(table_paths))
+
+    progress(MatchingStage.READ_TABLES)
+    progress(MatchingStage.FEATURES)
+    profiles: dict[str, TableProfile] = {table_path: profile_table(table_path, sample_rows)
+                                         for table_path in table_paths}
+
+    progress(MatchingStage.PREDICT)
+    pairs = list(combinations(range(len(table_paths)), 2))
+    logging.info(f"schema_matching|matching {len(pairs)} table pairs of {len(profiles)} tables "
+                 f"(pool_size={settings.MULTI_MATCHING_POOL_SIZE})")
+
+    def match(pair: tuple[int, int]):
+        i, j = pair
+        return match_profiles(profiles[table_paths[i]], profiles[table_paths[j]], model, strategy, threshold,
+                              top_k=top_k, blocking=blocking)
+
+    with ThreadPoolExecutor(max_workers=settings.MULTI_MATCHING_POOL_SIZE,
+                            thread_name_prefix="multi_matching") as executor:
+        results = list(executor.map(match, pairs))
+
+    progress(MatchingStage.POSTPROCESS)
+    return [(i, j, result) for (i, j), result in zip(pairs, results)]
+
+
+def match_profiles(
+        l_profile: TableProfile,
+        r_profile: TableProfile,
+        model: MatchingModel,
+        strategy: Strategy,
+        threshold: Optional[float] = None,
+        progress: Optional[Callable[[MatchingStage], None]] = None,
+        top_k: Optional[int] = None,
+        blocking: Optional[bool] = None
+):
+    """미리 계산된 TableProfile 두 개로 relational features 생성, predict, post process 수행
+
+    Notes:
+        top_k 이면 l_column 마다 embedding 이 가까운 r_column top_k 개의 쌍만 predict 하고, 나머지 쌍은 0 으로 채움.
+        blocking 이면 type 이 호환되지 않는 쌍 (pair_blocking) 도 predict 하지 않고 0 으로 채움.
+    """
+    if progress is None:
+        progress = _ignore_progress
+    if top_k is None:
+        top_k = settings.CANDIDATE_TOP_K
+    if blocking is None:
+        blocking = settings.PAIR_BLOCKING
+
+    pairs = candidate_pairs(l_profile, r_profile, top_k)
+    pruned_pairs = 0
+    if blocking:
+        compatible = compatible_pairs(l_profile, r_profile)
+        pruned_pairs = int(np.count_nonzero(~compatible if pairs is None else pairs & ~compatible))
+        pairs = compatible if pairs is None else pairs & compatible
+
+    # 모든 쌍이 제외된 경우 features 계산, predict 생략
+    features = create_feature_matrix_from_profiles(l_profile, r_profile, pairs) \
+        if pairs is None or pairs.any() else None
 
     # exact predict w XGBoost model
-    preds, pred_labels_list = predict_inference(features, model, threshold)
+    progress(MatchingStage.PREDICT)
+    if features is not None:
+        preds, pred_labels = predict_inference(features, model, threshold)
+    else:
+        preds = np.zeros((len(MatchingModelRegistry.get(model)), 0), dtype=np.float32)
+        pred_labels = np.zeros(preds.shape, dtype=int)
+    if pairs is not None:
+        logging.info(f"schema_matching|predicted {np.count_nonzero(pairs)} of {pairs.size} column pairs "
+                     f"(top_k={top_k}, blocking={blocking}, pruned={pruned_pairs})")
+        preds, pred_labels = fill_pairs(pairs, preds, pred_labels)
 
     # post process
-    df_pred = postprocess_pred(l_df, r_df, preds)
+    progress(MatchingStage.POSTPROCESS)
+    df_pred = postprocess_pred(l_profile.columns, r_profile.columns, preds)
+    # 응답에 포함할 수 있도록 profiling 에 사용한 row 수, blocking 으로 제외한 쌍의 수를 함께 전달
+    df_pred.attrs["profiled_rows"] = (l_profile.row_count, r_profile.row_count)
+    df_pred.attrs["pruned_pairs"] = pruned_pairs
 
     # calculate metrics
-    df_pred_labels = get_pred_labels(l_df, r_df, df_pred, pred_labels_list, strategy)
+    df_pred_labels = get_pred_labels(l_profile.columns, r_profile.columns, df_pred, pred_labels, strategy)
     predicted_tuples = get_predicted_tuples(df_pred, df_pred_labels)
 
     return df_pred, df_pred_labels, predicted_tuples
 
 
-def preprocess_table(table_path: str) -> pd.DataFrame:
+def fill_pairs(pairs: np.ndarray, preds: np.ndarray, pred_labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """선택된 쌍의 predict 결과를 전체 (l_columns * r_columns) 쌍으로 채움, 선택되지 않은 쌍은 0
+
+    Returns:
+        preds, pred_labels: (model_cnt, pairs.size)
+    """
+    selected = pairs.reshape(-1)
+    all_preds = np.zeros((len(preds), len(selected)), dtype=preds.dtype)
+    all_pred_labels = np.zeros((len(pred_labels), len(selected)), dtype=pred_labels.dtype)
+    all_preds[:, selected] = preds
+    all_pred_labels[:, selected] = pred_labels
+    return all_preds, all_pred_labels
+
+
+def _ignore_progress(_: MatchingStage):
+    pass
+
+
+def use_streaming_profile(table_path: str, sample_rows: Optional[int] = None) -> bool:
+    """sampling 하지 않는 PROFILE_STREAMING_MIN_BYTES 이상의 csv, json, jsonl 은 streaming profiling"""
+    if sample_rows is None:
+        sample_rows = settings.PROFILE_SAMPLE_ROWS
+    return sample_rows == 0 and should_stream(table_path)
+
+
+def profile_table(table_path: str, sample_rows: Optional[int] = None) -> TableProfile:
+    if use_streaming_profile(table_path, sample_rows):
+        return stream_table_profile(table_path)
+    return make_table_profile(preprocess_table(table_path, sample_rows))
+
+
+def register_table(table_path: str, table_id: str, sample_rows: Optional[int] = None) -> dict:
+    """table 을 profiling 하여 catalog 에 등록, 같은 table_id 가 있으면 교체"""
+    return TableCatalog.store().register(table_id, table_path, profile_table(table_path, sample_rows), sample_rows)
+
+
+def preprocess_table(table_path: str, sample_rows: Optional[int] = None) -> pd.DataFrame:
     logging.debug(f"trying to read {table_path}")
-    df = read_table(table_path)
+    if sample_rows is None:
+        sample_rows = settings.PROFILE_SAMPLE_ROWS
+    df = read_table(table_path, sample_rows=sample_rows, skip_na_columns=True)
     df = drop_na_columns(df)
     return df
 
@@ -67,60 +329,46 @@ def predict_inference(
         features: np.ndarray,
         model: MatchingModel,
         threshold: Optional[float] = None
-) -> Tuple[list[np.ndarray], list[np.ndarray]]:
-    """
-    load model and predict on features
+) -> Tuple[np.ndarray, np.ndarray]:
     """
-    preds = []
-    pred_labels_list = []
+    predict on features with in-memory model ensemble
 
-    model_files = os.listdir(model.path)
-    model_cnt = len(model_files) // 2
-    for i in range(model_cnt):
-        bst = xgb.Booster({'nthread': 4})  # init model
-        model_file = os.path.join(model.path, f"{i}.model")
-        bst.load_model(model_file)
-
-        # use specified threshold or model best threshold
-        if threshold is not None:
-            best_threshold = float(threshold)
-        else:
-            threshold_file = os.path.join(model.path, f"{i}.threshold")
-            with open(threshold_file, "r") as f:
-                best_threshold = float(f.read())
+    Returns:
+        preds: (model_cnt, len(features)) booster 별 predict 값
+        pred_labels: (model_cnt, len(features)) booster 별 threshold 적용 label
+    """
+    ensemble = MatchingModelRegistry.get(model)
 
-        # TODO: UNCHECKED CODE
-        labels = np.ones(len(features))
-        dtest = xgb.DMatrix(features, label=labels)
-        pred = bst.predict(dtest)
+    # feature 변환은 request 당 한 번만 수행, 모든 booster 가 공유 (label 불필요)
+    dtest = xgb.DMatrix(features)
 
-        pred_labels = np.where(pred > best_threshold, 1, 0)
-        # UNCHECKED CODE
+    # Booster 가 결합된 feature 로 predict, 현재 분리 불가
+    # booster 별 predict 는 thread pool 에서 동시에 수행 (xgboost predict 는 GIL 을 해제함)
+    executor = MatchingModelRegistry.executor()
+    preds = np.vstack(list(executor.map(lambda bst: bst.predict(dtest), ensemble.boosters)))
 
-        # Booster 가 결합된 feature 로 predict, 현재 분리 불가
-        preds.append(pred)
+    # use specified threshold or model best threshold
+    if threshold is not None:
+        thresholds = np.full((len(ensemble), 1), float(threshold))
+    else:
+        thresholds = np.array(ensemble.thresholds).reshape(-1, 1)
 
-        pred_labels_list.append(pred_labels)
-        del bst
+    pred_labels = np.where(preds > thresholds, 1, 0)
 
-    return preds, pred_labels_list
+    return preds, pred_labels
 
 
 def postprocess_pred(
-        table1_df: pd.DataFrame,
-        table2_df: pd.DataFrame,
-        preds: list[np.ndarray]
+        df1_cols: list[str],
+        df2_cols: list[str],
+        preds: np.ndarray
 ) -> pd.DataFrame:
-    # do flatten and get mean
-    preds = np.mean(np.array(preds), axis=0)
-
-    # read column names
-    df1_cols = table1_df.columns
-    df2_cols = table2_df.columns
+    # get mean of stacked booster preds
+    preds = np.mean(preds, axis=0)
 
     # create pred_labels_matrix from preds
     # flatten and reshape to (l_table, r_table)
-    preds_matrix = np.array(preds).reshape(len(df1_cols), len(df2_cols))
+    preds_matrix = preds.reshape(len(df1_cols), len(df2_cols))
 
     df_pred = pd.DataFrame(preds_matrix, columns=df2_cols, index=df1_cols)
 
@@ -128,22 +376,21 @@ def postprocess_pred(
 
 
 def get_pred_labels(
-        table1_df: pd.DataFrame,
-        table2_df: pd.DataFrame,
+        df1_cols: list[str],
+        df2_cols: list[str],
         preds_matrix: pd.DataFrame,
-        pred_labels_list: list[np.ndarray],
+        pred_labels: np.ndarray,
         strategy: Strategy = Strategy.MANY_TO_MANY
 ):
-    # do flatten and get mean
-    pred_labels = np.mean(np.array(pred_labels_list), axis=0)
+    # get mean of stacked booster labels
+    pred_labels = np.mean(pred_labels, axis=0)
 
     # TODO: 0.5?
     # (pred_labels > 0.5) ? 1 : 0
     pred_labels = np.where(pred_labels > 0.5, 1, 0)
 
-    # read column names
-    df1_cols = table1_df.columns
-    df2_cols = table2_df.columns
+    # flatten and reshape to (l_table, r_table)
+    pred_labels = pred_labels.reshape(len(df1_cols), len(df2_cols))
 
     # create similarity matrix for pred labels
     # ManyToMany 는 predict 에서 생성된 pred_label 유지
@@ -151,19 +398,19 @@ def get_pred_labels(
     # OneToOne 는 col, row 에서의 최댓값을 취함
     # TODO: move to user select
     if strategy == Strategy.MANY_TO_MANY:
-        pred_labels_matrix = np.array(pred_labels).reshape(len(df1_cols), len(df2_cols))
+        pred_labels_matrix = pred_labels
     else:
         pred_labels_matrix = np.zeros((len(df1_cols), len(df2_cols)))
+        preds_values = preds_matrix.to_numpy()
+        max_rows = preds_values.max(axis=1)
+        max_cols = preds_values.max(axis=0)
 
         # pred_labels 가 1인 index 만 순회
         for i, j in np.argwhere(pred_labels == 1):
-            max_row = max(preds_matrix[i, :])
-            max_col = max(preds_matrix[:, j])
-
-            if max_row != preds_matrix[i, j]:
+            if max_rows[i] != preds_values[i, j]:
                 continue
 
-            if strategy == Strategy.ONE_TO_ONE and preds_matrix[i, j] != max_col:
+            if strategy == Strategy.ONE_TO_ONE and preds_values[i, j] != max_cols[j]:
                 continue
 
             pred_labels_matrix[i, j] = 1
@@ -1,19 +1,221 @@
 import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-from sentence_transformers import SentenceTransformer as ST
+import numpy as np
+import xgboost as xgb
+
+from app.config import settings
+from app.src.correlations.embedding_backend import EmbeddingBackend, create_backend, embedding_version
+from app.src.correlations.enums import MatchingModel
+from app.src.correlations.feature_cache import FeatureCache
 
 
 class SentenceTransformer:
-    _instance = None
+    """process 단위 embedding model, EMBEDDING_BACKEND 와 EMBEDDING_MODEL 로 선택"""
+    _instance: Optional[EmbeddingBackend] = None
 
     @classmethod
     def load(cls):
-        logging.info("schema_matching|Loading sentence transformer, this will take a while...")
-        cls._instance = ST("paraphrase-multilingual-mpnet-base-v2")
+        logging.info(f"schema_matching|Loading sentence transformer ({settings.EMBEDDING_BACKEND}: "
+                     f"{settings.EMBEDDING_MODEL}), this will take a while...")
+        cls._instance = create_backend(settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL)
         logging.info("schema_matching|Done loading sentence transformer")
 
     @classmethod
-    def get(cls) -> ST:
+    def get(cls) -> EmbeddingBackend:
         if cls._instance is None:
             cls.load()
         return cls._instance
+
+    @classmethod
+    def use(cls, backend: EmbeddingBackend):
+        """설정과 다른 backend 로 교체 (benchmark 용), 이전 model 의 column 이름 embedding 은 사용하지 않음"""
+        cls._instance = backend
+        ColumnNameEmbeddingCache.clear()
+
+    @classmethod
+    def version(cls) -> str:
+        """feature cache, catalog 에 사용하는 embedding model 버전, model 을 로드하지 않고 확인"""
+        version = getattr(cls._instance, "version", None)
+        return version or embedding_version(settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL)
+
+
+class ColumnNameEmbeddingCache:
+    """column 이름 embedding LRU 캐시
+
+    Notes:
+        id, name, title 처럼 대부분의 테이블에 반복되는 column 이름은 request 간에 재사용한다.
+        캐시에 없는 이름들은 한 번의 encode 호출로 batch encoding 한다.
+        COLUMN_NAME_CACHE_PERSIST 설정 시 FeatureCache 디스크 저장소에도 저장하여 재시작 후에도 재사용한다.
+    """
+    _cache: OrderedDict[str, np.ndarray] = OrderedDict()
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _disk_key(name: str) -> str:
+        return FeatureCache.make_text_key(name, f"column_name:{SentenceTransformer.version()}")
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._cache.clear()
+
+    @classmethod
+    def encode(cls, names: list[str]) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: (len(names), embedding dimension) names 순서대로 embedding
+        """
+        unique_names = list(dict.fromkeys(names))
+
+        found: dict[str, np.ndarray] = {}
+        with cls._lock:
+            for name in unique_names:
+                if name in cls._cache:
+                    cls._cache.move_to_end(name)
+                    found[name] = cls._cache[name]
+
+        misses = [name for name in unique_names if name not in found]
+        if misses and settings.COLUMN_NAME_CACHE_PERSIST:
+            for name in misses:
+                embedding = FeatureCache.get(cls._disk_key(name))
+                if embedding is not None:
+                    found[name] = embedding.astype(np.float32)
+            misses = [name for name in misses if name not in found]
+
+        if misses:
+            embeddings = SentenceTransformer.get().encode(misses)
+            for name, embedding in zip(misses, embeddings):
+                found[name] = embedding
+                if settings.COLUMN_NAME_CACHE_PERSIST:
+                    FeatureCache.put(cls._disk_key(name), embedding)
+
+        with cls._lock:
+            for name in unique_names:
+                cls._cache[name] = found[name]
+                cls._cache.move_to_end(name)
+            while len(cls._cache) > settings.COLUMN_NAME_CACHE_SIZE:
+                cls._cache.popitem(last=False)
+
+        return np.array([found[name] for name in names])
+
+
+class BoosterEnsemble:
+    """하나의 MatchingModel 을 구성하는 XGBoost booster 와 best threshold 묶음
+
+    Notes:
+        로드 이후 read-only 로만 사용, 여러 request 에서 동시에 predict 해도 안전함.
+    """
+
+    def __init__(self, boosters: list[xgb.Booster], thresholds: list[float], signature: tuple, nthread: int):
+        self.boosters = boosters
+        self.thresholds = thresholds
+        # booster 별 predict thread 수, warm up 후 복원에 사용
+        self.nthread = nthread
+        # 로드 시점의 model directory 상태, reload 필요 여부 판단에 사용
+        self.signature = signature
+
+    def __len__(self):
+        return len(self.boosters)
+
+
+class MatchingModelRegistry:
+    """process 단위 XGBoost ensemble registry
+
+    MatchingModel 별로 booster, threshold 를 한 번만 로드하여 메모리에 유지한다.
+    model directory 가 변경된 경우 reload() 를 명시적으로 호출한다.
+    """
+    _instances: dict[MatchingModel, BoosterEnsemble] = {}
+    _lock = threading.Lock()
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @staticmethod
+    def thread_budget() -> int:
+        return settings.PREDICT_THREAD_BUDGET or os.cpu_count() or 1
+
+    @classmethod
+    def pool_size(cls) -> int:
+        return settings.PREDICT_POOL_SIZE or cls.thread_budget()
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """booster 들을 동시에 predict 하기 위한 thread pool
+
+        fork 이후 각 worker process 에서 처음 사용할 때 생성한다.
+        """
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(max_workers=cls.pool_size(),
+                                                       thread_name_prefix="predict")
+        return cls._executor
+
+    @staticmethod
+    def _signature(model: MatchingModel) -> tuple:
+        model_files = sorted(os.listdir(model.path))
+        return tuple((f, os.path.getmtime(os.path.join(model.path, f))) for f in model_files)
+
+    @classmethod
+    def _load_ensemble(cls, model: MatchingModel) -> BoosterEnsemble:
+        logging.info(f"schema_matching|Loading matching model '{model.value}' from {model.path}")
+        signature = cls._signature(model)
+        model_cnt = len(signature) // 2
+
+        # 동시에 실행되는 booster 수로 thread budget 을 나누어, 전체 CPU 사용량이 budget 을 넘지 않도록 함
+        concurrency = max(1, min(cls.pool_size(), model_cnt))
+        nthread = max(1, cls.thread_budget() // concurrency)
+
+        boosters = []
+        thresholds = []
+        for i in range(model_cnt):
+            bst = xgb.Booster({'nthread': nthread})  # init model
+            bst.load_model(os.path.join(model.path, f"{i}.model"))
+            boosters.append(bst)
+
+            with open(os.path.join(model.path, f"{i}.threshold"), "r") as f:
+                thresholds.append(float(f.read()))
+
+        logging.info(f"schema_matching|Done loading matching model '{model.value}' "
+                     f"({model_cnt} boosters, nthread={nthread})")
+        return BoosterEnsemble(boosters, thresholds, signature, nthread)
+
+    @classmethod
+    def load(cls, model: MatchingModel) -> BoosterEnsemble:
+        ensemble = cls._load_ensemble(model)
+        with cls._lock:
+            cls._instances[model] = ensemble
+        return ensemble
+
+    @classmethod
+    def get(cls, model: MatchingModel) -> BoosterEnsemble:
+        ensemble = cls._instances.get(model)
+        if ensemble is not None:
+            return ensemble
+
+        # 최초 요청이 동시에 들어와도 한 번만 로드
+        with cls._lock:
+            ensemble = cls._instances.get(model)
+            if ensemble is None:
+                ensemble = cls._load_ensemble(model)
+                cls._instances[model] = ensemble
+        return ensemble
+
+    @classmethod
+    def is_stale(cls, model: MatchingModel) -> bool:
+        """로드 이후 model directory 의 파일 구성 또는 수정 시각이 변경되었는지 확인"""
+        ensemble = cls._instances.get(model)
+        return ensemble is None or ensemble.signature != cls._signature(model)
+
+    @classmethod
+    def reload(cls, model: MatchingModel, only_if_changed: bool = False) -> BoosterEnsemble:
+        """model directory 를 다시 읽어 ensemble 을 교체
+
+        진행 중인 request 는 교체 전 ensemble 을 그대로 사용하고, 이후 request 부터 새 ensemble 을 사용한다.
+        """
+        if only_if_changed and not cls.is_stale(model):
+            return cls._instances[model]
+        return cls.load(model)
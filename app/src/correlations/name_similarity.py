@@ -0,0 +1,148 @@
+"""
+column 이름 문자열 유사도 (bleu, Damerau, MetricLCS, 포함 관계) 계산
+
+relation_features.get_col_names_features 와 동일한 값을 반환해야 함. (학습된 XGBoost model 의 입력)
+- lcs_length: bit-parallel LCS (Allison-Dix / Hyyrö), strsimpy LongestCommonSubsequence.length 와 동일
+- damerau_distance: strsimpy Damerau.distance 와 동일한 (unrestricted) Damerau-Levenshtein, 1차원 array DP
+- bleu: nltk bleu 를 그대로 사용하되 (l, r) 쌍 단위로 memoize
+"""
+from functools import lru_cache
+
+import numpy as np
+from nltk.translate import bleu
+from nltk.translate.bleu_score import SmoothingFunction
+
+SMOOTHIE = SmoothingFunction().method4
+
+# (bleu_score, edit_distance, lcs, one_in_one)
+STRING_FEATURES_DIMENSION = 4
+
+
+def lcs_length(s0: str, s1: str) -> int:
+    """Longest Common Subsequence 길이, s0 의 문자 위치를 bit 로 표현하여 s1 의 문자마다 한 번의 정수 연산으로 갱신"""
+    if not s0 or not s1:
+        return 0
+
+    match_masks: dict[str, int] = {}
+    for i, c in enumerate(s0):
+        match_masks[c] = match_masks.get(c, 0) | (1 << i)
+
+    full_mask = (1 << len(s0)) - 1
+    v = full_mask
+    for c in s1:
+        u = v & match_masks.get(c, 0)
+        v = ((v + u) | (v - u)) & full_mask
+
+    # v 에서 0 인 bit 수가 LCS 길이
+    return len(s0) - bin(v).count("1")
+
+
+def metric_lcs_distance(s0: str, s1: str) -> float:
+    """strsimpy MetricLCS.distance"""
+    if s0 == s1:
+        return 0.0
+    max_len = max(len(s0), len(s1))
+    if max_len == 0:
+        return 0.0
+    return 1.0 - (1.0 * lcs_length(s0, s1)) / max_len
+
+
+def damerau_distance(s0: str, s1: str) -> float:
+    """strsimpy Damerau.distance (unrestricted Damerau-Levenshtein)
+
+    Notes:
+        strsimpy 와 같은 점화식을 사용하되, (len(s0) + 2) x (len(s1) + 2) 행렬을 1차원 list 로 펼쳐 사용.
+    """
+    if s0 == s1:
+        return 0.0
+
+    n0, n1 = len(s0), len(s1)
+    inf = n0 + n1
+    width = n1 + 2
+
+    # h[i][j] == h[i * width + j]
+    h = [0] * ((n0 + 2) * width)
+    for i in range(n0 + 1):
+        h[(i + 1) * width] = inf
+        h[(i + 1) * width + 1] = i
+    for j in range(n1 + 1):
+        h[j + 1] = inf
+        h[width + j + 1] = j
+
+    # 각 문자가 s0 에서 마지막으로 나온 위치
+    da: dict[str, int] = {}
+    for i in range(1, n0 + 1):
+        c0 = s0[i - 1]
+        db = 0
+        row = (i + 1) * width
+        prev_row = i * width
+        for j in range(1, n1 + 1):
+            c1 = s1[j - 1]
+            i1 = da.get(c1, 0)
+            j1 = db
+
+            if c0 == c1:
+                cost = 0
+                db = j
+            else:
+                cost = 1
+
+            h[row + j + 1] = min(h[prev_row + j] + cost,
+                                 h[row + j] + 1,
+                                 h[prev_row + j + 1] + 1,
+                                 h[i1 * width + j1] + (i - i1 - 1) + 1 + (j - j1 - 1))
+        da[c0] = i
+
+    return h[(n0 + 1) * width + n1 + 1]
+
+
+@lru_cache(maxsize=65536)
+def get_string_features(l_col_name: str, r_col_name: str) -> tuple[float, float, float, float]:
+    """
+
+    Returns:
+        (bleu_score, edit_distance, lcs, one_in_one) of a preprocessed column name pair.
+    """
+    bleu_score = bleu([l_col_name], r_col_name, smoothing_function=SMOOTHIE)
+    edit_distance = damerau_distance(l_col_name, r_col_name)
+    lcs = metric_lcs_distance(l_col_name, r_col_name)
+    one_in_one = l_col_name in r_col_name or r_col_name in l_col_name
+
+    return bleu_score, edit_distance, lcs, one_in_one
+
+
+def get_string_features_matrix(l_col_names: list[str], r_col_names: list[str]) -> np.ndarray:
+    """모든 (l_col_name, r_col_name) 쌍의 문자열 유사도
+
+    Notes:
+        중복된 column 이름은 한 번만 계산하고, 계산한 쌍은 request 간에 memoize 함.
+
+    Returns:
+        np.ndarray: (len(l_col_names), len(r_col_names), STRING_FEATURES_DIMENSION)
+    """
+    l_unique = list(dict.fromkeys(l_col_names))
+    r_unique = list(dict.fromkeys(r_col_names))
+
+    unique_features = np.array(
+        [[get_string_features(l_col_name, r_col_name) for r_col_name in r_unique] for l_col_name in l_unique],
+        dtype=np.float32
+    ).reshape(len(l_unique), len(r_unique), STRING_FEATURES_DIMENSION)
+
+    l_index = {name: i for i, name in enumerate(l_unique)}
+    r_index = {name: i for i, name in enumerate(r_unique)}
+    l_positions = np.array([l_index[name] for name in l_col_names], dtype=np.intp)
+    r_positions = np.array([r_index[name] for name in r_col_names], dtype=np.intp)
+
+    return unique_features[np.ix_(l_positions, r_positions)]
+
+
+def get_string_features_pairs(l_col_names: list[str], r_col_names: list[str]) -> np.ndarray:
+    """(l_col_names[i], r_col_names[i]) 쌍 별 문자열 유사도
+
+    Returns:
+        np.ndarray: (len(l_col_names), STRING_FEATURES_DIMENSION)
+    """
+    return np.array(
+        [get_string_features(l_col_name, r_col_name) for l_col_name, r_col_name in zip(l_col_names, r_col_names)],
+        dtype=np.float32
+    ).reshape(len(l_col_names), STRING_FEATURES_DIMENSION)
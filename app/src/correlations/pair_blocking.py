@@ -0,0 +1,88 @@
+"""
+type 호환성 기반 blocking, 매칭될 수 없는 (l_column, r_column) 쌍을 relational features 계산 전에 제외
+
+self features 만으로 판단하므로 column 값을 다시 읽지 않음.
+- data type: self features 의 data type one hot 과 값 embedding 유무 (DEEP_FEATURE_INVALID_VALUE) 로 column 종류를 구분
+  - url, date, 숫자만 있는 (STRICT_NUMERIC) column 은 값 embedding 이 없음
+  - 문자열이 섞인 (STRING, MAINLY_NUMERIC) column 은 모든 종류와 호환
+  - url 과 숫자, url 과 date column 은 호환되지 않음
+  - 숫자와 date 는 is_date 가 숫자 column (평점 등) 을 date 로 분류하는 경우가 있어 호환으로 취급
+- length: 값 길이 범위 [min, max] 가 겹치지 않고 평균 길이 비율이 length_ratio 이상이면 호환되지 않음
+  - 길이 통계가 GENERAL_FEATURE_INVALID_VALUE 이면 length 조건은 사용하지 않음
+"""
+from typing import Optional
+
+import numpy as np
+
+from app.config import settings
+from app.src.correlations.catalog import DATA_TYPE_NAMES
+from app.src.correlations.relation_features import TableProfile
+from app.src.correlations.self_features import Constants
+
+# self features 의 length features (mean, min, max, ...) 위치
+# data type one hot (4) + numeric features (6) 이후
+LENGTH_MEAN_INDEX = len(DATA_TYPE_NAMES) + Constants.NUMERIC_FEATURES_DIMENSION
+LENGTH_MIN_INDEX = LENGTH_MEAN_INDEX + 1
+LENGTH_MAX_INDEX = LENGTH_MEAN_INDEX + 2
+
+# 값 embedding 이 있는 column 의 종류, 모든 종류와 호환
+TEXT_KIND = -1
+URL_KIND, NUMERIC_KIND, DATE_KIND = (DATA_TYPE_NAMES.index(name) for name in ("url", "numeric", "date"))
+INCOMPATIBLE_KINDS = ((URL_KIND, NUMERIC_KIND), (URL_KIND, DATE_KIND))
+
+
+def column_kinds(features: np.ndarray) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: (len(features),) 값 embedding 이 있으면 TEXT_KIND, 없으면 data type one hot index
+    """
+    data_types = np.argmax(features[:, :len(DATA_TYPE_NAMES)], axis=1)
+    embeddings = features[:, -Constants.DEEP_EMBEDDING_FEATURES_DIMENSION:]
+    has_values = ~(embeddings == Constants.DEEP_FEATURE_INVALID_VALUE).all(axis=1)
+    return np.where(has_values, TEXT_KIND, data_types)
+
+
+def compatible_pairs(l_profile: TableProfile, r_profile: TableProfile,
+                     length_ratio: Optional[float] = None) -> np.ndarray:
+    """
+    Args:
+        length_ratio: 평균 길이 비율 기준, 0 이면 length 조건 사용 안 함. None 이면 PAIR_BLOCKING_LENGTH_RATIO.
+
+    Returns:
+        np.ndarray: (len(l_profile), len(r_profile)) bool, 매칭될 수 있는 쌍만 True
+    """
+    if length_ratio is None:
+        length_ratio = settings.PAIR_BLOCKING_LENGTH_RATIO
+
+    l_features = np.asarray(l_profile.features)
+    r_features = np.asarray(r_profile.features)
+
+    l_kinds = column_kinds(l_features)[:, np.newaxis]
+    r_kinds = column_kinds(r_features)[np.newaxis, :]
+    compatible = np.ones((len(l_features), len(r_features)), dtype=bool)
+    for a, b in INCOMPATIBLE_KINDS:
+        compatible &= ~(((l_kinds == a) & (r_kinds == b)) | ((l_kinds == b) & (r_kinds == a)))
+
+    if length_ratio > 0:
+        compatible &= ~length_mismatch(l_features, r_features, length_ratio)
+
+    return compatible
+
+
+def length_mismatch(l_features: np.ndarray, r_features: np.ndarray, length_ratio: float) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: (len(l_features), len(r_features)) bool, 길이 범위가 겹치지 않고 평균 길이가 length_ratio 배 이상 차이나는 쌍
+    """
+    lengths = slice(LENGTH_MEAN_INDEX, LENGTH_MAX_INDEX + 1)
+    l_valid = (l_features[:, lengths] != Constants.GENERAL_FEATURE_INVALID_VALUE).all(axis=1)[:, np.newaxis]
+    r_valid = (r_features[:, lengths] != Constants.GENERAL_FEATURE_INVALID_VALUE).all(axis=1)[np.newaxis, :]
+
+    l_mean = l_features[:, LENGTH_MEAN_INDEX][:, np.newaxis]
+    r_mean = r_features[:, LENGTH_MEAN_INDEX][np.newaxis, :]
+    disjoint = ((l_features[:, LENGTH_MAX_INDEX][:, np.newaxis] < r_features[:, LENGTH_MIN_INDEX][np.newaxis, :])
+                | (r_features[:, LENGTH_MAX_INDEX][np.newaxis, :] < l_features[:, LENGTH_MIN_INDEX][:, np.newaxis]))
+    # 빈 문자열만 있는 column 은 평균 길이가 0
+    ratio = np.maximum(l_mean, r_mean) / np.maximum(np.minimum(l_mean, r_mean), 1e-12)
+
+    return l_valid & r_valid & disjoint & (ratio >= length_ratio)
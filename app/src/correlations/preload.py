@@ -0,0 +1,133 @@
+"""
+embedding model, XGBoost ensemble 을 gunicorn master 에서 한 번만 로드하여 worker 간 copy-on-write 로 공유
+
+PRELOAD_MODELS 설정 시 gunicorn.conf.py 가 preload_app 을 켜고, master 는 app 을 import 한 뒤 (on_starting hook)
+model 을 로드, warm up 하고 worker 를 fork 한다. 설정하지 않으면 기존처럼 각 worker 가 ensemble 을 구동 시,
+sentence transformer 를 첫 request 에서 로드한다.
+- worker 는 model 가중치 (torch tensor, onnxruntime session, booster) 를 읽기만 하므로 master 의 page 를 공유함
+- gc.freeze 로 로드된 객체를 GC 대상에서 제외하여, worker 의 GC 가 객체를 건드려 page 가 복사되는 것을 줄임
+- torch, XGBoost 는 fork 이전에 여러 thread (OpenMP) 로 실행하면 fork 된 worker 에서 실행이 멈추므로,
+  master 의 warm up 은 1 thread 로 실행하고 설정된 thread 수로 되돌림
+- predict, matching thread pool 은 master 에서 만들지 않고 worker 에서 처음 사용할 때 생성됨
+"""
+import gc
+import logging
+import os
+import resource
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+import xgboost as xgb
+
+from app.config import settings
+from app.src.correlations.enums import MatchingModel
+from app.src.correlations.model import MatchingModelRegistry, SentenceTransformer
+
+WARM_UP_SENTENCES = ["schema matching", "관계형 스키마 매칭"]
+
+# smaps_rollup 항목 (kB) -> 로그에 출력할 이름
+SMAPS_FIELDS = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared", "Shared_Dirty": "shared",
+                "Private_Clean": "private", "Private_Dirty": "private"}
+
+# master 에서 preload 했는지 여부, fork 된 worker 에 그대로 전달됨
+_preloaded = False
+# worker 구동 시간 측정 기준, gunicorn worker 는 fork 시점 (after_fork) 으로 재설정
+_started_at = time.perf_counter()
+
+
+def warm_up():
+    """embedding encode, booster predict 를 한 번씩 실행하여 첫 request 의 lazy 초기화 지연을 없앰
+
+    Notes:
+        fork 이전에 호출해도 worker 가 멈추지 않도록 torch, XGBoost 모두 1 thread 로 실행한다.
+    """
+    torch = sys.modules.get("torch")
+    num_threads = torch.get_num_threads() if torch is not None else None
+    if torch is not None:
+        torch.set_num_threads(1)
+    try:
+        SentenceTransformer.get().encode(WARM_UP_SENTENCES)
+    finally:
+        if torch is not None:
+            torch.set_num_threads(num_threads)
+
+    ensemble = MatchingModelRegistry.get(MatchingModel.INITIAL)
+    features = xgb.DMatrix(np.zeros((1, ensemble.boosters[0].num_features()), dtype=np.float32))
+    for bst in ensemble.boosters:
+        bst.set_param({"nthread": 1})
+        try:
+            bst.predict(features)
+        finally:
+            bst.set_param({"nthread": ensemble.nthread})
+
+
+def preload_models():
+    """gunicorn master 에서 worker fork 이전에 호출 (gunicorn.conf.py on_starting)"""
+    global _preloaded
+    start = time.perf_counter()
+    SentenceTransformer.get()
+    MatchingModelRegistry.get(MatchingModel.INITIAL)
+    warm_up()
+
+    # 이후 생성되는 객체만 GC 대상, fork 이전 객체의 page 는 worker 간 공유 상태로 유지
+    gc.collect()
+    gc.freeze()
+    _preloaded = True
+    logging.info(f"schema_matching|Preloaded models in master {os.getpid()} "
+                 f"({time.perf_counter() - start:.2f} sec, {format_memory(process_memory())})")
+
+
+def after_fork():
+    """gunicorn post_fork hook, fork 된 worker process 에서 실행"""
+    global _started_at
+    _started_at = time.perf_counter()
+
+
+def load_models():
+    """worker lifespan 구동 시 호출, master 에서 preload 한 model 은 다시 로드하지 않음"""
+    if _preloaded:
+        return
+    if settings.PRELOAD_MODELS:
+        # uvicorn 단독 실행 등 preload_app 을 사용하지 않는 경우, worker 에서 로드하고 warm up
+        SentenceTransformer.get()
+        MatchingModelRegistry.get(MatchingModel.INITIAL)
+        warm_up()
+    else:
+        # XGBoost ensemble 은 구동 시 한 번만 로드하여 request 간 공유
+        MatchingModelRegistry.load(MatchingModel.INITIAL)
+
+
+def log_worker_startup():
+    source = "preloaded in master" if _preloaded else "loaded in worker"
+    logging.info(f"schema_matching|Worker {os.getpid()} started in {time.perf_counter() - _started_at:.2f} sec "
+                 f"(models {source}, {format_memory(process_memory())})")
+
+
+def process_memory() -> dict[str, Optional[float]]:
+    """현재 process 의 메모리 사용량 (MB)
+
+    Returns:
+        dict: rss, pss (공유 page 를 공유 process 수로 나눈 값), shared, private, max_rss.
+              /proc/self/smaps_rollup 이 없는 환경 (Linux 4.14 이전, macOS) 은 max_rss 만 제공
+    """
+    memory: dict[str, Optional[float]] = {"rss": None, "pss": None, "shared": None, "private": None}
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in SMAPS_FIELDS:
+                    key = SMAPS_FIELDS[name]
+                    memory[key] = (memory[key] or 0.0) + int(value.split()[0]) / 1024
+    except OSError:
+        pass
+
+    # Linux 는 kB, macOS 는 bytes
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    memory["max_rss"] = max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    return memory
+
+
+def format_memory(memory: dict[str, Optional[float]]) -> str:
+    return ", ".join(f"{name}={value:.1f}MB" for name, value in memory.items() if value is not None)
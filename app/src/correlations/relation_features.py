@@ -1,22 +1,17 @@
 import random
 import re
-from itertools import product
+from typing import Optional
 
 import numpy as np
 import pandas as pd
-from nltk.translate import bleu
-from nltk.translate.bleu_score import SmoothingFunction
 from numpy.linalg import norm
 from sentence_transformers import util
-from strsimpy.damerau import Damerau
-from strsimpy.metric_lcs import MetricLCS
 
-from app.src.correlations.model import SentenceTransformer
+from app.src.correlations.model import ColumnNameEmbeddingCache
+from app.src.correlations.name_similarity import STRING_FEATURES_DIMENSION, get_string_features, \
+    get_string_features_matrix, get_string_features_pairs
 from app.src.correlations.self_features import make_self_features_from
 
-SMOOTHIE = SmoothingFunction().method4
-METRIC_LCS = MetricLCS()
-DAMERAU = Damerau()
 SEED = 200
 random.seed(SEED)
 
@@ -60,11 +55,8 @@ def get_col_names_features(
          transformer_score: cosine similarity
          one_in_one: 포함 관계 일 경우 1, 아니면 0
     """
-    bleu_score = bleu([l_col_name], r_col_name, smoothing_function=SMOOTHIE)
-    edit_distance = DAMERAU.distance(l_col_name, r_col_name)
-    lcs = METRIC_LCS.distance(l_col_name, r_col_name)
+    bleu_score, edit_distance, lcs, one_in_one = get_string_features(l_col_name, r_col_name)
     transformer_score = util.cos_sim(l_col_name_embedding, r_col_name_embedding)
-    one_in_one = l_col_name in r_col_name or r_col_name in l_col_name
 
     col_names_features = np.array(
         [bleu_score, edit_distance, lcs, transformer_score, one_in_one],
@@ -84,6 +76,27 @@ def calculate_embedding_cosine_similarity(embeddings1: np.ndarray, embeddings2:
     return np.array([cosine_similarity])
 
 
+def calculate_embedding_cosine_similarity_matrix(embeddings1: np.ndarray, embeddings2: np.ndarray) -> np.ndarray:
+    """
+
+    Returns:
+         np.ndarray: (len(embeddings1), len(embeddings2)) calculate_embedding_cosine_similarity of every pair.
+    """
+    return (embeddings1 @ embeddings2.T) / np.outer(norm(embeddings1, axis=1), norm(embeddings2, axis=1))
+
+
+def calculate_col_name_cosine_similarity_matrix(embeddings1: np.ndarray, embeddings2: np.ndarray) -> np.ndarray:
+    """
+
+    Returns:
+         np.ndarray: (len(embeddings1), len(embeddings2)) sentence_transformers.util.cos_sim of every pair.
+    """
+    # util.cos_sim 과 동일하게 norm 이 0 인 경우 1e-12 로 나눔
+    embeddings1 = embeddings1 / np.maximum(norm(embeddings1, axis=1, keepdims=True), 1e-12)
+    embeddings2 = embeddings2 / np.maximum(norm(embeddings2, axis=1, keepdims=True), 1e-12)
+    return embeddings1 @ embeddings2.T
+
+
 def get_output_feature_from_row(
         l_col_name: str,
         l_feature: np.ndarray,
@@ -112,54 +125,126 @@ def get_output_feature_from_row(
     return output_feature
 
 
+class TableProfile:
+    """테이블 하나의 매칭 입력
+
+    한 번 만든 profile 은 여러 상대 테이블과의 매칭에 재사용할 수 있다.
+
+    Attributes:
+        columns: 원본 column 이름
+        col_names: preprocess_text 를 적용한 column 이름
+        features: (len(columns), 792) self features
+        col_name_embeddings: (len(columns), 768) col_names 의 sentence embedding
+        row_count: self features 계산에 사용한 row 수 (sampling 한 경우 sample 크기)
+    """
+
+    def __init__(self, columns: list[str], col_names: list[str], features: np.ndarray,
+                 col_name_embeddings: np.ndarray, row_count: int = 0):
+        self.columns = columns
+        self.col_names = col_names
+        self.features = features
+        self.col_name_embeddings = col_name_embeddings
+        self.row_count = row_count
+
+    def __len__(self):
+        return len(self.columns)
+
+
+def make_table_profile(table_df: pd.DataFrame) -> TableProfile:
+    """self features 와 column name embedding 을 계산하여 TableProfile 생성"""
+    features = make_self_features_from(table_df)
+    # np.savetxt("table_features.csv", features, fmt="%s", delimiter=",")
+
+    return build_table_profile(list(table_df.columns), features, len(table_df))
+
+
+def build_table_profile(columns: list[str], features: np.ndarray, row_count: int) -> TableProfile:
+    """계산된 self features 에 column name embedding 을 더해 TableProfile 생성"""
+    col_names = [preprocess_text(c) for c in columns]
+
+    return TableProfile(
+        columns,
+        col_names,
+        features,
+        ColumnNameEmbeddingCache.encode(col_names),
+        row_count
+    )
+
+
 def create_feature_matrix_inference(l_df: pd.DataFrame, r_df: pd.DataFrame) -> np.ndarray:
     """
 
     Notes:
         Read data from 2 table dataframe, mapping file path and make relational features and labels as a matrix.
     """
+    l_profile = make_table_profile(l_df)
+    r_profile = make_table_profile(r_df)
 
-    l_table_features = make_self_features_from(l_df)
-    # np.savetxt("l_table_features.csv", l_table_features, fmt="%s", delimiter=",")
+    return create_feature_matrix_from_profiles(l_profile, r_profile)
 
-    r_table_features = make_self_features_from(r_df)
-    # np.savetxt("r_table_features.csv", r_table_features, fmt="%s", delimiter=",")
 
-    l_columns = [preprocess_text(c) for c in l_df.columns]
-    r_columns = [preprocess_text(c) for c in r_df.columns]
+def create_feature_matrix_from_profiles(l_profile: TableProfile, r_profile: TableProfile,
+                                        pairs: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+
+    Notes:
+        make relational features of every (l_column, r_column) pair as a matrix.
+
+    Args:
+        pairs: (len(l_profile), len(r_profile)) bool, 주어지면 True 인 쌍의 features 만 계산
+    Returns:
+        np.ndarray: (pair 수, 30) row 순서는 product(l_columns, r_columns) 중 선택된 쌍의 순서와 동일
+    """
+    l_columns = l_profile.col_names
+    r_columns = r_profile.col_names
 
-    combinations = list(product(range(len(l_columns)), range(len(r_columns))))
+    l_non_embed_features, l_embed_features = np.split(
+        l_profile.features, [-Constants.DEEP_EMBEDDING_FEATURES_DIMENSION], axis=1)
+    r_non_embed_features, r_embed_features = np.split(
+        r_profile.features, [-Constants.DEEP_EMBEDDING_FEATURES_DIMENSION], axis=1)
 
-    # TODO: Model Depends, or Logic
-    model = SentenceTransformer.get()
+    NON_EMBEDDED_DIMENSION = l_non_embed_features.shape[1]
 
-    column_name_embeddings: dict[str, any] = {c: model.encode(c) for c in l_columns + r_columns}
-    # END OF MODEL LOGIC
+    if pairs is None:
+        l_index, r_index = np.divmod(np.arange(len(l_columns) * len(r_columns)), len(r_columns))
+    else:
+        l_index, r_index = np.nonzero(pairs)
 
-    NON_EMBEDDED_DIMENSION = l_table_features.shape[1] - Constants.DEEP_EMBEDDING_FEATURES_DIMENSION
+    # get_output_feature_from_row 와 같은 features 를 선택된 (l_column, r_column) 쌍에 대해 한 번에 계산
+    # (non_embed_feature 의 차의 abs) / (non_embed_feature 의 합 + EPSILON), (pair 수, NON_EMBEDDED_DIMENSION)
+    l_non_embed_features = l_non_embed_features[l_index]
+    r_non_embed_features = r_non_embed_features[r_index]
+    difference_features_percent = (np.abs(l_non_embed_features - r_non_embed_features)
+                                   / (l_non_embed_features + r_non_embed_features + Constants.EPSILON))
+
+    # (l_columns, r_columns) 전체를 계산해도 column 수 만큼의 행렬 곱이므로 비용이 작음
+    transformer_score = calculate_col_name_cosine_similarity_matrix(l_profile.col_name_embeddings,
+                                                                    r_profile.col_name_embeddings)
+    embedding_cos_sim = calculate_embedding_cosine_similarity_matrix(l_embed_features, r_embed_features)
 
     # TODO: Matrix values, row size are ignored
     output_feature_table = np.zeros(
         (
             # combinations_label len = l_columns * r_columns
-            len(combinations),
+            len(l_index),
             # NON_EMBEDDED_DIMENSION + ADDITIONAL_FEATURE_DIMENSION
             NON_EMBEDDED_DIMENSION + Constants.ADDITIONAL_FEATURE_DIMENSION
         ),
         dtype=np.float32
     )
 
-    for i, (l_col, r_col) in enumerate(combinations):
-        l_col_name = l_columns[l_col]
-        r_col_name = r_columns[r_col]
-
-        output_feature_table[i, :] = get_output_feature_from_row(
-            l_col_name,
-            l_table_features[l_col],
-            column_name_embeddings[l_col_name],
-            r_col_name,
-            r_table_features[r_col],
-            column_name_embeddings[r_col_name]
-        )
+    # non_embed(24) + col_name(5) + cos_sim(1) = 30 features
+    # col_name = bleu_score, edit_distance, lcs, transformer_score, one_in_one
+    output_feature_table[:, :NON_EMBEDDED_DIMENSION] = difference_features_percent
+
+    # 문자열 기반 features 는 중복 제거된 column 이름 쌍 단위로 계산
+    if pairs is None:
+        string_features = get_string_features_matrix(l_columns, r_columns).reshape(-1, STRING_FEATURES_DIMENSION)
+    else:
+        string_features = get_string_features_pairs([l_columns[i] for i in l_index], [r_columns[j] for j in r_index])
+    output_feature_table[:, NON_EMBEDDED_DIMENSION:NON_EMBEDDED_DIMENSION + 3] = string_features[:, :3]
+    output_feature_table[:, NON_EMBEDDED_DIMENSION + 3] = transformer_score[l_index, r_index]
+    output_feature_table[:, NON_EMBEDDED_DIMENSION + 4] = string_features[:, 3]
+    output_feature_table[:, NON_EMBEDDED_DIMENSION + 5] = embedding_cos_sim[l_index, r_index]
 
     return output_feature_table
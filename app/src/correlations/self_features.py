@@ -2,11 +2,14 @@ import logging
 import random
 import re
 from enum import Enum
+from typing import Callable, Optional
 
 import numpy as np
 import pandas as pd
-from dateutil.parser import parse as parse_date
 
+from app.config import settings
+from app.src.correlations.date_detection import count_dates
+from app.src.correlations.feature_cache import FeatureCache
 from app.src.correlations.model import SentenceTransformer
 
 """
@@ -15,10 +18,36 @@ from app.src.correlations.model import SentenceTransformer
 UNIT_DICT = {"万": 10000, "亿": 100000000, "萬": 10000, "億": 100000000, "K+": 1000, "M+": 1000000, "B+": 1000000000}
 
 DATE_DICT = {"月", "日", "年"}
+DATE_MARKER_PATTERN = re.compile("|".join(re.escape(date) for date in DATE_DICT))
 PUNCTUATIONS = [",", ".", ";", "!", "?", "，", "。", "；", "！", "？"]
 SPECIAL_CHARACTERS = ["／", "/", "\\", "-", "_", "+", "=", "*", "&", "^", "%", "$", "#", "@", "~", "`", "(", ")",
                       "[", "]", "{", "}", "<", ">", "|", "'", "\""]
 
+# calculate_character_features 에서 ASCII 문자열의 문자 수를 세기 위한 삭제 문자
+ASCII_WHITESPACES = b" \t\n"
+ASCII_PUNCTUATIONS = "".join(c for c in PUNCTUATIONS if c.isascii()).encode("ascii")
+ASCII_SPECIAL_CHARACTERS = "".join(c for c in SPECIAL_CHARACTERS if c.isascii()).encode("ascii")
+
+URL_PATTERN = re.compile(r'[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b(?:[-a-zA-Z0-9()@:%_\+.~#?&//=]*)')
+
+"""
+float(str) 이 허용하는 문자열과 같은 문법 (앞뒤 공백, 부호, '_' 구분자, 지수, inf/infinity/nan)
+re.IGNORECASE 는 'ı', 'İ' 등 유니코드 문자도 'i' 와 같게 보므로 대소문자를 직접 나열함
+"""
+_SPACES = r'[^\S\x1c-\x1f]*'
+_DIGITS = r'\d(?:_?\d)*'
+FLOAT_PATTERN = re.compile(
+    rf'{_SPACES}[+-]?(?:(?:{_DIGITS}(?:\.(?:{_DIGITS})?)?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?'
+    rf'|[iI][nN][fF](?:[iI][nN][iI][tT][yY])?|[nN][aA][nN]){_SPACES}')
+
+DIGIT_PATTERN = re.compile(r'\d')
+ASCII_DIGITS = b"0123456789"
+
+POWERS_OF_TEN = np.array([10 ** i for i in range(20)], dtype=np.uint64)
+
+# pd.api.types.infer_dtype 결과 중 모든 값이 int, float, bool 인 경우
+NATIVE_NUMERIC_DTYPES = {"integer", "floating", "mixed-integer-float", "boolean"}
+
 
 class DataTypes(Enum):
     URL = 0,
@@ -33,11 +62,16 @@ class DataTypes(Enum):
 
 
 class Constants:
+    # extract_features 결과가 바뀌는 수정 시 증가, FeatureCache key 에 사용
+    FEATURE_VERSION = 1
+
     DATE_RATIO = 0.9
     URL_RATIO = 0.9
     NUMERIC_PART_RATIO = 0.5
     STRICT_NUMERIC_RATIO = 0.95
     MAINLY_NUMERIC_RATIO = 0.9
+    # data type 판단 시 처음 확인하는 값의 수, 이후 두 배씩 증가
+    CLASSIFY_FIRST_CHUNK_SIZE = 1024
 
     NUMERIC_FEATURES_DIMENSION = 6
     CHARACTER_FEATURES_DIMENSION = 8
@@ -54,18 +88,29 @@ def make_self_features_from(table_df: pd.DataFrame) -> np.ndarray:
     Returns:
          np.ndarray: Extracts features from the given table path and returns a feature table.
     """
-    feature_array = []
-    for column in table_df.columns:
-        # TODO: why use "Unnamed:"
-        if "Unnamed:" in column:
-            continue
+    cache_version = feature_cache_version()
 
-        feature = extract_features(table_df[column]).reshape(1, -1)
-        feature_array.append(feature)
+    # TODO: why use "Unnamed:"
+    columns = [column for column in table_df.columns if "Unnamed:" not in column]
 
-    if len(feature_array) == 0:
+    if len(columns) == 0:
         raise ValueError(f"No features extracted. Check your table: {table_df}.")
 
+    feature_array: list[Optional[np.ndarray]] = [None] * len(columns)
+    cache_keys: list[Optional[str]] = [None] * len(columns)
+    if FeatureCache.enabled():
+        for i, column in enumerate(columns):
+            cache_keys[i] = FeatureCache.make_key(table_df[column], cache_version)
+            feature_array[i] = FeatureCache.get(cache_keys[i])
+
+    # 캐시에 없는 column 들만 계산, deep embedding 은 한 번에 batch encoding
+    missing = [i for i, feature in enumerate(feature_array) if feature is None]
+    computed = extract_features_batch([table_df[columns[i]] for i in missing])
+    for i, feature in zip(missing, computed):
+        feature_array[i] = feature
+        if cache_keys[i] is not None:
+            FeatureCache.put(cache_keys[i], feature)
+
     # get each columns features and concatenate all features
     # will make (columns_length, feature_matrix_len)
     # should be (len(columns), 792)
@@ -76,6 +121,11 @@ def make_self_features_from(table_df: pd.DataFrame) -> np.ndarray:
     return features
 
 
+def feature_cache_version() -> str:
+    """FeatureCache key 에 사용하는 feature 계산 로직, embedding model 버전"""
+    return f"{Constants.FEATURE_VERSION}:{SentenceTransformer.version()}"
+
+
 # REMINDER: use ONLY data_list as Column
 def extract_features(data_list: list[any]) -> np.ndarray:
     """
@@ -85,29 +135,147 @@ def extract_features(data_list: list[any]) -> np.ndarray:
     Returns:
         np.array: Extract features from the given data.
     """
+    return extract_features_batch([data_list])[0]
 
-    # Drop outlier columns
-    data_list = [d for d in data_list if d == d and d != "--"]
 
-    data_type = classify_data_type(data_list)
+def extract_features_batch(data_lists: list[list[any]]) -> list[np.ndarray]:
+    """여러 column 의 features 를 추출
 
-    # TODO: ignored comment, need to fix this
-    # If data is not numeric, give length features
-    length_features = calculate_numeric_features([len(str(d)) for d in data_list])
+    Notes:
+        column 별 deep embedding 을 따로 encoding 하지 않고, 모든 column 의 sample 을 모아 한 번에 encoding 함.
 
-    # output_features
-    output_features = np.concatenate((
-        get_datatype_feature(data_type),  # 4 cols
-        get_data_numeric_feature(data_list, data_type),  # 6 cols
-        length_features,  # 6 cols
-        get_character_feature(data_list, data_type),  # 8 cols
-        get_deep_embedding_feature(data_list, data_type)  # 768 cols
-    ))
+    Args:
+        data_lists (list[list[any]]): columns or lists.
+    Returns:
+        list[np.array]: Extract features from each given data.
+    """
+    non_embedding_features = []
+    embedding_samples = []
+    for data_list in data_lists:
+        if is_native_numeric(data_list) and data_list.notna().any():
+            non_embedding_features.append(extract_native_numeric_features(data_list))
+            embedding_samples.append(None)
+            continue
+
+        if isinstance(data_list, pd.Series) and pd.api.types.is_datetime64_any_dtype(data_list.dtype):
+            # csv 로 읽은 경우와 같은 문자열로 변환하여 DATE 여부를 판단
+            data_list = data_list.dropna().astype(str)
+
+        # Drop outlier columns
+        data_list = [d for d in data_list if d == d and d != "--"]
+
+        data_type = classify_data_type(data_list)
+
+        # TODO: ignored comment, need to fix this
+        # If data is not numeric, give length features
+        length_features = calculate_numeric_features([len(str(d)) for d in data_list])
+
+        non_embedding_features.append(np.concatenate((
+            get_datatype_feature(data_type),  # 4 cols
+            get_data_numeric_feature(data_list, data_type),  # 6 cols
+            length_features,  # 6 cols
+            get_character_feature(data_list, data_type),  # 8 cols
+        )))
+
+        if data_type == DataTypes.STRING or data_type == DataTypes.MAINLY_NUMERIC:
+            embedding_samples.append(sample_deep_embedding_data(data_list))
+        else:
+            embedding_samples.append(None)
+
+    embeddings = iter(deep_embedding_batch([samples for samples in embedding_samples if samples is not None]))
+
+    output_features = []
+    for non_embedding_feature, samples in zip(non_embedding_features, embedding_samples):
+        if samples is not None:
+            deep_embedding_feature = next(embeddings)
+        else:
+            deep_embedding_feature = np.array([Constants.DEEP_FEATURE_INVALID_VALUE]
+                                              * Constants.DEEP_EMBEDDING_FEATURES_DIMENSION)
+
+        # output_features
+        output_features.append(np.concatenate((
+            non_embedding_feature,  # 24 cols
+            deep_embedding_feature  # 768 cols
+        )))
 
     return output_features
 
 
+def is_native_numeric(data_list: list[any]) -> bool:
+    """pandas 가 numpy int, uint, float, bool dtype 으로 읽은 column 인지 확인"""
+    return (isinstance(data_list, pd.Series) and isinstance(data_list.dtype, np.dtype)
+            and data_list.dtype.kind in "iufb")
+
+
+def extract_native_numeric_features(column: pd.Series) -> np.ndarray:
+    """numpy numeric dtype column 의 non embedding features
+
+    Notes:
+        extract_features_batch 에서 값을 list 로 변환하여 계산한 것과 같은 값을 numpy 로 계산함.
+        - data type: int, float, bool 값은 항상 STRICT_NUMERIC (classify_data_type)
+        - length: numpy 의 str 변환은 python str() 과 같은 문자열을 만듦
+        - numeric: extract_numeric 은 str(float) 의 첫 번째 숫자 부분을 사용하므로,
+          지수 표기 (1e-05, 1e+16 등) 나 inf 처럼 str 이 값과 다른 경우만 extract_numeric 으로 변환
+
+    Returns:
+        np.ndarray: (24,) datatype, numeric, length, character features
+    """
+    values = column.to_numpy()[column.notna().to_numpy()]
+
+    return np.concatenate((
+        get_datatype_feature(DataTypes.STRICT_NUMERIC),  # 4 cols
+        calculate_numeric_features(extract_float_numeric(values.astype(np.float64))),  # 6 cols
+        calculate_numeric_features(native_lengths(values)),  # 6 cols
+        get_character_feature(values, DataTypes.STRICT_NUMERIC),  # 8 cols
+    ))
+
+
+def extract_float_numeric(floats: np.ndarray) -> np.ndarray:
+    """extract_numeric(floats) 와 같은 값을 numpy 로 계산
+
+    Notes:
+        str(float) 이 지수 표기가 아닌 값은 값 그대로 사용하고, 나머지만 extract_numeric 으로 변환한다.
+    """
+    magnitudes = np.abs(floats)
+    # python float repr 이 지수 표기를 사용하지 않는 범위
+    plain = np.isfinite(floats) & ((magnitudes == 0) | ((magnitudes >= 1e-4) & (magnitudes < 1e16)))
+
+    numeric = floats.copy()
+    keep = plain.copy()
+    for i in np.flatnonzero(~plain):
+        extracted = extract_numeric([float(floats[i])])
+        if extracted:
+            numeric[i] = extracted[0]
+            keep[i] = True
+
+    return numeric[keep]
+
+
+def native_lengths(values: np.ndarray) -> np.ndarray:
+    """[len(str(x)) for x in values] of numpy int, uint, float, bool values"""
+    if values.dtype.kind == "b":
+        # len("True"), len("False")
+        return np.where(values, 4, 5)
+    if values.dtype.kind in "iu":
+        return count_integer_digits(values)
+    # list 로 변환하면 float32 등도 python float (float64) 가 되므로 float64 의 str 길이를 사용
+    return np.char.str_len(values.astype(np.float64).astype(str))
+
+
+def count_integer_digits(values: np.ndarray) -> np.ndarray:
+    """len(str(x)) of numpy int or uint values, 음수는 '-' 포함"""
+    negative = values < 0
+    # -(x + 1) 로 int64 최솟값의 overflow 방지
+    magnitudes = np.where(negative, -(values + 1), values).astype(np.uint64) + negative.astype(np.uint64)
+    digits = np.maximum(np.searchsorted(POWERS_OF_TEN, magnitudes, side="right"), 1)
+    return digits + negative
+
+
 def classify_data_type(data_list: list[any]) -> DataTypes:
+    if len(data_list) > 0 and pd.api.types.infer_dtype(data_list, skipna=False) in NATIVE_NUMERIC_DTYPES:
+        # int, float, bool 만 있는 column 은 url/date 문자열이 없고 모든 값이 float() 변환 가능
+        return DataTypes.STRICT_NUMERIC
+
     data_type = DataTypes.STRING
     if is_url(data_list):
         data_type = DataTypes.URL
@@ -121,48 +289,132 @@ def classify_data_type(data_list: list[any]) -> DataTypes:
     return data_type
 
 
-def is_url(data_list: list[any]) -> bool:
-    """
+def reaches_ratio(data_list: list[any], ratio: float, count: Callable[[list[any]], int],
+                  max_count_per_value: int = 1) -> bool:
+    """count(data_list) >= ratio * len(data_list) 를 chunk 단위로 확인
+
+    Notes:
+        chunk 크기를 두 배씩 늘려가며 count 하고, 남은 값이 모두 count 되어도 ratio 에 못 미치거나
+        이미 ratio 에 도달한 경우 나머지 값은 확인하지 않는다. 결과는 전체를 count 한 경우와 동일.
+
+    Args:
+        data_list: 확인할 데이터
+        ratio: 필요한 비율
+        count: chunk 내 조건을 만족하는 값의 수
+        max_count_per_value: 하나의 값이 count 에 더할 수 있는 최대 값
 
     Returns:
-        bool: True if data_list contains url strings than URL_RATIO
+        bool: count 비율이 ratio 이상일 경우 True
     """
+    total = len(data_list)
+    needed = ratio * total
+
     cnt = 0
-    url_pattern = r'[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)'
-    for data in data_list:
-        if not isinstance(data, str):
-            continue
-        if re.search(url_pattern, data):
+    start = 0
+    chunk_size = Constants.CLASSIFY_FIRST_CHUNK_SIZE
+    while start < total:
+        if cnt >= needed:
+            return True
+        if cnt + max_count_per_value * (total - start) < needed:
+            return False
+
+        chunk = data_list[start:start + chunk_size]
+        cnt += count(chunk)
+        start += chunk_size
+        chunk_size *= 2
+
+    return cnt >= needed
+
+
+def _string_series(data_list: list[any]) -> pd.Series:
+    """data_list 중 str 인 값만 pandas str 연산용 Series 로 변환"""
+    return pd.Series([data for data in data_list if isinstance(data, str)], dtype=object)
+
+
+def count_url(data_list: list[any]) -> int:
+    return int(_string_series(data_list).str.contains(URL_PATTERN, na=False).sum())
+
+
+def count_date(data_list: list[any]) -> int:
+    """DATE_DICT 문자를 포함하는 값과 2000 ~ 2030 년 사이의 날짜로 parse 되는 값의 수 (한 값이 두 번 count 될 수 있음)"""
+    strings = _string_series(data_list)
+    marker_cnt = int(strings.str.contains(DATE_MARKER_PATTERN, na=False).sum())
+    return marker_cnt + count_dates(strings.tolist())
+
+
+def count_strict_numeric(data_list: list[any]) -> int:
+    """float() 로 변환 가능한 값의 수
+
+    Notes:
+        str 은 float() 이 허용하는 문법과 같은 FLOAT_PATTERN 으로 확인하고, int, float, bool 은 항상 변환 가능.
+        그 외 type 만 float() 을 직접 호출한다.
+    """
+    strings = []
+    cnt = 0
+    for x in data_list:
+        if isinstance(x, str):
+            strings.append(x)
+        elif isinstance(x, (int, float, np.integer, np.floating)):
             cnt += 1
+        else:
+            try:
+                float(x)
+                cnt += 1
+            except ValueError as _:
+                continue
 
-    return cnt >= Constants.URL_RATIO * len(data_list)
+    return cnt + int(pd.Series(strings, dtype=object).str.fullmatch(FLOAT_PATTERN).sum())
 
 
-def is_date(data_list: list[any]) -> bool:
+def count_digits(data: str) -> int:
+    """re.findall(r'\\d', data) 의 길이, ASCII 문자열은 정규식 없이 계산"""
+    if data.isascii():
+        return len(data) - len(data.encode("ascii").translate(None, ASCII_DIGITS))
+    return len(DIGIT_PATTERN.findall(data))
+
+
+def remove_units(data: str) -> str:
+    data = data.replace(",", "")
+
+    # 백, 천, 만, K, B등의 단위 제거
+    for unit in UNIT_DICT.keys():
+        data = data.replace(unit, "")
+    return data
+
+
+def count_mainly_numeric(data_list: list[any]) -> int:
+    """숫자 단위와 ',' 를 제거한 문자열에서 숫자가 NUMERIC_PART_RATIO 이상인 값의 수
+
+    Notes:
+        ',' 와 단위에는 숫자가 없으므로 제거 전후의 숫자 수는 같고 길이만 줄어든다.
+        제거 전 길이로 이미 NUMERIC_PART_RATIO 이상인 값은 단위 제거를 생략한다.
+    """
+    strings = [x if isinstance(x, str) else str(x) for x in data_list]
+    digits = np.fromiter(map(count_digits, strings), dtype=np.int64, count=len(strings))
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+
+    for i in np.flatnonzero((digits > 0) & (digits < Constants.NUMERIC_PART_RATIO * lengths)):
+        lengths[i] = len(remove_units(strings[i]))
+
+    return int(((digits > 0) & (digits >= Constants.NUMERIC_PART_RATIO * lengths)).sum())
+
+
+def is_url(data_list: list[any]) -> bool:
     """
 
     Returns:
-        bool: True if data_list contains date strings than DATE_RATIO
+        bool: True if data_list contains url strings than URL_RATIO
     """
-    cnt = 0
-    for data in data_list:
-        if not isinstance(data, str):
-            continue
+    return reaches_ratio(data_list, Constants.URL_RATIO, count_url)
 
-        if any(date in data for date in DATE_DICT):
-            cnt += 1
 
-        try:
-            date = parse_date(data)
-            # check if the date is near to today
-            # TODO: 왜 2000 년 전, 2030 년 이후 데이터 drop?
-            if date.year < 2000 or date.year > 2030:
-                continue
-            cnt += 1
-        except Exception as _:
-            continue
+def is_date(data_list: list[any]) -> bool:
+    """
 
-    return cnt >= Constants.DATE_RATIO * len(data_list)
+    Returns:
+        bool: True if data_list contains date strings than DATE_RATIO
+    """
+    return reaches_ratio(data_list, Constants.DATE_RATIO, count_date, max_count_per_value=2)
 
 
 def is_strict_numeric(data_list: list[any], verbose: bool = False) -> bool:
@@ -176,17 +428,14 @@ def is_strict_numeric(data_list: list[any], verbose: bool = False) -> bool:
         bool: data_list 내의 numeric 비율이 STRICT_NUMERIC_RATIO 이상일 경우 True
 
     """
-    cnt = 0
-    for x in data_list:
-        try:
-            y = float(x)
-            if verbose:
-                logging.debug(f"is_strict_numeric: src:{x} float{y}")
-            cnt += 1
-        except ValueError as _:
-            continue
+    if verbose:
+        for x in data_list:
+            try:
+                logging.debug(f"is_strict_numeric: src:{x} float{float(x)}")
+            except ValueError as _:
+                continue
 
-    return cnt >= Constants.STRICT_NUMERIC_RATIO * len(data_list)
+    return reaches_ratio(data_list, Constants.STRICT_NUMERIC_RATIO, count_strict_numeric)
 
 
 def is_mainly_numeric(data_list: list[any]) -> bool:
@@ -196,21 +445,7 @@ def is_mainly_numeric(data_list: list[any]) -> bool:
         bool: data_list 내의 mainly_numeric 비율이 STRICT_NUMERIC_RATIO 이상일 경우 True
 
     """
-    cnt = 0
-    for data in data_list:
-        data = str(data)
-        data = data.replace(",", "")
-
-        # 백, 천, 만, K, B등의 단위 제거
-        for unit in UNIT_DICT.keys():
-            data = data.replace(unit, "")
-
-        # data 내 numeric part 가 NUMERIC_PART_RATIO 이상일 경우 True
-        numeric_part = re.findall(r'\d+', data)
-        if len(numeric_part) > 0 and sum(len(x) for x in numeric_part) >= Constants.NUMERIC_PART_RATIO * len(data):
-            cnt += 1
-
-    return cnt >= Constants.MAINLY_NUMERIC_RATIO * len(data_list)
+    return reaches_ratio(data_list, Constants.MAINLY_NUMERIC_RATIO, count_mainly_numeric)
 
 
 def extract_numeric(data_list: list[any]) -> list[float]:
@@ -235,6 +470,15 @@ def extract_numeric(data_list: list[any]) -> list[float]:
         logging.warning(f"{__name__}: data_list can not conversion to float list")
         pass
 
+    return extract_numeric_parts(data_list)
+
+
+def extract_numeric_parts(data_list: list[any]) -> list[float]:
+    """
+
+    Returns:
+        list[float]: str(data) 의 첫 번째 숫자 부분에 unit 을 곱한 값, 숫자 부분이 없는 값은 제외
+    """
     numeric_list = []
     for data in data_list:
         data = str(data)
@@ -272,47 +516,47 @@ def calculate_numeric_features(data_list: list[any]) -> np.array:
 
         Including Mean, Min, Max, Variance, Standard Deviation, and the number of unique values.
     """
+    data_list = np.asarray(data_list)
     mean = np.mean(data_list)
     min = np.min(data_list)
     max = np.max(data_list)
     variance = np.var(data_list)
     cv = np.var(data_list) / mean
-    unique = len(set(data_list))
+    unique = len(np.unique(data_list))
     return np.array([mean, min, max, variance, cv, unique / len(data_list)])
 
 
-def calculate_character_features(data_list: list[any]) -> np.array:
+def count_characters(data: str) -> tuple[int, int, int, int]:
     """
 
+    Notes:
+        문자마다 python loop 를 돌지 않도록, ASCII 문자열은 bytes.translate 로 해당 문자들을 삭제한 길이 차이로,
+        그 외 문자열은 str.count 로 count 함. PUNCTUATIONS, SPECIAL_CHARACTERS 의 전각 문자는 ASCII 문자열에 나올 수 없음.
+
     Returns:
-         np.array: Extracts character features from the given data.
+        (whitespace, punctuation, special character, numeric) 문자 수
     """
-    whitespace_ratios = []  # Ratio of whitespace to length
-    punctuation_ratios = []  # Ratio of punctuation to length
-    special_character_ratios = []  # Ratio of special characters to length
-    numeric_ratios = []  # Ratio of numeric to length
-
-    for data in data_list:
-        # data 의 각 문자 x가 자기 문자일 경우 count 1 증가
-        whitespace_ratio = (data.count(" ") + data.count("\t") + data.count("\n")) / len(data)
-        whitespace_ratios.append(whitespace_ratio)
-
-        punctuation_ratio = sum(1 for x in data if x in PUNCTUATIONS) / len(data)
-        punctuation_ratios.append(punctuation_ratio)
+    if data.isascii():
+        encoded = data.encode("ascii")
+        length = len(encoded)
+        return (length - len(encoded.translate(None, ASCII_WHITESPACES)),
+                length - len(encoded.translate(None, ASCII_PUNCTUATIONS)),
+                length - len(encoded.translate(None, ASCII_SPECIAL_CHARACTERS)),
+                length - len(encoded.translate(None, ASCII_DIGITS)))
 
-        special_character_ratio = sum(1 for x in data if x in SPECIAL_CHARACTERS) / len(data)
-        special_character_ratios.append(special_character_ratio)
+    return (data.count(" ") + data.count("\t") + data.count("\n"),
+            sum(map(data.count, PUNCTUATIONS)),
+            sum(map(data.count, SPECIAL_CHARACTERS)),
+            sum(map(str.isdigit, data)))
 
-        numeric_ratio = sum(1 for x in data if x.isdigit()) / len(data)
-        numeric_ratios.append(numeric_ratio)
 
-    # TODO: why use 1e-12
-    epsilon = np.array([1e-12] * len(data_list))
+def calculate_character_features(data_list: list[any]) -> np.array:
+    """
 
-    whitespace_ratios = np.array(whitespace_ratios + epsilon)
-    punctuation_ratios = np.array(punctuation_ratios + epsilon)
-    special_character_ratios = np.array(special_character_ratios + epsilon)
-    numeric_ratios = np.array(numeric_ratios + epsilon)
+    Returns:
+         np.array: Extracts character features from the given data.
+    """
+    whitespace_ratios, punctuation_ratios, special_character_ratios, numeric_ratios = character_ratios(data_list)
 
     return np.array([
         # Means
@@ -328,6 +572,33 @@ def calculate_character_features(data_list: list[any]) -> np.array:
     ])
 
 
+def character_ratios(data_list: list[str]) -> np.ndarray:
+    """
+
+    Returns:
+        np.ndarray: (4, len(data_list)) whitespace, punctuation, special character, numeric 문자의 길이 대비 비율
+    """
+    counts = np.array([count_characters(data) for data in data_list], dtype=np.int64).reshape(-1, 4).T
+    lengths = np.fromiter(map(len, data_list), dtype=np.int64, count=len(data_list))
+
+    # Ratio of whitespace, punctuation, special characters, numeric to length
+    # TODO: why use 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return counts / lengths + 1e-12
+
+
+def sample_deep_embedding_data(data_list: list[any]) -> list[any]:
+    """
+
+    Notes:
+        Deep Embedding Feature 계산을 위해 20 개의 데이터를 Sampling.
+    """
+    # TODO: 20개 이외의 값, 20개 미만일 떄 dimension 유지되는지?
+    if len(data_list) >= 20:
+        data_list = random.sample(data_list, 20)  # safe random checked
+    return data_list
+
+
 def deep_embedding(data_list: list[any]) -> np.ndarray:
     """
 
@@ -338,18 +609,40 @@ def deep_embedding(data_list: list[any]) -> np.ndarray:
     Returns:
         np.ndarray: Extracts deep embedding features from the given data using sentence-transformers.
     """
-    # TODO: 20개 이외의 값, 20개 미만일 떄 dimension 유지되는지?
-    if len(data_list) >= 20:
-        data_list = random.sample(data_list, 20)  # safe random checked
+    return deep_embedding_batch([sample_deep_embedding_data(data_list)])[0]
+
+
+def deep_embedding_batch(samples_list: list[list[any]]) -> list[np.ndarray]:
+    """
+
+    Notes:
+        여러 column 의 sample 을 길이 순으로 정렬하여 한 번의 encode 호출로 encoding 한 뒤,
+        column 별로 다시 나누어 mean 을 취함.
+
+    Returns:
+        list[np.ndarray]: deep embedding features of each samples, same order as samples_list.
+    """
+    if len(samples_list) == 0:
+        return []
+
+    flat_data = [data for samples in samples_list for data in samples]
+    offsets = np.cumsum([0] + [len(samples) for samples in samples_list])
+
+    # 비슷한 길이끼리 batch 로 묶여 padding 이 줄어들도록 길이 순 정렬
+    order = sorted(range(len(flat_data)), key=lambda i: len(str(flat_data[i])))
 
     # TODO: use Depends
     model = SentenceTransformer.get()
 
     # str encode
     # TODO: check side effect
-    embeddings = np.array(model.encode(data_list))
+    sorted_embeddings = np.array(model.encode([flat_data[i] for i in order],
+                                              batch_size=settings.EMBEDDING_BATCH_SIZE))
+
+    embeddings = np.empty_like(sorted_embeddings)
+    embeddings[order] = sorted_embeddings
 
-    return np.mean(embeddings, axis=0)
+    return [np.mean(embeddings[start:end], axis=0) for start, end in zip(offsets[:-1], offsets[1:])]
 
 
 def get_datatype_feature(data_type: DataTypes) -> np.ndarray:
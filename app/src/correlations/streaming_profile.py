@@ -0,0 +1,620 @@
+"""
+테이블 파일을 chunk 단위로 읽으며 self features 계산 (streaming profiling)
+
+make_self_features_from(drop_na_columns(read_table(path))) 와 같은 (len(columns), 792) features 를 반환해야 함.
+메모리 사용량은 PROFILE_CHUNK_ROWS 와 column 수로 정해지며, 테이블의 row 수와 무관함.
+- 1st pass: 전체 파일을 한 번에 읽었을 때의 column dtype 과 유효한 값의 수를 확인
+- 2nd pass: 확인한 dtype 으로 다시 읽으며 column 별 online 통계를 누적
+  - mean, variance: chunk 단위 통계를 Chan et al. (parallel Welford) 방식으로 합침
+  - data type: self_features 의 count_* 결과를 chunk 마다 더하고, 결과가 정해진 data type 은 더 이상 count 하지 않음
+  - data type 이 정해지기 전에는 가능한 data type 의 features 를 모두 누적
+- unique 값 비율은 숫자 값 (column 값에서 추출한 숫자, 문자열 길이) 의 hash 중 가장 작은 PROFILE_DISTINCT_SKETCH_SIZE 개만
+  유지하는 KMV sketch 로 계산 (DistinctCounter). unique 값이 sketch 크기보다 적으면 정확한 값, 많으면 추정값
+  추정값을 사용한 column 의 features 는 in-memory 계산과 같은 FeatureCache key 에 저장하지 않음
+- deep embedding sample 은 유효한 값의 수를 미리 알고 있으므로, 미리 뽑은 위치의 값을 사용함
+  (random.sample 과 같은 균등 sample 이지만, 같은 값을 뽑지는 않음)
+"""
+import hashlib
+import logging
+import os
+from typing import Callable, Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.src.correlations.json_flatten import iter_flattened_chunks
+from app.src.correlations.feature_cache import FeatureCache
+from app.src.correlations.relation_features import TableProfile, build_table_profile
+from app.src.correlations.self_features import Constants, DataTypes, NATIVE_NUMERIC_DTYPES, \
+    calculate_numeric_features, character_ratios, count_date, count_mainly_numeric, count_strict_numeric, \
+    count_url, deep_embedding_batch, extract_float_numeric, extract_numeric_parts, feature_cache_version, \
+    get_character_feature, get_data_numeric_feature, get_datatype_feature, native_lengths
+
+STREAMING_FORMATS = (".csv", ".json", ".jsonl")
+
+OBJECT_DTYPE = "object"
+
+# sample_deep_embedding_data 의 sample 크기
+EMBEDDING_SAMPLE_SIZE = 20
+
+
+def can_stream(table_path: str) -> bool:
+    return table_path.endswith(STREAMING_FORMATS)
+
+
+def should_stream(table_path: str) -> bool:
+    """PROFILE_STREAMING_MIN_BYTES 이상인 csv, json, jsonl 파일인지 확인"""
+    return (settings.PROFILE_STREAMING_MIN_BYTES > 0 and can_stream(table_path)
+            and os.path.getsize(table_path) >= settings.PROFILE_STREAMING_MIN_BYTES)
+
+
+class DistinctCounter:
+    """숫자 값의 unique 개수를 고정 크기 메모리로 계산 (KMV, k minimum values sketch)
+
+    Notes:
+        값 (float64) 을 64 bit hash 로 변환하고 가장 작은 hash size 개만 유지한다.
+        hash (splitmix64) 는 float64 bit 에 대한 일대일 함수이므로, unique 값이 size 개 미만이면 유지한 hash 수가 정확한 값.
+        size 개 이상이면 size 번째로 작은 hash 로 전체 unique 개수를 추정한다 (상대 오차 약 1 / sqrt(size)).
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        # 정렬된 unique hash, 최대 size 개
+        self.hashes = np.array([], dtype=np.uint64)
+
+    @staticmethod
+    def hash(values: np.ndarray) -> np.ndarray:
+        # np.unique 와 같이 -0.0 과 0.0 은 같은 값
+        bits = (np.asarray(values, dtype=np.float64) + 0.0).view(np.uint64)
+        bits = (bits ^ (bits >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+        bits = (bits ^ (bits >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+        return bits ^ (bits >> np.uint64(31))
+
+    def update(self, values: np.ndarray):
+        self.hashes = np.union1d(self.hashes, self.hash(values))[:self.size]
+
+    def is_exact(self) -> bool:
+        return len(self.hashes) < self.size
+
+    def count(self) -> float:
+        if self.is_exact():
+            return float(len(self.hashes))
+        # size 번째로 작은 hash 의 [0, 1) 구간 위치
+        return (self.size - 1) / ((float(self.hashes[-1]) + 1) / 2.0 ** 64)
+
+
+class RunningStats:
+    """calculate_numeric_features 와 같은 통계를 chunk 단위로 누적
+
+    Notes:
+        chunk 의 (count, mean, M2) 를 Chan et al. 의 parallel variance 식으로 합친다.
+        unique 값 비율은 DistinctCounter 로 계산하며, unique 값이 PROFILE_DISTINCT_SKETCH_SIZE 이상이면 추정값이다.
+        unique 값 비율이 필요 없는 경우 (character features) track_unique=False 로 unique 값을 세지 않음.
+    """
+
+    def __init__(self, track_unique: bool = True):
+        self.count = 0
+        self.mean = np.float64(0)
+        self.m2 = np.float64(0)
+        self.min = np.float64(np.inf)
+        self.max = np.float64(-np.inf)
+        self.uniques: Optional[DistinctCounter] = \
+            DistinctCounter(settings.PROFILE_DISTINCT_SKETCH_SIZE) if track_unique else None
+
+    def update(self, values: np.ndarray):
+        if len(values) == 0:
+            return
+
+        count = len(values)
+        mean = np.mean(values)
+        m2 = np.sum(np.abs(values - mean) ** 2)
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * count / total
+        self.m2 = self.m2 + m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+        self.min = np.minimum(self.min, np.min(values))
+        self.max = np.maximum(self.max, np.max(values))
+        if self.uniques is not None:
+            self.uniques.update(values)
+
+    def is_exact(self) -> bool:
+        """features 의 unique 값 비율이 추정값이 아닌지"""
+        return self.uniques is None or self.uniques.is_exact()
+
+    @property
+    def variance(self) -> np.float64:
+        return self.m2 / self.count
+
+    def features(self) -> np.ndarray:
+        """calculate_numeric_features 와 같은 (mean, min, max, variance, cv, unique ratio)"""
+        if self.count == 0:
+            # 값이 없으면 calculate_numeric_features 와 같은 에러
+            return calculate_numeric_features([])
+        variance = self.variance
+        return np.array([self.mean, self.min, self.max, variance, variance / self.mean,
+                         min(self.uniques.count(), self.count) / self.count])
+
+
+class TypeCounter:
+    """self_features.reaches_ratio 를 chunk 단위로 계산
+
+    Notes:
+        전체 값의 수를 알고 있으므로, 남은 값과 상관없이 결과가 정해지면 이후 chunk 는 count 하지 않는다.
+        count 중 발생한 에러는 결과가 필요할 때 다시 발생시킨다. (in-memory 계산은 앞 data type 이 정해지면 count 하지 않음)
+    """
+
+    def __init__(self, data_type: DataTypes, ratio: float, count: Callable[[list[any]], int], total: int,
+                 max_count_per_value: int = 1):
+        self.data_type = data_type
+        self.count = count
+        self.total = total
+        self.needed = ratio * total
+        self.max_count_per_value = max_count_per_value
+
+        self.cnt = 0
+        self.counted = 0
+        self.result: Optional[bool] = None
+        self.error: Optional[Exception] = None
+
+    @property
+    def decided(self) -> bool:
+        return self.result is not None or self.error is not None
+
+    def update(self, values: list[any]):
+        if self.decided:
+            return
+        try:
+            self.cnt += self.count(values)
+        except Exception as e:
+            self.error = e
+            return
+
+        self.counted += len(values)
+        if self.cnt >= self.needed:
+            self.result = True
+        elif self.cnt + self.max_count_per_value * (self.total - self.counted) < self.needed:
+            self.result = False
+
+    def reaches_ratio(self) -> bool:
+        if self.error is not None:
+            raise self.error
+        if self.result is None:
+            return self.cnt >= self.needed
+        return self.result
+
+
+class ColumnSchema:
+    """1st pass 에서 확인한 column 정보
+
+    Attributes:
+        kinds: chunk 별 값의 종류 ("i": int, "f": float, "b": bool, "O": 그 외)
+        has_na: NaN (또는 None) 이 있는지 여부
+        size: NaN 포함 값의 수
+        valid_count: NaN, None, "--" 이 아닌 값의 수
+        none_count: None 값의 수 (jsonl 의 null), object column 에서는 유효한 값으로 취급됨
+    """
+
+    def __init__(self):
+        self.kinds: set[str] = set()
+        self.has_na = False
+        self.size = 0
+        self.valid_count = 0
+        self.none_count = 0
+
+    def update(self, column: pd.Series):
+        self.size += len(column)
+
+        kind = column.dtype.kind
+        if kind in "iub":
+            self.kinds.add("b" if kind == "b" else "i")
+            self.valid_count += len(column)
+            return
+
+        values = column.to_numpy()
+        na = pd.isna(values)
+        if na.any():
+            self.has_na = True
+            self.none_count += sum(d is None for d in values[na])
+        if na.all():
+            return
+
+        if kind == "f":
+            self.kinds.add("f")
+            self.valid_count += int((~na).sum())
+        else:
+            self.kinds.add("b" if pd.api.types.infer_dtype(column, skipna=True) == "boolean" else "O")
+            self.valid_count += int((~na & (values != "--")).sum())
+
+    @property
+    def dtype(self) -> str:
+        """전체 값을 한 번에 읽었을 때의 dtype"""
+        if not self.kinds:
+            return OBJECT_DTYPE if self.none_count > 0 else "float64"
+        if self.kinds == {"i"}:
+            return "float64" if self.has_na else "int64"
+        if self.kinds <= {"i", "f"}:
+            return "float64"
+        if self.kinds == {"b"}:
+            return OBJECT_DTYPE if self.has_na else "bool"
+        return OBJECT_DTYPE
+
+    @property
+    def value_count(self) -> int:
+        """drop_na_columns, extract_features_batch 에서 유효한 값의 수"""
+        if self.dtype == OBJECT_DTYPE:
+            return self.valid_count + self.none_count
+        return self.valid_count
+
+
+class TableSchema:
+    def __init__(self, columns: dict[str, ColumnSchema], row_count: int):
+        self.columns = columns
+        self.row_count = row_count
+
+
+def iter_raw_chunks(table_path: str, schema: Optional[TableSchema] = None) -> Iterator[dict[str, pd.Series]]:
+    """PROFILE_CHUNK_ROWS row 씩 column 별 값을 반환
+
+    Args:
+        table_path: csv, json 또는 jsonl 파일
+        schema: 주어지면 전체 값을 한 번에 읽었을 때의 dtype 으로 변환하여 반환
+    """
+    if table_path.endswith(".csv"):
+        yield from _iter_csv_chunks(table_path, schema)
+    elif table_path.endswith((".json", ".jsonl")):
+        yield from _iter_json_chunks(table_path, schema)
+    else:
+        raise Exception(f"[Path: {table_path}] must end with .csv or .json or .jsonl")
+
+
+def _iter_csv_chunks(table_path: str, schema: Optional[TableSchema]) -> Iterator[dict[str, pd.Series]]:
+    dtype = None
+    bool_objects = set()
+    if schema is not None:
+        dtype = {}
+        for column, column_schema in schema.columns.items():
+            if column_schema.dtype == OBJECT_DTYPE and column_schema.kinds == {"b"}:
+                # NaN 이 섞인 True, False column 은 bool object 로 읽힘
+                bool_objects.add(column)
+            elif column_schema.dtype == OBJECT_DTYPE:
+                # chunk 에 따라 숫자로 읽히지 않도록 원본 문자열 그대로 읽음
+                dtype[column] = str
+            elif column_schema.dtype == "float64":
+                dtype[column] = "float64"
+
+    with pd.read_csv(table_path, chunksize=settings.PROFILE_CHUNK_ROWS, dtype=dtype) as chunks:
+        for chunk in chunks:
+            yield {column: chunk[column].astype(object) if column in bool_objects else chunk[column]
+                   for column in chunk.columns}
+
+
+def _iter_json_chunks(table_path: str, schema: Optional[TableSchema]) -> Iterator[dict[str, pd.Series]]:
+    """csv_from_json, csv_from_jsonl 과 같은 column 이름으로 record chunk 를 flatten"""
+    for key_values in iter_flattened_chunks(table_path, settings.PROFILE_CHUNK_ROWS):
+        if schema is None:
+            yield {column: pd.Series(values) for column, values in key_values.items()}
+        else:
+            yield {column: pd.Series(values, dtype=schema.columns[column].dtype)
+                   for column, values in key_values.items() if column in schema.columns}
+
+
+def scan_schema(table_path: str) -> TableSchema:
+    """1st pass, column 별 dtype 과 유효한 값의 수 확인"""
+    columns: dict[str, ColumnSchema] = {}
+    csv_rows = 0
+    for chunk in iter_raw_chunks(table_path):
+        for column, values in chunk.items():
+            columns.setdefault(column, ColumnSchema()).update(values)
+        csv_rows += len(next(iter(chunk.values()))) if chunk else 0
+
+    if table_path.endswith((".json", ".jsonl")):
+        # csv_from_jsonl 은 값이 하나 이하인 key 를 제외하고, csv_from_json(l) 의 짧은 column 은 NaN 으로 채워짐
+        if table_path.endswith(".jsonl"):
+            columns = {column: schema for column, schema in columns.items() if schema.size > 1}
+        row_count = max((schema.size for schema in columns.values()), default=0)
+        for schema in columns.values():
+            schema.has_na |= schema.size < row_count
+    else:
+        row_count = csv_rows
+
+    return TableSchema(columns, row_count)
+
+
+def remaining_columns(schema: TableSchema) -> list[str]:
+    """data_preprocessor.drop_na_columns 와 같은 기준으로 남는 column"""
+    columns = [column for column, column_schema in schema.columns.items()
+               if column_schema.value_count > 1 and "Unnamed:" not in column]
+
+    remove_columns = list(set(schema.columns) - set(columns))
+    if len(remove_columns) > 0:
+        logging.info(f"Removed columns: {remove_columns}")
+
+    return columns
+
+
+class NativeColumnProfiler:
+    """numpy int, float, bool dtype column, self_features.extract_native_numeric_features 와 같은 features"""
+
+    def __init__(self):
+        self.numeric = RunningStats()
+        self.lengths = RunningStats()
+
+    def update(self, column: pd.Series):
+        values = column.to_numpy()[column.notna().to_numpy()]
+        self.numeric.update(extract_float_numeric(values.astype(np.float64)))
+        self.lengths.update(native_lengths(values))
+
+    def data_type(self) -> DataTypes:
+        return DataTypes.STRICT_NUMERIC
+
+    def non_embedding_features(self) -> np.ndarray:
+        return np.concatenate((
+            get_datatype_feature(DataTypes.STRICT_NUMERIC),  # 4 cols
+            self.numeric.features(),  # 6 cols
+            self.lengths.features(),  # 6 cols
+            get_character_feature([], DataTypes.STRICT_NUMERIC),  # 8 cols
+        ))
+
+    def is_exact(self) -> bool:
+        """non_embedding_features 가 in-memory 계산과 같은지 (unique 값 비율을 추정하지 않았는지)"""
+        return self.numeric.is_exact() and self.lengths.is_exact()
+
+    def embedding_samples(self) -> Optional[list[any]]:
+        return None
+
+
+class ObjectColumnProfiler:
+    """object dtype column, self_features.extract_features_batch 와 같은 features"""
+
+    def __init__(self, valid_count: int, rng: np.random.Generator):
+        self.counters = [
+            TypeCounter(DataTypes.URL, Constants.URL_RATIO, count_url, valid_count),
+            TypeCounter(DataTypes.DATE, Constants.DATE_RATIO, count_date, valid_count, max_count_per_value=2),
+            TypeCounter(DataTypes.STRICT_NUMERIC, Constants.STRICT_NUMERIC_RATIO, count_strict_numeric, valid_count),
+            TypeCounter(DataTypes.MAINLY_NUMERIC, Constants.MAINLY_NUMERIC_RATIO, count_mainly_numeric, valid_count),
+        ]
+        # chunk 별 pd.api.types.infer_dtype 결과
+        self.inferred_dtypes: set[str] = set()
+
+        self.lengths = RunningStats()
+        # extract_numeric 은 모든 값이 float() 로 변환되는 경우와 아닌 경우의 결과가 다름
+        self.float_numeric: Optional[RunningStats] = RunningStats()
+        self.raw_numeric: Optional[RunningStats] = RunningStats()
+        self.characters: Optional[list[RunningStats]] = [RunningStats(track_unique=False) for _ in range(4)]
+        self.errors: dict[str, Exception] = {}
+
+        if valid_count >= EMBEDDING_SAMPLE_SIZE:
+            self.sample_positions = np.sort(rng.choice(valid_count, size=EMBEDDING_SAMPLE_SIZE, replace=False))
+        else:
+            self.sample_positions = np.arange(valid_count)
+        self.samples: list[any] = []
+        self.seen = 0
+
+    def update(self, column: pd.Series):
+        # Drop outlier columns
+        values = [d for d in column if d == d and d != "--"]
+        if not values:
+            return
+
+        self.inferred_dtypes.add(pd.api.types.infer_dtype(values, skipna=False))
+
+        for i, counter in enumerate(self.counters):
+            # 앞의 data type 으로 정해지면 이후 data type 은 확인하지 않음
+            if any(previous.result for previous in self.counters[:i]):
+                break
+            counter.update(values)
+
+        possible_types = self.possible_types()
+        if DataTypes.STRICT_NUMERIC in possible_types or DataTypes.MAINLY_NUMERIC in possible_types:
+            self._update_numeric(values)
+        else:
+            self.float_numeric = self.raw_numeric = None
+
+        if DataTypes.STRING in possible_types or DataTypes.MAINLY_NUMERIC in possible_types:
+            self._update_characters(values)
+        else:
+            self.characters = None
+
+        self.lengths.update(np.fromiter((len(str(d)) for d in values), dtype=np.int64, count=len(values)))
+
+        positions = self.sample_positions[(self.sample_positions >= self.seen)
+                                          & (self.sample_positions < self.seen + len(values))]
+        self.samples.extend(values[position - self.seen] for position in positions)
+        self.seen += len(values)
+
+    def _update_numeric(self, values: list[any]):
+        if "numeric" in self.errors:
+            return
+        try:
+            if self.float_numeric is not None:
+                try:
+                    floats = np.array([float(d) for d in values], dtype=np.float64)
+                except ValueError as _:
+                    self.float_numeric = None
+                else:
+                    self.float_numeric.update(extract_float_numeric(floats))
+            self.raw_numeric.update(np.asarray(extract_numeric_parts(values), dtype=np.float64))
+        except Exception as e:
+            self.errors["numeric"] = e
+
+    def _update_characters(self, values: list[any]):
+        if "characters" in self.errors:
+            return
+        try:
+            for stats, ratios in zip(self.characters, character_ratios(values)):
+                stats.update(ratios)
+        except Exception as e:
+            self.errors["characters"] = e
+
+    def is_native_numeric(self) -> bool:
+        """모든 값이 int, float, bool 인지 (classify_data_type 의 infer_dtype 확인과 동일)"""
+        if not self.inferred_dtypes <= NATIVE_NUMERIC_DTYPES:
+            return False
+        return self.inferred_dtypes == {"boolean"} or "boolean" not in self.inferred_dtypes
+
+    def possible_types(self) -> set[DataTypes]:
+        """지금까지 누적한 값으로 아직 가능한 data type"""
+        possible = set()
+        for counter in self.counters:
+            if counter.result is not False:
+                possible.add(counter.data_type)
+            if counter.result:
+                return possible
+        possible.add(DataTypes.STRING)
+        return possible
+
+    def data_type(self) -> DataTypes:
+        """classify_data_type 과 같은 순서로 data type 결정"""
+        if self.is_native_numeric():
+            return DataTypes.STRICT_NUMERIC
+        for counter in self.counters:
+            if counter.reaches_ratio():
+                return counter.data_type
+        return DataTypes.STRING
+
+    def non_embedding_features(self) -> np.ndarray:
+        data_type = self.data_type()
+
+        if data_type == DataTypes.MAINLY_NUMERIC or data_type == DataTypes.STRICT_NUMERIC:
+            if "numeric" in self.errors:
+                raise self.errors["numeric"]
+            numeric_features = self.numeric_stats().features()
+        else:
+            numeric_features = get_data_numeric_feature([], data_type)
+
+        if data_type == DataTypes.STRING or data_type == DataTypes.MAINLY_NUMERIC:
+            if "characters" in self.errors:
+                raise self.errors["characters"]
+            means = [stats.mean for stats in self.characters]
+            cvs = [stats.variance / stats.mean for stats in self.characters]
+            character_features = np.array(means + cvs)
+        else:
+            character_features = get_character_feature([], data_type)
+
+        return np.concatenate((
+            get_datatype_feature(data_type),  # 4 cols
+            numeric_features,  # 6 cols
+            self.lengths.features(),  # 6 cols
+            character_features,  # 8 cols
+        ))
+
+    def numeric_stats(self) -> RunningStats:
+        return self.float_numeric if self.float_numeric is not None else self.raw_numeric
+
+    def is_exact(self) -> bool:
+        """non_embedding_features 가 in-memory 계산과 같은지 (unique 값 비율을 추정하지 않았는지)"""
+        data_type = self.data_type()
+        if data_type == DataTypes.MAINLY_NUMERIC or data_type == DataTypes.STRICT_NUMERIC:
+            if "numeric" not in self.errors and not self.numeric_stats().is_exact():
+                return False
+        return self.lengths.is_exact()
+
+    def embedding_samples(self) -> Optional[list[any]]:
+        data_type = self.data_type()
+        if data_type == DataTypes.STRING or data_type == DataTypes.MAINLY_NUMERIC:
+            return self.samples
+        return None
+
+
+class ColumnCacheKey:
+    """FeatureCache.make_key 와 같은 key 를 chunk 단위로 계산"""
+
+    def __init__(self, version: str, dtype: str):
+        self.dtype = dtype
+        self._hash: Optional[hashlib.blake2b] = hashlib.blake2b(digest_size=20)
+        self._hash.update(version.encode("utf-8"))
+        self._hash.update(dtype.encode("utf-8"))
+
+    def update(self, column: pd.Series):
+        if self._hash is None:
+            return
+        try:
+            self._hash.update(pd.util.hash_pandas_object(column, index=False).to_numpy().tobytes())
+        except TypeError:
+            # hash 불가능한 값이 섞인 경우 FeatureCache.make_key 는 전체 값의 repr 을 사용하므로 캐시하지 않음
+            self._hash = None
+
+    def pad(self, count: int):
+        """jsonl 의 짧은 column 은 DataFrame 생성 시 NaN 으로 채워짐"""
+        for start in range(0, count, settings.PROFILE_CHUNK_ROWS):
+            size = min(settings.PROFILE_CHUNK_ROWS, count - start)
+            self.update(pd.Series([np.nan] * size, dtype=self.dtype))
+
+    def hexdigest(self) -> Optional[str]:
+        return self._hash.hexdigest() if self._hash is not None else None
+
+
+def stream_self_features(table_path: str) -> tuple[list[str], np.ndarray, int]:
+    """chunk 단위로 읽으며 drop_na_columns 이후 남는 column 들의 self features 계산
+
+    Returns:
+        columns: 남은 column 이름
+        features: (len(columns), 792) self features
+        row_count: 테이블의 row 수
+    """
+    schema = scan_schema(table_path)
+    columns = remaining_columns(schema)
+
+    if len(columns) == 0:
+        raise ValueError(f"No features extracted. Check your table: {table_path}.")
+
+    rng = np.random.default_rng(settings.PROFILE_SAMPLE_SEED)
+    profilers: dict[str, NativeColumnProfiler | ObjectColumnProfiler] = {}
+    cache_keys: dict[str, ColumnCacheKey] = {}
+    for column in columns:
+        column_schema = schema.columns[column]
+        if column_schema.dtype == OBJECT_DTYPE:
+            profilers[column] = ObjectColumnProfiler(column_schema.value_count, rng)
+        else:
+            profilers[column] = NativeColumnProfiler()
+        if FeatureCache.enabled():
+            cache_keys[column] = ColumnCacheKey(feature_cache_version(), column_schema.dtype)
+
+    for chunk in iter_raw_chunks(table_path, schema):
+        for column, profiler in profilers.items():
+            if column not in chunk:
+                continue
+            profiler.update(chunk[column])
+            if column in cache_keys:
+                cache_keys[column].update(chunk[column])
+
+    # 캐시에 없는 column 들만 계산, deep embedding 은 한 번에 batch encoding
+    feature_array: list[Optional[np.ndarray]] = [None] * len(columns)
+    keys: list[Optional[str]] = [None] * len(columns)
+    for i, column in enumerate(columns):
+        if column in cache_keys:
+            cache_keys[column].pad(schema.row_count - schema.columns[column].size)
+            keys[i] = cache_keys[column].hexdigest()
+        if keys[i] is not None:
+            feature_array[i] = FeatureCache.get(keys[i])
+
+    missing = [i for i, feature in enumerate(feature_array) if feature is None]
+    non_embedding_features = [profilers[columns[i]].non_embedding_features() for i in missing]
+    embedding_samples = [profilers[columns[i]].embedding_samples() for i in missing]
+
+    embeddings = iter(deep_embedding_batch([samples for samples in embedding_samples if samples is not None]))
+    for i, non_embedding_feature, samples in zip(missing, non_embedding_features, embedding_samples):
+        if samples is not None:
+            deep_embedding_feature = next(embeddings)
+        else:
+            deep_embedding_feature = np.array([Constants.DEEP_FEATURE_INVALID_VALUE]
+                                              * Constants.DEEP_EMBEDDING_FEATURES_DIMENSION)
+        feature_array[i] = np.concatenate((non_embedding_feature, deep_embedding_feature))
+        # key 는 in-memory 계산과 같으므로, unique 값 비율을 추정한 features 는 저장하지 않음
+        if keys[i] is not None and profilers[columns[i]].is_exact():
+            FeatureCache.put(keys[i], feature_array[i])
+
+    features = np.vstack(feature_array)
+    logging.info(f"schema_matching|streaming profiled {table_path}: {schema.row_count} rows, {features.shape}")
+
+    return columns, features, schema.row_count
+
+
+def stream_table_profile(table_path: str) -> TableProfile:
+    """테이블 전체를 메모리에 올리지 않고 TableProfile 생성"""
+    columns, features, row_count = stream_self_features(table_path)
+    return build_table_profile(columns, features, row_count)
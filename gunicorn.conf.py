@@ -4,6 +4,8 @@
 import json
 import multiprocessing
 
+from app.config import settings
+
 # 해당값 수정하여 Gunicorn 설정 적용
 host = "0.0.0.0"
 port = "8000"
@@ -27,11 +29,27 @@ workers_per_core = float(workers_per_core_str)
 # web_concurrency = max(int(default_web_concurrency), 2)
 use_max_workers = int(max_workers_str)
 workers = web_concurrency
+# PRELOAD_MODELS=True 이면 master 에서 app 과 model 을 로드한 뒤 fork, worker 간 model 메모리 공유
+preload_app = settings.PRELOAD_MODELS
+
+
+def on_starting(server):
+    # preload_app 인 경우 app import 이후, worker fork 이전에 master 에서 실행됨
+    if server.cfg.preload_app:
+        from app.src.correlations.preload import preload_models
+        preload_models()
+
+
+def post_fork(server, worker):
+    from app.src.correlations.preload import after_fork
+    after_fork()
+
 
 # For debugging and testing
 log_data = {
     "loglevel": loglevel,
     "workers": workers,
+    "preload_app": preload_app,
     "bind": bind,
     "graceful_timeout": graceful_timeout,
     "timeout": timeout,
@@ -0,0 +1,39 @@
+"""correlations 단위테스트에서 공유하는 TableProfile 생성 fixture"""
+import numpy as np
+import pytest
+
+from app.src.correlations.pair_blocking import LENGTH_MEAN_INDEX
+from app.src.correlations.relation_features import TableProfile
+from app.src.correlations.self_features import Constants, DataTypes, get_datatype_feature
+
+
+def build_random_profile(columns: list[str], seed: int = 200) -> TableProfile:
+    """임의의 self features, column name embedding 으로 생성, 3 개 column 마다 하나는 값 embedding 이 없음"""
+    rng = np.random.default_rng(seed)
+    features = rng.random((len(columns), 792))
+    features[:, :4] = np.eye(4)[rng.integers(0, 4, len(columns))]
+    features[::3, -Constants.DEEP_EMBEDDING_FEATURES_DIMENSION:] = Constants.DEEP_FEATURE_INVALID_VALUE
+    return TableProfile(columns, [c.lower() for c in columns], features,
+                        rng.normal(size=(len(columns), 768)).astype(np.float32), row_count=100)
+
+
+def build_typed_profile(columns: list[tuple[str, DataTypes, tuple[float, float, float]]]) -> TableProfile:
+    """(column 이름, data type, (평균, 최소, 최대 길이)) 로 self features 생성"""
+    features = np.zeros((len(columns), 792))
+    for i, (_, data_type, lengths) in enumerate(columns):
+        features[i, :4] = get_datatype_feature(data_type)
+        features[i, LENGTH_MEAN_INDEX:LENGTH_MEAN_INDEX + 3] = lengths
+        if data_type not in (DataTypes.STRING, DataTypes.MAINLY_NUMERIC):
+            features[i, -Constants.DEEP_EMBEDDING_FEATURES_DIMENSION:] = Constants.DEEP_FEATURE_INVALID_VALUE
+    names = [name for name, _, _ in columns]
+    return TableProfile(names, names, features, np.ones((len(columns), 768), dtype=np.float32))
+
+
+@pytest.fixture
+def random_profile():
+    return build_random_profile
+
+
+@pytest.fixture
+def make_profile():
+    return build_typed_profile
@@ -0,0 +1,31 @@
+import numpy as np
+
+from app.src.correlations.candidate_index import ColumnVectorIndex, candidate_pairs
+from app.src.correlations.relation_features import create_feature_matrix_from_profiles
+
+
+def test_top_k_selects_highest_scores(random_profile):
+    l_profile = random_profile([f"l_{i}" for i in range(9)], seed=100)
+    r_profile = random_profile([f"r_{i}" for i in range(13)], seed=200)
+    index = ColumnVectorIndex(r_profile)
+    scores = index.scores(l_profile)
+
+    candidates = index.top_k(l_profile, 4)
+    assert (candidates.sum(axis=1) == 4).all()
+    for row_scores, row_candidates in zip(scores, candidates):
+        assert row_scores[row_candidates].min() >= row_scores[~row_candidates].max()
+
+    # 값 embedding 이 없으면 column name 유사도만 사용
+    name_scores = ColumnVectorIndex(l_profile).name_vectors @ index.name_vectors.T
+    assert np.allclose(scores[0], name_scores[0])
+    assert candidate_pairs(l_profile, r_profile, 0) is None
+    assert candidate_pairs(l_profile, r_profile, 13) is None
+
+
+def test_candidate_features_same_as_full_grid(random_profile):
+    l_profile = random_profile(["ID", "Title", "Year", "Director"], seed=100)
+    r_profile = random_profile(["id", "name", "year", "writer", "title"], seed=200)
+
+    pairs = candidate_pairs(l_profile, r_profile, 2)
+    full = create_feature_matrix_from_profiles(l_profile, r_profile)
+    assert np.array_equal(create_feature_matrix_from_profiles(l_profile, r_profile, pairs), full[pairs.reshape(-1)])
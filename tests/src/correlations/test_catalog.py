@@ -0,0 +1,62 @@
+import os
+import shutil
+
+import numpy as np
+
+from app.src.correlations.catalog import ProfileCatalog
+
+
+def test_registered_profile_is_loaded_without_table(tmp_path, random_profile):
+    catalog = ProfileCatalog(str(tmp_path))
+    profile = random_profile(["ID", "Title", "Year"])
+    table = catalog.register("movies", "movies.csv", profile, sample_rows=100)
+    assert table["columns"] == profile.columns
+    assert table["data_types"] == [("url", "numeric", "date", "string")[i] for i in profile.features[:, :4].argmax(1)]
+
+    loaded_table, loaded = catalog.load("movies")
+    assert loaded_table == table
+    assert isinstance(loaded.features, np.memmap)
+    assert np.array_equal(loaded.features, profile.features)
+    assert np.array_equal(loaded.col_name_embeddings, profile.col_name_embeddings)
+    assert (loaded.columns, loaded.col_names, loaded.row_count) == (profile.columns, profile.col_names, 100)
+
+
+def test_register_again_replaces_profile(tmp_path, random_profile):
+    catalog = ProfileCatalog(str(tmp_path))
+    catalog.register("movies", "movies.csv", random_profile(["ID", "Title"]))
+    catalog.register("movies", "movies.parquet", random_profile(["ID", "Title", "Year"], seed=100))
+    catalog.register("books", "books.csv", random_profile(["ISBN"]))
+
+    assert [table["table_id"] for table in catalog.list()] == ["movies", "books"]
+    assert catalog.load("movies")[1].columns == ["ID", "Title", "Year"]
+    assert len(os.listdir(tmp_path / "profiles")) == 2
+
+    assert catalog.delete("movies")
+    assert not catalog.delete("movies")
+    assert catalog.load("movies") is None
+    assert len(os.listdir(tmp_path / "profiles")) == 1
+
+
+def test_missing_profile_files_are_not_retried(tmp_path, random_profile):
+    catalog = ProfileCatalog(str(tmp_path))
+    catalog.register("movies", "movies.csv", random_profile(["ID", "Title"]))
+    shutil.rmtree(tmp_path / "profiles")
+    assert catalog.get("movies") is not None
+    assert catalog.load("movies") is None
+
+
+def test_profile_replaced_while_loading_is_retried(tmp_path, monkeypatch, random_profile):
+    catalog = ProfileCatalog(str(tmp_path))
+    catalog.register("movies", "movies.csv", random_profile(["ID", "Title"]))
+    np_load = np.load
+    replaced = []
+
+    def load_after_replace(file, *args, **kwargs):
+        # 첫 조회 직후 다른 worker 가 재등록하여 이전 profile 이 삭제된 경우
+        if not replaced:
+            replaced.append(True)
+            catalog.register("movies", "movies.csv", random_profile(["ID", "Title", "Year"], seed=100))
+        return np_load(file, *args, **kwargs)
+
+    monkeypatch.setattr(np, "load", load_after_replace)
+    assert catalog.load("movies")[1].columns == ["ID", "Title", "Year"]
@@ -0,0 +1,44 @@
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.src.correlations.data_preprocessor import drop_na_columns, read_table
+
+feather = pytest.importorskip("pyarrow.feather", reason="poetry install --extras columnar 필요", exc_type=ImportError)
+
+
+def write_table(path: str, rows: int = 300) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "id": range(rows),
+        "price": [i * 1.5 if i % 7 else None for i in range(rows)],
+        "name": [f"name {i}" if i % 5 else None for i in range(rows)],
+        "one": [1.0] + [None] * (rows - 1),
+        "dashes": ["--" if i > 1 else "x" for i in range(rows)],
+        "Unnamed: 5": range(rows),
+    })
+    df.to_csv(path, index=False)
+    return pd.read_csv(path)
+
+
+@pytest.mark.parametrize("extension", [".parquet", ".feather", ".arrow"])
+def test_read_columnar_same_as_csv(tmp_path, monkeypatch, extension):
+    monkeypatch.setattr(settings, "PROFILE_CHUNK_ROWS", 37)
+    csv_path = str(tmp_path / "table.csv")
+    df = write_table(csv_path)
+
+    path = str(tmp_path / f"table{extension}")
+    if extension == ".parquet":
+        df.to_parquet(path, row_group_size=50, index=False)
+    else:
+        feather.write_feather(df, path, chunksize=40)
+
+    expected = drop_na_columns(read_table(csv_path))
+    pd.testing.assert_frame_equal(drop_na_columns(read_table(path, skip_na_columns=True)), expected)
+
+    # 같은 row 를 sampling
+    expected = drop_na_columns(read_table(csv_path, sample_rows=30))
+    pd.testing.assert_frame_equal(drop_na_columns(read_table(path, sample_rows=30, skip_na_columns=True)), expected)
+
+    # 제거될 column 은 읽지 않음
+    assert list(read_table(path, skip_na_columns=True).columns) == ["id", "price", "name", "dashes"]
+    assert len(read_table(path, max_rows=120)) == 120
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.src.correlations.data_preprocessor import read_table, reservoir_sample
+
+
+def chunked(df: pd.DataFrame, size: int) -> list[pd.DataFrame]:
+    return [df.iloc[i:i + size] for i in range(0, len(df), size)]
+
+
+def test_reservoir_sample_keeps_order_and_is_reproducible():
+    df = pd.DataFrame({"id": np.arange(1000), "name": [f"row{i}" for i in range(1000)]})
+
+    sample = reservoir_sample(chunked(df, 64), 100, seed=200)
+    assert len(sample) == 100
+    assert sample["id"].is_monotonic_increasing
+    assert sample["id"].is_unique
+    assert (sample["name"] == "row" + sample["id"].astype(str)).all()
+
+    again = reservoir_sample(chunked(df, 64), 100, seed=200)
+    assert sample["id"].tolist() == again["id"].tolist()
+
+
+def test_reservoir_sample_smaller_than_sample_rows():
+    df = pd.DataFrame({"id": np.arange(10)})
+
+    assert reservoir_sample(chunked(df, 3), 100, seed=200)["id"].tolist() == list(range(10))
+    assert reservoir_sample([], 100, seed=200).empty
+
+
+def test_reservoir_sample_is_uniform():
+    df = pd.DataFrame({"id": np.arange(50)})
+
+    counts = np.zeros(50)
+    for seed in range(400):
+        counts[reservoir_sample(chunked(df, 7), 10, seed=seed)["id"].to_numpy()] += 1
+    # 각 row 의 포함 확률 10 / 50
+    assert np.abs(counts / 400 - 0.2).max() < 0.1
+
+
+def test_sampled_csv_has_same_dtypes_as_full_read(tmp_path, monkeypatch):
+    # 앞쪽 chunk 는 숫자, 뒤쪽 chunk 는 문자열인 column
+    path = tmp_path / "table.csv"
+    pd.DataFrame({"code": [str(i) for i in range(200)] + [f"A{i}" for i in range(100)],
+                  "score": np.arange(300) / 4,
+                  "count": np.arange(300)}).to_csv(path, index=False)
+    monkeypatch.setattr(settings, "PROFILE_CHUNK_ROWS", 50)
+
+    full = read_table(str(path))
+    sample = read_table(str(path), sample_rows=100)
+    assert len(sample) == 100
+    assert sample.dtypes.to_dict() == full.dtypes.to_dict()
+    assert {type(x) for x in sample["code"]} == {str}
+    assert sample["count"].is_monotonic_increasing
+    assert (sample["score"] == sample["count"] / 4).all()
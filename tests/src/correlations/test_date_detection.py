@@ -0,0 +1,47 @@
+import random
+import warnings
+
+from dateutil.parser import parse as parse_date
+
+from app.src.correlations.date_detection import MAX_YEAR, MIN_YEAR, could_be_date, count_dates
+
+
+def dateutil_count(strings: list[str]) -> int:
+    cnt = 0
+    for data in strings:
+        try:
+            year = parse_date(data).year
+        except Exception as _:
+            continue
+        if MIN_YEAR <= year <= MAX_YEAR:
+            cnt += 1
+    return cnt
+
+
+def random_values(count: int, seed: int = 200) -> list[str]:
+    rng = random.Random(seed)
+    tokens = ["2020", "1999", "2031", "12", "31", "01", "13", "02", "-", "/", ".", ":", " ", "T",
+              "Jan", "of", "title", "PM", "Mon", "年", "nan", "UTC", "20200101"]
+    return ["".join(rng.choice(tokens) for _ in range(rng.randint(1, 6))) for _ in range(count)]
+
+
+def test_could_be_date_never_rejects_parsable_values():
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for data in random_values(3000):
+            if not could_be_date(data):
+                try:
+                    parse_date(data)
+                except Exception as _:
+                    continue
+                raise AssertionError(f"{data!r} is parsable")
+
+
+def test_count_dates_same_as_dateutil():
+    formatted = [f"{y}-{m:02d}-{d:02d}" for y in (1999, 2020, 2031) for m in (1, 2, 13) for d in (1, 29, 31)]
+    formatted += [f"{m:02d}/{d:02d}/{y}" for y in (1999, 2020) for m in (1, 12, 13) for d in (1, 13, 31)]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for strings in (formatted, random_values(500, seed=100), formatted + random_values(200, seed=300)):
+            assert count_dates(strings) == dateutil_count(strings)
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from app.src.correlations.embedding_backend import EmbeddingBackend, embedding_version, pool_tokens
+from app.src.correlations.model import SentenceTransformer, ColumnNameEmbeddingCache
+from app.src.correlations.self_features import feature_cache_version
+
+
+class SmallBackend(EmbeddingBackend):
+    """문자 code 로 만든 4 차원 embedding"""
+
+    def __init__(self):
+        super().__init__("sentence_transformers", "small-model")
+
+    def _encode(self, sentences: list[str], batch_size: int) -> np.ndarray:
+        return np.array([[len(s), ord(s[0]), ord(s[-1]), 1.0] for s in sentences])
+
+
+def test_small_embeddings_are_padded():
+    sentences = ["id", "title", "year"]
+    embeddings = SmallBackend().encode(sentences)
+    small = SmallBackend()._encode(sentences, 32)
+
+    assert embeddings.shape == (3, 768)
+    assert not embeddings[:, 4:].any()
+    # cosine similarity 는 padding 전과 같음
+    assert np.allclose(embeddings @ embeddings.T, small @ small.T)
+    assert SmallBackend().encode([]).shape == (0, 768)
+
+
+def test_backend_changes_feature_version(monkeypatch):
+    monkeypatch.setattr(SentenceTransformer, "_instance", None)
+    default_version = feature_cache_version()
+    assert default_version.endswith(embedding_version("sentence_transformers", "paraphrase-multilingual-mpnet-base-v2"))
+
+    SentenceTransformer.use(SmallBackend())
+    assert feature_cache_version() != default_version
+    assert np.array_equal(ColumnNameEmbeddingCache.encode(["id"])[0, :4], [2, ord("i"), ord("d"), 1])
+    assert embedding_version("onnx", "./mpnet") == "./mpnet:onnx"
+    ColumnNameEmbeddingCache.clear()
+
+
+def test_embedding_backend_requires_encode():
+    with pytest.raises(TypeError):
+        EmbeddingBackend("sentence_transformers", "no-encode")
+
+
+TOKEN_EMBEDDINGS = np.array([[[1, 2], [3, 4], [100, 100]],
+                             [[0, 3], [9, 9], [6, 6]],
+                             [[7, 7], [8, 8], [9, 9]]], dtype=np.float32)
+# 첫 문장의 마지막 token 은 padding, 마지막 문장은 모두 padding
+ATTENTION_MASK = np.array([[1, 1, 0], [1, 1, 1], [0, 0, 0]])
+
+
+def test_mean_pooling_ignores_padding():
+    pooled = pool_tokens(TOKEN_EMBEDDINGS, ATTENTION_MASK, {"pooling": "mean"})
+    assert np.allclose(pooled, [[2, 3], [5, 6], [0, 0]])
+
+    normalized = pool_tokens(TOKEN_EMBEDDINGS, ATTENTION_MASK, {"pooling": "mean", "normalize": True})
+    assert np.allclose(normalized, [[2 / np.sqrt(13), 3 / np.sqrt(13)], [5 / np.sqrt(61), 6 / np.sqrt(61)], [0, 0]])
+
+
+def test_cls_pooling_uses_first_token():
+    pooled = pool_tokens(TOKEN_EMBEDDINGS, ATTENTION_MASK, {"pooling": "cls", "normalize": False})
+    assert np.allclose(pooled, [[1, 2], [0, 3], [7, 7]])
+
+    normalized = pool_tokens(TOKEN_EMBEDDINGS, ATTENTION_MASK, {"pooling": "cls", "normalize": True})
+    assert np.allclose(normalized, [[1 / np.sqrt(5), 2 / np.sqrt(5)], [0, 1], [1 / np.sqrt(2), 1 / np.sqrt(2)]])
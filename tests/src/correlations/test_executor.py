@@ -0,0 +1,37 @@
+import asyncio
+
+import numpy as np
+import xgboost as xgb
+
+from app.config import settings
+from app.src.correlations.executor import MatchingExecutor
+
+
+def train_booster(nthread: int) -> xgb.Booster:
+    rng = np.random.default_rng(200)
+    features = rng.random((2000, 20))
+    dtrain = xgb.DMatrix(features, label=(features[:, 0] > 0.5).astype(int))
+    return xgb.train({"objective": "binary:logistic", "nthread": nthread}, dtrain, num_boost_round=10)
+
+
+def predict_in_worker() -> int:
+    bst = train_booster(nthread=4)
+    return len(bst.predict(xgb.DMatrix(np.ones((100, 20)))))
+
+
+def test_process_executor_after_multithreaded_predict(monkeypatch):
+    # 부모 process 에서 OpenMP thread 를 실행한 뒤에도 process executor 의 predict 가 멈추지 않아야 함
+    bst = train_booster(nthread=4)
+    bst.predict(xgb.DMatrix(np.ones((100, 20))))
+
+    monkeypatch.setattr(settings, "MATCHING_EXECUTOR", "process")
+    monkeypatch.setattr(MatchingExecutor, "_executor", None)
+    executor = MatchingExecutor.get()
+    try:
+        assert asyncio.run(asyncio.wait_for(MatchingExecutor.run(predict_in_worker), timeout=60)) == 100
+        assert MatchingExecutor._pending == 0
+    finally:
+        # 멈춘 worker process 가 남으면 pytest 종료도 멈추므로 종료시킴
+        for process in list(executor._processes.values()):
+            process.terminate()
+        MatchingExecutor.shutdown()
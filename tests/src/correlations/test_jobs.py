@@ -0,0 +1,97 @@
+import threading
+
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.exceptions.service import JobNotFinishedError, JobNotFoundError
+from app.main import app
+from app.src.correlations.enums import JobStatus, MatchingStage
+from app.src.correlations.jobs import JobRunner, JobStore
+from tests.check_common_conditions import check_failed_common_conditions
+
+client = TestClient(app)
+
+
+def test_claim_oldest_pending_job(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    first = store.create("schema_matching", {"l_table": "a"})
+    second = store.create("schema_matching", {"l_table": "b"})
+
+    assert store.claim("worker-1") == (first["job_id"], "schema_matching", {"l_table": "a"})
+    assert store.claim("worker-2") == (second["job_id"], "schema_matching", {"l_table": "b"})
+    assert store.claim("worker-3") is None
+
+    job = store.get(first["job_id"])
+    assert (job["status"], job["attempts"]) == (JobStatus.RUNNING, 1)
+
+
+def test_concurrent_claims_take_each_job_once(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_ids = {store.create("schema_matching", {"i": i})["job_id"] for i in range(20)}
+    claimed, lock = [], threading.Lock()
+
+    def claim_all(owner: str):
+        while (job := store.claim(owner)) is not None:
+            with lock:
+                claimed.append(job[0])
+
+    threads = [threading.Thread(target=claim_all, args=(f"worker-{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(claimed) == sorted(job_ids)
+
+
+def test_stale_job_is_requeued_then_failed_after_max_attempts(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create("schema_matching", {})["job_id"]
+
+    store.claim("worker-1")
+    # heartbeat 가 갱신되는 동안에는 그대로 running
+    assert store.recover_stale(stale_seconds=60, max_attempts=2) == 0
+    # 음수면 모든 running job 의 heartbeat 가 기준보다 오래됨
+    assert store.recover_stale(stale_seconds=-1, max_attempts=2) == 1
+    assert store.get(job_id)["status"] == JobStatus.PENDING
+
+    store.claim("worker-2")
+    assert store.recover_stale(stale_seconds=-1, max_attempts=2) == 0
+    job = store.get(job_id)
+    assert (job["status"], job["attempts"]) == (JobStatus.FAILED, 2)
+
+
+def test_requeued_job_is_not_overwritten_by_previous_owner(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    job_id = store.create("schema_matching", {})["job_id"]
+
+    store.claim("worker-1")
+    store.recover_stale(stale_seconds=-1, max_attempts=3)
+    store.claim("worker-2")
+
+    assert not store.update_stage(job_id, "worker-1", MatchingStage.PREDICT, [])
+    assert not store.finish(job_id, "worker-1", {"result": "stale"})
+    assert not store.fail(job_id, "worker-1", "stale")
+    assert store.get(job_id)["status"] == JobStatus.RUNNING
+
+    assert store.finish(job_id, "worker-2", {"result": "fresh"})
+    assert store.get_result(job_id) == {"result": "fresh"}
+
+
+def test_job_result_endpoint(tmp_path, monkeypatch):
+    store = JobStore(str(tmp_path / "jobs.sqlite3"))
+    monkeypatch.setattr(JobRunner, "_store", store)
+    headers = {"x-token": settings.X_TOKEN}
+
+    response = client.get("/correlations/jobs/unknown/result", headers=headers)
+    check_failed_common_conditions(response, JobNotFoundError("unknown"))
+
+    job_id = store.create("schema_matching", {})["job_id"]
+    response = client.get(f"/correlations/jobs/{job_id}/result", headers=headers)
+    assert response.json()["code"] == JobNotFinishedError(store.get(job_id)).code
+
+    store.claim("worker-1")
+    store.finish(job_id, "worker-1", {"result": {"ID": {"ID": 0.9}}, "profiled_rows": {"a": 1, "b": 2}})
+    response = client.get(f"/correlations/jobs/{job_id}/result", headers=headers)
+    assert response.json()["code"] == int(f"{settings.SERVICE_CODE}200")
+    assert response.json()["result"] == {"ID": {"ID": 0.9}}
+    assert response.json()["profiled_rows"] == {"a": 1, "b": 2}
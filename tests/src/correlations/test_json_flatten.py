@@ -0,0 +1,66 @@
+import io
+import json
+import random
+from collections import defaultdict
+
+from app.src.correlations.data_preprocessor import csv_from_jsonl
+from app.src.correlations.json_flatten import JsonStreamReader, flatten_table, iter_json_items, iter_jsonl_items
+
+
+def recursive_find_all_keys_values(json_data: any, parent_key: str) -> defaultdict[any, list]:
+    """이전 data_preprocessor.find_all_keys_values 의 recursive 구현"""
+    key_values = defaultdict(list)
+    for key, value in json_data.items():
+        full_key = f"{parent_key}.{key}"
+        if isinstance(value, dict):
+            value = [value]
+
+        if isinstance(value, list):
+            for item in value:
+                if isinstance(item, dict):
+                    child_key_values = recursive_find_all_keys_values(item, key)
+                    for child_key, child_value in child_key_values.items():
+                        key_values[child_key].extend(child_value)
+                else:
+                    key_values[full_key].append(item)
+        else:
+            key_values[full_key].append(value)
+
+    return key_values
+
+
+def random_value(rng: random.Random, depth: int = 0) -> any:
+    r = rng.random()
+    if depth > 3 or r < 0.4:
+        return rng.choice([1, -2.5e-3, 12345678901234, 1e20, "s", "", "東京", None, True, False])
+    if r < 0.7:
+        return {rng.choice("abcde"): random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+    return [random_value(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+
+
+def test_flatten_json_same_as_recursive(monkeypatch):
+    rng = random.Random(200)
+    for _ in range(500):
+        document = json.dumps({rng.choice("xyzw"): random_value(rng) for _ in range(rng.randint(0, 5))},
+                              indent=rng.choice([None, 1]))
+        # 값이 block 경계에서 잘리는 경우
+        monkeypatch.setattr(JsonStreamReader, "BLOCK_SIZE", rng.choice([1, 3, 7, 64]))
+
+        key_values = flatten_table(iter_json_items(io.StringIO(document)), "")
+        expected = recursive_find_all_keys_values(json.loads(document), "")
+        assert list(key_values.items()) == list(expected.items())
+
+
+def test_flatten_jsonl_same_as_recursive(tmp_path):
+    rng = random.Random(200)
+    records = [random_value(rng) for _ in range(300)]
+    lines = "".join(json.dumps(record) + "\n" for record in records)
+
+    expected = recursive_find_all_keys_values({"TOPLEVEL": records}, "TOPLEVEL")
+    expected = {k.replace("TOPLEVEL.", ""): v for k, v in expected.items()}
+    assert flatten_table(iter_jsonl_items(io.StringIO(lines)), "TOPLEVEL") == expected
+
+    # max_rows 이후의 line 은 읽지 않음
+    path = tmp_path / "table.jsonl"
+    path.write_text(lines[:lines.index("\n", 3000) + 1] + "{broken\n", encoding="utf-8")
+    assert len(csv_from_jsonl(str(path), max_rows=lines[:3000].count("\n") + 1)) > 0
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from app.src.correlations import matching
+from app.src.correlations.endpoints import run_multi
+from app.src.correlations.enums import MultiMatchingOutput
+
+
+def fake_matching(monkeypatch) -> list[str]:
+    """테이블 path 를 profile 로 사용, l_column 과 r_column 이름이 같으면 매칭"""
+    profiled = []
+
+    def profile_table(table_path, sample_rows=None):
+        profiled.append(table_path)
+        return table_path
+
+    def match_profiles(l_profile, r_profile, model, strategy, threshold=None, progress=None, top_k=None,
+                       blocking=None):
+        df_pred = pd.DataFrame([[0.9, 0.1], [0.2, 0.8 if r_profile != "c" else 0.3]],
+                               index=["id", "name"], columns=["id", "name"])
+        df_pred.attrs["profiled_rows"] = (10, 20)
+        df_pred.attrs["pruned_pairs"] = 1
+        df_labels = (df_pred > 0.5).astype(int)
+        tuples = [(df_pred.index[i], df_pred.columns[j], df_pred.iloc[i, j])
+                  for i, j in zip(*(df_labels.to_numpy() == 1).nonzero())]
+        return df_pred, df_labels, tuples
+
+    monkeypatch.setattr(matching, "profile_table", profile_table)
+    monkeypatch.setattr(matching, "match_profiles", match_profiles)
+    return profiled
+
+
+def test_duplicate_tables_are_profiled_and_matched_once(monkeypatch):
+    profiled = fake_matching(monkeypatch)
+
+    response = run_multi(["a", "b", "a", "c", "b"])
+    assert profiled == ["a", "b", "c"]
+    assert [(m["l_table"], m["r_table"]) for m in response["result"]] == [("a", "b"), ("a", "c"), ("b", "c")]
+    assert response["pruned_pairs"] == 3
+    assert list(response["profiled_rows"]) == ["a", "b", "c"]
+
+
+def test_correspondences_are_merged_by_score(monkeypatch):
+    fake_matching(monkeypatch)
+
+    response = run_multi(["a", "b", "c"], output=MultiMatchingOutput.CORRESPONDENCES)
+    assert [(c["l_table"], c["l_column"], c["r_table"], c["r_column"], c["score"]) for c in response["result"]] == [
+        ("a", "id", "b", "id", 0.9), ("a", "id", "c", "id", 0.9), ("b", "id", "c", "id", 0.9),
+        ("a", "name", "b", "name", 0.8),
+    ]
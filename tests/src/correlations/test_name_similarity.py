@@ -0,0 +1,45 @@
+import random
+
+import numpy as np
+from nltk.translate import bleu
+from strsimpy.damerau import Damerau
+from strsimpy.metric_lcs import MetricLCS
+
+from app.src.correlations.name_similarity import SMOOTHIE, damerau_distance, metric_lcs_distance, \
+    get_string_features_matrix
+
+
+def random_names(count: int, seed: int = 200) -> list[str]:
+    rng = random.Random(seed)
+    return ["".join(rng.choice("abcde _.") for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+
+def test_damerau_distance_same_as_strsimpy():
+    """학습된 model 입력이므로 strsimpy 와 값이 같아야 함"""
+    names = random_names(60)
+    for l_name in names:
+        for r_name in names:
+            assert damerau_distance(l_name, r_name) == Damerau().distance(l_name, r_name)
+
+
+def test_metric_lcs_distance_same_as_strsimpy():
+    names = random_names(60, seed=100)
+    for l_name in names:
+        for r_name in names:
+            assert metric_lcs_distance(l_name, r_name) == MetricLCS().distance(l_name, r_name)
+
+
+def test_string_features_matrix_with_duplicated_names():
+    l_names = ["id", "name", "release date", "id"]
+    r_names = ["name", "releasedate", "title", "name"]
+
+    features = get_string_features_matrix(l_names, r_names)
+
+    assert features.shape == (4, 4, 4)
+    for i, l_name in enumerate(l_names):
+        for j, r_name in enumerate(r_names):
+            expected = np.array([bleu([l_name], r_name, smoothing_function=SMOOTHIE),
+                                 Damerau().distance(l_name, r_name),
+                                 MetricLCS().distance(l_name, r_name),
+                                 l_name in r_name or r_name in l_name], dtype=np.float32)
+            assert np.array_equal(features[i, j], expected)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.src.correlations import self_features
+from app.src.correlations.self_features import extract_features_batch, is_native_numeric
+
+
+def baseline_calculate_numeric_features(data_list: list) -> np.ndarray:
+    mean = np.mean(data_list)
+    cv = np.var(data_list) / mean
+    return np.array([mean, np.min(data_list), np.max(data_list), np.var(data_list), cv,
+                     len(set(data_list)) / len(data_list)])
+
+
+def baseline_features(monkeypatch, column: pd.Series) -> np.ndarray:
+    """column 을 python list 로 변환하여 계산 (native numeric 경로 이전 방식)"""
+    with monkeypatch.context() as m:
+        m.setattr(self_features, "calculate_numeric_features", baseline_calculate_numeric_features)
+        return extract_features_batch([list(column)])[0]
+
+
+COLUMNS = {
+    "int": pd.Series([3, -12, 0, 3, 100000, -9223372036854775808, 9223372036854775807], dtype=np.int64),
+    "uint": pd.Series([0, 7, 18446744073709551615, 10 ** 15], dtype=np.uint64),
+    "int_with_nan": pd.Series([1, None, 22, 333, None], dtype=np.float64),
+    "float": pd.Series([0.5, -1.25, 3.0, 0.1 + 0.2, 2.5, 2.5]),
+    "float_exponent": pd.Series([1e-5, 0.0001, 1e16, 9999999999999998.0, -2.5e-7, 123.456]),
+    "float_inf": pd.Series([1.5, np.inf, -np.inf, np.nan, 4.0]),
+    "float32": pd.Series([0.1, 2.5, -3.75], dtype=np.float32),
+    "bool": pd.Series([True, False, True, True]),
+}
+
+
+@pytest.mark.parametrize("name", COLUMNS)
+def test_native_numeric_same_as_list_path(monkeypatch, name):
+    column = COLUMNS[name]
+    assert is_native_numeric(column)
+    expected = baseline_features(monkeypatch, column)
+    actual = extract_features_batch([column])[0]
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, equal_nan=True)
+
+
+def test_random_columns_same_as_list_path(monkeypatch):
+    rng = np.random.default_rng(200)
+    for _ in range(50):
+        size = int(rng.integers(1, 200))
+        column = pd.Series(np.round(rng.normal(0, 10.0 ** rng.integers(-6, 18), size), int(rng.integers(0, 8))))
+        column[rng.random(size) < 0.1] = np.nan
+        if column.notna().any():
+            np.testing.assert_allclose(extract_features_batch([column])[0], baseline_features(monkeypatch, column),
+                                       rtol=1e-12, equal_nan=True)
+
+
+def test_datetime_column_same_as_csv_strings():
+    column = pd.Series(pd.to_datetime(["2020-01-02", "2021-12-31 10:30:00", None, "2015-06-15"], format="ISO8601"))
+    as_csv = ["2020-01-02 00:00:00", "2021-12-31 10:30:00", "2015-06-15 00:00:00"]
+    np.testing.assert_array_equal(extract_features_batch([column])[0], extract_features_batch([as_csv])[0])
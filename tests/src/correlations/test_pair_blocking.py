@@ -0,0 +1,28 @@
+from app.src.correlations.pair_blocking import compatible_pairs
+from app.src.correlations.self_features import DataTypes
+
+
+def test_incompatible_types_are_blocked(make_profile):
+    l_profile = make_profile([("website", DataTypes.URL, (30, 20, 40)),
+                              ("year", DataTypes.STRICT_NUMERIC, (4, 4, 4)),
+                              ("released", DataTypes.DATE, (10, 10, 10))])
+    r_profile = make_profile([("homepage", DataTypes.URL, (28, 18, 45)),
+                              ("rating", DataTypes.STRICT_NUMERIC, (3, 1, 3)),
+                              ("date", DataTypes.DATE, (8, 8, 10)),
+                              ("code", DataTypes.MAINLY_NUMERIC, (25, 5, 30))])
+
+    compatible = compatible_pairs(l_profile, r_profile, length_ratio=0)
+    assert compatible.tolist() == [[True, False, False, True],
+                                   [False, True, True, True],
+                                   [False, True, True, True]]
+
+
+def test_length_mismatch_is_blocked(make_profile):
+    l_profile = make_profile([("id", DataTypes.STRING, (2, 1, 3)),
+                              ("summary", DataTypes.STRING, (300, 50, 900))])
+    r_profile = make_profile([("code", DataTypes.STRING, (3, 2, 4)),
+                              ("review", DataTypes.STRING, (250, 2, 800))])
+
+    # id, review 는 길이 범위가 겹침
+    assert compatible_pairs(l_profile, r_profile, length_ratio=10).tolist() == [[True, True], [False, True]]
+    assert compatible_pairs(l_profile, r_profile, length_ratio=0).all()
@@ -0,0 +1,55 @@
+import json
+
+import numpy as np
+import torch
+
+from app.src.correlations import preload
+from app.src.correlations.embedding_backend import EmbeddingBackend
+from app.src.correlations.enums import MatchingModel
+from app.src.correlations.model import MatchingModelRegistry, SentenceTransformer
+
+
+class ThreadRecordingBackend(EmbeddingBackend):
+    """encode 시점의 torch thread 수를 기록"""
+
+    def __init__(self):
+        super().__init__("sentence_transformers", "thread-recording")
+        self.num_threads = []
+
+    def _encode(self, sentences: list[str], batch_size: int) -> np.ndarray:
+        self.num_threads.append(torch.get_num_threads())
+        return np.ones((len(sentences), 8), dtype=np.float32)
+
+
+def booster_nthread(bst) -> int:
+    return int(json.loads(bst.save_config())["learner"]["generic_param"]["nthread"])
+
+
+def test_warm_up_runs_single_threaded_and_restores_threads(monkeypatch):
+    backend = ThreadRecordingBackend()
+    monkeypatch.setattr(SentenceTransformer, "_instance", backend)
+    num_threads = torch.get_num_threads()
+    ensemble = MatchingModelRegistry.get(MatchingModel.INITIAL)
+
+    preload.warm_up()
+    assert backend.num_threads == [1]
+    assert torch.get_num_threads() == num_threads
+    assert {booster_nthread(bst) for bst in ensemble.boosters} == {ensemble.nthread}
+
+
+def test_preloaded_models_are_not_reloaded(monkeypatch):
+    loaded = []
+    monkeypatch.setattr(MatchingModelRegistry, "load", lambda model: loaded.append(model))
+    monkeypatch.setattr(preload, "_preloaded", True)
+    preload.load_models()
+    assert loaded == []
+
+    monkeypatch.setattr(preload, "_preloaded", False)
+    preload.load_models()
+    assert loaded == [MatchingModel.INITIAL]
+
+
+def test_process_memory():
+    memory = preload.process_memory()
+    assert memory["max_rss"] > 0
+    assert "max_rss=" in preload.format_memory(memory)
@@ -0,0 +1,119 @@
+import random
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.src.correlations.data_preprocessor import drop_na_columns, read_table
+from app.src.correlations.feature_cache import FeatureCache
+from app.src.correlations.self_features import calculate_character_features, calculate_numeric_features, \
+    classify_data_type, feature_cache_version, get_data_numeric_feature
+from app.src.correlations.streaming_profile import DistinctCounter, ObjectColumnProfiler, RunningStats, \
+    iter_raw_chunks, remaining_columns, scan_schema, stream_self_features
+
+
+def write_table(path: str, rows: int = 300, seed: int = 200):
+    rng = random.Random(seed)
+    pd.DataFrame({
+        "id": range(rows),
+        "late_float": [1.5 if i == rows - 10 else i for i in range(rows)],
+        "int_na": ["" if i == rows // 2 else i for i in range(rows)],
+        "late_str": ["abc" if i == rows - 5 else str(i) for i in range(rows)],
+        "flag_na": ["" if i == 7 else ["True", "False"][i % 2] for i in range(rows)],
+        "price": [f"{rng.randint(1, 999)},{rng.randint(100, 999)}万" for _ in range(rows)],
+        "text": [" ".join(rng.choice(["foo", "bar!", "baz-1", "q?", "東京"]) for _ in range(rng.randint(1, 4)))
+                 for _ in range(rows)],
+        "dashes": ["--" if i > 1 else "x" for i in range(rows)],
+        "Unnamed: 8": range(rows),
+    }).to_csv(path, index=False)
+
+
+def test_running_stats_same_as_calculate_numeric_features():
+    rng = np.random.default_rng(200)
+    for values in (rng.normal(50, 10, 1000), rng.integers(0, 30, 1000), np.array([1.5, 1.5, -2.0])):
+        stats = RunningStats()
+        for chunk in np.array_split(values, 7):
+            stats.update(chunk)
+        assert np.allclose(stats.features(), calculate_numeric_features(values), rtol=1e-10)
+
+
+def test_scan_schema_same_as_read_table(tmp_path, monkeypatch):
+    path = str(tmp_path / "table.csv")
+    write_table(path)
+    monkeypatch.setattr(settings, "PROFILE_CHUNK_ROWS", 37)
+
+    df = read_table(path)
+    schema = scan_schema(path)
+    assert schema.row_count == len(df)
+    assert {column: column_schema.dtype for column, column_schema in schema.columns.items()} \
+           == {column: str(dtype) for column, dtype in df.dtypes.items()}
+    assert remaining_columns(schema) == list(drop_na_columns(df).columns)
+
+    for column in df.columns:
+        streamed = pd.concat([chunk[column] for chunk in iter_raw_chunks(path, schema)], ignore_index=True)
+        assert streamed.tolist() == df[column].tolist() or streamed.equals(df[column])
+
+
+def test_object_column_profiler_same_as_in_memory(tmp_path, monkeypatch):
+    path = str(tmp_path / "table.csv")
+    write_table(path)
+    monkeypatch.setattr(settings, "PROFILE_CHUNK_ROWS", 37)
+
+    df = read_table(path)
+    schema = scan_schema(path)
+    profilers = {column: ObjectColumnProfiler(schema.columns[column].value_count, np.random.default_rng(200))
+                 for column in ("late_str", "flag_na", "price", "text")}
+    for chunk in iter_raw_chunks(path, schema):
+        for column, profiler in profilers.items():
+            profiler.update(chunk[column])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for column, profiler in profilers.items():
+            data_list = [d for d in df[column] if d == d and d != "--"]
+            data_type = classify_data_type(data_list)
+            assert profiler.data_type() == data_type
+
+            features = profiler.non_embedding_features()
+            assert np.allclose(features[4:10], get_data_numeric_feature(data_list, data_type), rtol=1e-10)
+            assert np.allclose(features[10:16], calculate_numeric_features([len(str(d)) for d in data_list]))
+            if column == "text":
+                assert np.allclose(features[16:], calculate_character_features(data_list), rtol=1e-10)
+            assert len(profiler.samples) == 20
+
+
+def test_distinct_counter_is_exact_below_sketch_size():
+    counter = DistinctCounter(size=100)
+    for chunk in np.array_split(np.array([1.5, -0.0, 0.0, 2.0] * 20 + list(range(90)), dtype=np.float64), 7):
+        counter.update(chunk)
+    # -0.0, 0.0 은 같은 값 (np.unique 와 동일)
+    assert counter.count() == len(np.unique([1.5, 0.0, 2.0] + list(range(90))))
+
+
+def test_running_stats_memory_is_bounded_on_high_cardinality_column(monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_DISTINCT_SKETCH_SIZE", 1024)
+    rng = np.random.default_rng(200)
+    stats = RunningStats()
+    for _ in range(100):
+        stats.update(rng.random(10000))
+        assert len(stats.uniques.hashes) <= 1024
+
+    # 1,000,000 개 모두 unique, 상대 오차 약 1 / sqrt(1024)
+    assert abs(stats.features()[5] - 1.0) < 0.1
+
+
+def test_estimated_features_are_not_cached(tmp_path, monkeypatch):
+    path = str(tmp_path / "table.csv")
+    pd.DataFrame({"id": range(300), "flag": [0, 1, 1] * 100}).to_csv(path, index=False)
+    monkeypatch.setattr(settings, "PROFILE_DISTINCT_SKETCH_SIZE", 64)
+    monkeypatch.setattr(settings, "FEATURE_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "FEATURE_CACHE_PATH", str(tmp_path / "cache"))
+
+    columns, features, _ = stream_self_features(path)
+    assert columns == ["id", "flag"]
+
+    # id 의 unique 값 비율은 추정값이므로, 같은 key 를 사용하는 in-memory 계산이 읽지 않도록 저장하지 않음
+    df = read_table(path)
+    assert FeatureCache.get(FeatureCache.make_key(df["id"], feature_cache_version())) is None
+    assert np.array_equal(FeatureCache.get(FeatureCache.make_key(df["flag"], feature_cache_version())), features[1])
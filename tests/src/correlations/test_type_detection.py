@@ -0,0 +1,102 @@
+import math
+import random
+import re
+
+import pytest
+
+from app.src.correlations.self_features import (Constants, UNIT_DICT, is_mainly_numeric, is_strict_numeric,
+                                                is_url)
+
+URL_PATTERN = r'[-a-zA-Z0-9@:%._\+~#=]{1,256}\.[a-zA-Z0-9()]{1,6}\b([-a-zA-Z0-9()@:%_\+.~#?&//=]*)'
+
+
+def baseline_is_url(data_list: list) -> bool:
+    cnt = 0
+    for data in data_list:
+        if not isinstance(data, str):
+            continue
+        if re.search(URL_PATTERN, data):
+            cnt += 1
+    return cnt >= Constants.URL_RATIO * len(data_list)
+
+
+def baseline_is_strict_numeric(data_list: list) -> bool:
+    cnt = 0
+    for x in data_list:
+        try:
+            float(x)
+            cnt += 1
+        except ValueError as _:
+            continue
+    return cnt >= Constants.STRICT_NUMERIC_RATIO * len(data_list)
+
+
+def baseline_is_mainly_numeric(data_list: list) -> bool:
+    cnt = 0
+    for data in data_list:
+        data = str(data)
+        data = data.replace(",", "")
+        for unit in UNIT_DICT.keys():
+            data = data.replace(unit, "")
+        numeric_part = re.findall(r'\d+', data)
+        if len(numeric_part) > 0 and sum(len(x) for x in numeric_part) >= Constants.NUMERIC_PART_RATIO * len(data):
+            cnt += 1
+    return cnt >= Constants.MAINLY_NUMERIC_RATIO * len(data_list)
+
+
+# "1.5" 도 URL_PATTERN 과 일치함
+URLS = ["https://example.com/a?b=1", "www.naver.com", "a.io", "mail@host.kr", "x.y(z)", "1.5"]
+NOT_URLS = ["example", "no dot here", "http://", ".", 3.5]
+NUMBERS = ["1e5", "inf", "-Infinity", "nan", "NaN", " 42 ", "1_000", "-.5", "5.", "+3E-2", "١٢٣", 7, 2.5, True]
+NOT_NUMBERS = ["1__0", "_1", "e5", ".", "1e", "infinit", "nan1", "1,000", "12abc", "", " "]
+MAINLY_NUMERIC = ["1,234", "3万", "10K+", "123ab", "2020年", "١٢٣x", "12", "a1"]
+NOT_MAINLY_NUMERIC = ["abc1", "12abc", "万", "", "title", "x,y,z", "-.", "1 2 3 a b c d"]
+
+CASES = [
+    (is_url, baseline_is_url, Constants.URL_RATIO, URLS, NOT_URLS),
+    (is_strict_numeric, baseline_is_strict_numeric, Constants.STRICT_NUMERIC_RATIO, NUMBERS, NOT_NUMBERS),
+    (is_mainly_numeric, baseline_is_mainly_numeric, Constants.MAINLY_NUMERIC_RATIO, MAINLY_NUMERIC,
+     NOT_MAINLY_NUMERIC),
+]
+
+
+def make_list(rng: random.Random, positives: list, negatives: list, positive_cnt: int, total: int) -> list:
+    data_list = ([rng.choice(positives) for _ in range(positive_cnt)]
+                 + [rng.choice(negatives) for _ in range(total - positive_cnt)])
+    rng.shuffle(data_list)
+    return data_list
+
+
+@pytest.mark.parametrize("is_type, baseline, ratio, positives, negatives", CASES)
+def test_value_by_value_same_as_baseline(is_type, baseline, ratio, positives, negatives):
+    for data in positives + negatives:
+        assert is_type([data]) == baseline([data]), data
+    assert all(baseline([data]) for data in positives)
+    assert not any(baseline([data]) for data in negatives)
+
+
+@pytest.mark.parametrize("first_chunk_size", [1, 4, Constants.CLASSIFY_FIRST_CHUNK_SIZE])
+@pytest.mark.parametrize("is_type, baseline, ratio, positives, negatives", CASES)
+def test_ratio_boundary_same_as_baseline(monkeypatch, first_chunk_size, is_type, baseline, ratio, positives,
+                                         negatives):
+    monkeypatch.setattr(Constants, "CLASSIFY_FIRST_CHUNK_SIZE", first_chunk_size)
+    rng = random.Random(200)
+    for total in (1, 20, 100, 3000):
+        # 0.9 * 100 == 90.00000000000001 처럼 float 오차가 있는 경우도 baseline 과 같아야 함
+        at_threshold = math.ceil(ratio * total)
+        for positive_cnt in {0, at_threshold - 1, at_threshold, total} - {-1}:
+            data_list = make_list(rng, positives, negatives, positive_cnt, total)
+            assert is_type(data_list) == baseline(data_list) == (positive_cnt >= ratio * total), (total, positive_cnt)
+
+
+@pytest.mark.parametrize("is_type, baseline, ratio, positives, negatives", CASES)
+def test_positives_at_end_same_as_baseline(monkeypatch, is_type, baseline, ratio, positives, negatives):
+    monkeypatch.setattr(Constants, "CLASSIFY_FIRST_CHUNK_SIZE", 4)
+    rng = random.Random(300)
+    total = 200
+    at_threshold = math.ceil(ratio * total)
+    for positive_cnt in (at_threshold - 1, at_threshold):
+        # early exit 가 앞쪽 chunk 만 보고 판단하지 않는지 확인
+        data_list = ([rng.choice(negatives) for _ in range(total - positive_cnt)]
+                     + [rng.choice(positives) for _ in range(positive_cnt)])
+        assert is_type(data_list) == baseline(data_list) == (positive_cnt >= ratio * total)